@@ -10,7 +10,15 @@ __version__ = "1.0.0"
 __author__ = "AI Agent Development Team"
 __email__ = "support@ai-agent-blind.com"
 
-from .core.agent import AIAgent
-from .core.config import Config
+__all__ = ["AIAgent", "Config"]
 
-__all__ = ["AIAgent", "Config"]
\ No newline at end of file
+
+def __getattr__(name):
+    """Import the public classes on first access to keep startup light."""
+    if name == "AIAgent":
+        from .core.agent import AIAgent
+        return AIAgent
+    if name == "Config":
+        from .core.config import Config
+        return Config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
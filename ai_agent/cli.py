@@ -2,6 +2,7 @@
 
 import asyncio
 import click
+import contextlib
 import logging
 
 from ai_agent import AIAgent, Config
@@ -9,17 +10,50 @@ from ai_agent import AIAgent, Config
 
 @click.group()
 @click.option('--debug', is_flag=True, help='Enable debug mode')
+@click.option('--profile', type=click.Path(dir_okay=False),
+              help='Profile each command and write the slowest as collapsed stacks to this file')
 @click.pass_context
-def cli(ctx, debug):
+def cli(ctx, debug, profile):
     """AI Agent for Blind Users - Command Line Interface"""
     ctx.ensure_object(dict)
     ctx.obj['debug'] = debug
+    ctx.obj['profile'] = profile
     
     # Setup logging
     log_level = logging.DEBUG if debug else logging.INFO
     logging.basicConfig(level=log_level)
 
 
+def print_metrics(ctx):
+    """Print a per-stage latency summary in debug mode."""
+    if not ctx.obj['debug']:
+        return
+    from ai_agent.utils.metrics import metrics
+    
+    print("\nLatency summary:")
+    print(metrics.format_summary())
+
+
+def profiled(ctx, agent, label):
+    """Profile the enclosed call when --profile is given."""
+    if ctx.obj['profile']:
+        return agent.profiler.capture(label)
+    return contextlib.nullcontext()
+
+
+def save_profile(ctx, agent):
+    """Write the slowest captured profile to the --profile file."""
+    path = ctx.obj['profile']
+    profiles = agent.profiler.profiles() if path else []
+    if not profiles:
+        return
+    
+    slowest = profiles[0]
+    with open(path, "w") as f:
+        f.write(slowest.collapsed())
+    print(f"Profile of {slowest.label} ({slowest.duration * 1000:.1f} ms) written to {path}")
+
+
 @cli.command()
 @click.option('--text', '-t', help='Text to process')
 @click.pass_context
@@ -32,18 +66,25 @@ def text(ctx, text):
         
         agent = AIAgent(config)
         
-        if text:
-            response = await agent.process_text_command(text)
-            print(f"Response: {response}")
-        else:
-            print("Interactive text mode. Type 'quit' to exit.")
-            while True:
-                user_input = input("You: ")
-                if user_input.lower() in ['quit', 'exit', 'bye']:
-                    break
-                
-                response = await agent.process_text_command(user_input)
-                print(f"Agent: {response}")
+        try:
+            if text:
+                with profiled(ctx, agent, "process_text_command"):
+                    response = await agent.process_text_command(text, barge_in=True)
+                print(f"Response: {response}")
+            else:
+                print("Interactive text mode. Type 'quit' to exit.")
+                while True:
+                    user_input = input("You: ")
+                    if user_input.lower() in ['quit', 'exit', 'bye']:
+                        break
+                    
+                    with profiled(ctx, agent, "process_text_command"):
+                        response = await agent.process_text_command(user_input, barge_in=True)
+                    print(f"Agent: {response}")
+        finally:
+            print_metrics(ctx)
+            save_profile(ctx, agent)
+            await agent.aclose()
     
     asyncio.run(process_text())
 
@@ -65,19 +106,28 @@ def voice(ctx):
         try:
             while True:
                 print("\nListening... (speak now)")
-                response = await agent.process_voice_command()
+                with profiled(ctx, agent, "process_voice_command"):
+                    response = await agent.process_voice_command()
                 if response:
                     print(f"Agent response: {response}")
                 else:
                     print("No command detected.")
                 
-                # Small delay between commands
-                await asyncio.sleep(1)
-                
-        except KeyboardInterrupt:
-            print("\nVoice mode ended.")
+                # Small delay between commands; continuous listening
+                # queues speech meanwhile, so it needs none
+                if not config.continuous_listening:
+                    await asyncio.sleep(1)
+        finally:
+            # Ctrl+C arrives here as a cancellation on Python 3.11+, not
+            # as KeyboardInterrupt
+            print_metrics(ctx)
+            save_profile(ctx, agent)
+            await agent.aclose()
     
-    asyncio.run(voice_mode())
+    try:
+        asyncio.run(voice_mode())
+    except KeyboardInterrupt:
+        print("\nVoice mode ended.")
 
 
 @cli.command()
@@ -92,12 +142,18 @@ def image(ctx, image_path):
         
         agent = AIAgent(config)
         
-        print(f"Analyzing image: {image_path}")
-        description = await agent.analyze_image(image_path)
-        print(f"Description: {description}")
-        
-        # Also speak the description
-        await agent.speak(description)
+        try:
+            print(f"Analyzing image: {image_path}")
+            with profiled(ctx, agent, "analyze_image"):
+                description = await agent.analyze_image(image_path)
+            print(f"Description: {description}")
+            
+            # Also speak the description
+            await agent.speak(description)
+        finally:
+            print_metrics(ctx)
+            save_profile(ctx, agent)
+            await agent.aclose()
     
     asyncio.run(analyze_image())
 
@@ -124,12 +180,87 @@ def web(ctx, host, port):
     web_interface.run()
 
 
+@cli.command()
+@click.option('--url', help='Base URL of a running server (default: http://127.0.0.1:8000)')
+@click.option('--local', is_flag=True, help='Start a headless local server and test against it')
+@click.option('--duration', default=10.0, help='Seconds to generate load for')
+@click.option('--concurrency', default=10, help='Requests kept in flight (closed loop)')
+@click.option('--rate', type=float, help='Requests started per second (open loop)')
+@click.option('--mix', default='text=8,history=1,image=1', help='Weighted request kinds: text, history, image')
+@click.option('--image', 'image_path', type=click.Path(exists=True, dir_okay=False), help='Image to upload')
+@click.option('--timeout', default=30.0, help='Per-request timeout in seconds')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON')
+@click.option('--max-error-rate', type=float, help='Exit with status 1 above this error rate')
+def loadtest(url, local, duration, concurrency, rate, mix, image_path, timeout, as_json, max_error_rate):
+    """Generate load against the HTTP API and report latency per endpoint."""
+    import json
+    from ai_agent.loadtest import LoadTest, format_report, local_server, parse_mix
+    
+    # One log line per request would slow the generator down
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    
+    try:
+        weights = parse_mix(mix)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--mix')
+    
+    image = None
+    if image_path:
+        with open(image_path, "rb") as f:
+            image = f.read()
+    
+    def run_against(base_url):
+        test = LoadTest(base_url, weights, duration, concurrency, rate, timeout, image)
+        return asyncio.run(test.run())
+    
+    if local:
+        with local_server() as base_url:
+            report = run_against(base_url)
+    else:
+        report = run_against(url or "http://127.0.0.1:8000")
+    
+    print(json.dumps(report, indent=2) if as_json else format_report(report))
+    
+    if max_error_rate is not None and report["total"]["error_rate"] > max_error_rate:
+        raise SystemExit(1)
+
+
+@cli.command('tts-backends')
+@click.option('--text', '-t', help='Text to render with each engine')
+@click.option('--json', 'as_json', is_flag=True, help='Print the results as JSON')
+def tts_backends(text, as_json):
+    """Compare start-up time and real-time factor of each TTS engine."""
+    import json
+    from ai_agent.speech.backends import PROFILE_TEXT, TTS_BACKENDS, profile_backend
+    
+    results = {}
+    for name in sorted(TTS_BACKENDS):
+        try:
+            results[name] = profile_backend(name, text or PROFILE_TEXT)
+        except Exception as e:
+            results[name] = {"error": str(e)}
+    
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"{'engine':<10} {'init ms':>9} {'render ms':>10} {'audio s':>8} {'RTF':>7}")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<10} unavailable: {result['error']}")
+            continue
+        audio = f"{result['audio_seconds']:.2f}" if result['audio_seconds'] else "-"
+        factor = f"{result['real_time_factor']:.3f}" if result['real_time_factor'] else "-"
+        print(f"{name:<10} {result['init_ms']:>9.1f} {result['render_ms']:>10.1f} {audio:>8} {factor:>7}")
+
+
 @cli.command()
 def config():
     """Show current configuration."""
     config = Config.from_env()
     
     print("Current Configuration:")
+    print(f"  TTS Engine: {config.tts_engine}")
     print(f"  TTS Rate: {config.tts_rate}")
     print(f"  Web Host: {config.web_host}")
     print(f"  Web Port: {config.web_port}")
@@ -2,14 +2,39 @@
 
 import logging
 import asyncio
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, AsyncIterator, Optional, Dict, Any, List, Tuple
 from datetime import datetime
 
+from .cache import TIME_SENSITIVE_WORDS, ResponseCache
 from .config import Config
-from ..speech.tts import TextToSpeech
-from ..speech.stt import SpeechToText
-from ..vision.image_analyzer import ImageAnalyzer
+from .intents import Intent, IntentRouter
+from .session import (
+    AGENT_RESPONSE,
+    DEFAULT_SESSION_ID,
+    USER_INPUT,
+    SessionHistory,
+    SessionManager,
+)
 from ..utils.logger import setup_logger
+from ..utils.metrics import metrics
+from ..utils.profiling import RequestProfiler
+from ..utils.singleflight import SingleFlight
+from ..utils.text import SentenceChunker, normalize_text, split_sentences
+from ..speech.worker import NORMAL, URGENT
+
+if TYPE_CHECKING:
+    from ..llm.backends import LLMBackend
+    from ..speech.tts import TextToSpeech
+    from ..speech.stt import SpeechToText
+    from ..vision.image_analyzer import ImageAnalyzer
+
+
+TEXT_ERROR_MESSAGE = "I'm sorry, I encountered an error while processing your request."
+LLM_ERROR_MESSAGE = "I'm sorry, I couldn't reach the AI service right now. Please try again in a moment."
+VOICE_UNAVAILABLE_MESSAGE = "Voice commands are not available in this deployment. Please use text input instead."
+IMAGE_ERROR_MESSAGE = "I'm sorry, I couldn't analyze the image. Please make sure the file is a valid image format."
+VOICE_ERROR_MESSAGE = "Sorry, I had trouble understanding your command. Please try again."
+IMAGE_HINT_MESSAGE = "To describe an image, please use the web interface to upload a photo, or specify the path to an image file if using the command line interface."
 
 
 class AIAgent:
@@ -18,92 +43,294 @@ class AIAgent:
     def __init__(self, config: Optional[Config] = None):
         """Initialize the AI Agent with configuration."""
         self.config = config or Config.from_env()
-        self.logger = setup_logger(self.config.log_file)
+        self.logger = setup_logger(
+            self.config.log_file,
+            json_format=self.config.log_json,
+            max_bytes=self.config.log_max_bytes,
+            backup_count=self.config.log_backup_count,
+            rate_limit=self.config.log_rate_limit,
+        )
         
-        # Initialize components
-        self.tts = TextToSpeech(self.config)
-        self.stt = SpeechToText(self.config)
-        self.image_analyzer = ImageAnalyzer(self.config)
+        # Components are created on first use so text-only callers never
+        # open audio devices or import the speech and imaging libraries
+        self._tts: Optional["TextToSpeech"] = None
+        self._stt: Optional["SpeechToText"] = None
+        self._image_analyzer: Optional["ImageAnalyzer"] = None
+        self._llm: Optional["LLMBackend"] = None
+        
+        # Command routing
+        self.router = self._build_router()
+        self._inflight = SingleFlight()
+        self.response_cache = ResponseCache(
+            max_entries=self.config.response_cache_size,
+            ttl=self.config.response_cache_ttl,
+            bypass_words=TIME_SENSITIVE_WORDS | self._uncacheable_keywords(),
+        )
         
         # Session state
-        self.session_history: List[Dict[str, Any]] = []
+        self.sessions = SessionManager(
+            max_sessions=self.config.session_max_count,
+            max_history=self.config.session_history_size,
+            idle_timeout=self.config.session_idle_timeout,
+        )
+        self.history_store = None
+        if self.config.history_db:
+            from .history_store import HistoryStore
+            self.history_store = HistoryStore(self.config.history_db)
         self.is_listening = False
         
+        # Profiles are only captured when a caller asks for one
+        self.profiler = RequestProfiler(self.config.profile_store_size)
+        
         self.logger.info("AI Agent initialized successfully")
     
-    async def process_voice_command(self) -> Optional[str]:
+    @property
+    def tts(self) -> "TextToSpeech":
+        """Text-to-speech engine, created on first use."""
+        if self._tts is None:
+            if self.config.headless:
+                from ..speech.stubs import NullTextToSpeech as TextToSpeech
+            else:
+                from ..speech.tts import TextToSpeech
+            self._tts = TextToSpeech(self.config)
+        return self._tts
+    
+    @tts.setter
+    def tts(self, value: "TextToSpeech") -> None:
+        self._tts = value
+    
+    @property
+    def stt(self) -> "SpeechToText":
+        """Speech-to-text engine, created on first use."""
+        if self._stt is None:
+            if self.config.headless:
+                from ..speech.stubs import NullSpeechToText as SpeechToText
+            else:
+                from ..speech.stt import SpeechToText
+            self._stt = SpeechToText(self.config, muted=self._speaking)
+        return self._stt
+    
+    @stt.setter
+    def stt(self, value: "SpeechToText") -> None:
+        self._stt = value
+    
+    def _speaking(self) -> bool:
+        """Whether the agent's own speech is playing, so the microphone should not listen."""
+        # Polled from the capture thread, so it never creates the engine
+        return self._tts is not None and self._tts.is_speaking
+    
+    @property
+    def image_analyzer(self) -> "ImageAnalyzer":
+        """Image analyzer, created on first use."""
+        if self._image_analyzer is None:
+            from ..vision.image_analyzer import ImageAnalyzer
+            self._image_analyzer = ImageAnalyzer(self.config)
+        return self._image_analyzer
+    
+    @image_analyzer.setter
+    def image_analyzer(self, value: "ImageAnalyzer") -> None:
+        self._image_analyzer = value
+    
+    @property
+    def llm(self) -> "LLMBackend":
+        """Language model backend for general conversation, created on first use."""
+        if self._llm is None:
+            from ..llm.backends import create_backend
+            self._llm = create_backend(self.config)
+        return self._llm
+    
+    @llm.setter
+    def llm(self, value: "LLMBackend") -> None:
+        self._llm = value
+    
+    @property
+    def session_history(self) -> SessionHistory:
+        """History of the default session, used by the CLI."""
+        return self.sessions.get()
+    
+    async def process_voice_command(self, session_id: Optional[str] = None) -> Optional[str]:
         """Listen for and process a voice command."""
+        if self.config.headless:
+            return VOICE_UNAVAILABLE_MESSAGE
+        
         try:
             self.logger.info("Starting voice command processing")
             self.is_listening = True
             
-            # Listen for audio input
-            audio_text = await self.stt.listen_and_transcribe()
-            
-            if audio_text:
-                self.logger.info(f"Received voice command: {audio_text}")
-                response = await self.process_text_command(audio_text)
+            with metrics.time("voice_round_trip"):
+                # Listen for audio input
+                audio_text = await self.stt.listen_and_transcribe()
                 
-                # Speak the response
-                if response:
-                    await self.speak(response)
-                
-                return response
+                if audio_text:
+                    self.logger.info("Received voice command: %s", audio_text)
+                    response = await self.process_text_command(audio_text, session_id, barge_in=True)
+                    
+                    # Speak the response
+                    if response:
+                        await self.speak(response, session_id)
+                    
+                    return response
             
         except Exception as e:
-            self.logger.error(f"Error processing voice command: {e}")
-            error_msg = "Sorry, I had trouble understanding your command. Please try again."
-            await self.speak(error_msg)
-            return error_msg
+            self.logger.error("Error processing voice command: %s", e)
+            await self.speak(VOICE_ERROR_MESSAGE, session_id, priority=URGENT, key="voice_error")
+            return VOICE_ERROR_MESSAGE
         
         finally:
             self.is_listening = False
     
-    async def process_text_command(self, text: str) -> str:
-        """Process a text command and return a response."""
+    async def process_text_command(
+        self, text: str, session_id: Optional[str] = None, barge_in: bool = False
+    ) -> str:
+        """Process a text command and return a response.
+        
+        ``barge_in`` is for commands from the local user, the one listening to
+        the agent's speech: it cuts off whatever is still being said. Remote
+        clients leave it unset so they never silence the local speaker.
+        """
         try:
-            command = text.lower().strip()
+            if barge_in:
+                self.interrupt_speech()
             
             # Add to session history
-            self.session_history.append({
-                "timestamp": datetime.now().isoformat(),
-                "type": "user_input",
-                "content": text
-            })
+            self._record(session_id, USER_INPUT, text)
             
-            # Handle specific commands
-            if any(word in command for word in ["describe", "image", "picture", "photo"]):
-                return await self._handle_image_description_request()
-            
-            elif any(word in command for word in ["time", "clock"]):
-                return self._handle_time_request()
-            
-            elif any(word in command for word in ["help", "commands", "what can you do"]):
-                return self._handle_help_request()
+            # Identical commands in flight at the same moment share one response.
+            # Only case, punctuation and spacing fold: dropping any word could
+            # merge commands that route differently.
+            key = normalize_text(text, stop_words=frozenset()) or text
+            with metrics.time("text_command"):
+                return await self._inflight.do(key, lambda: self._respond(text))
+        
+        except Exception as e:
+            self.logger.error("Error processing text command: %s", e)
+            return TEXT_ERROR_MESSAGE
+    
+    async def _respond(self, text: str) -> str:
+        """Route a command to its handler or to general conversation."""
+        with metrics.time("route"):
+            intent = self.router.match(text)
+        if intent is not None:
+            return await self._run_intent(intent, text)
+        return await self._handle_general_request(text)
+    
+    async def stream_text_command(
+        self, text: str, session_id: Optional[str] = None, barge_in: bool = False
+    ) -> AsyncIterator[str]:
+        """Process a text command, yielding the response sentence by sentence.
+        
+        General conversation is streamed from the language model, so the first
+        sentence can be spoken while the rest is still being generated.
+        ``barge_in`` works as in ``process_text_command``.
+        """
+        try:
+            if barge_in:
+                self.interrupt_speech()
             
-            elif any(word in command for word in ["hello", "hi", "hey"]):
-                return "Hello! I'm your AI assistant. I can help you with image descriptions, telling time, reading text, and many other tasks. Just ask me what you need!"
+            self._record(session_id, USER_INPUT, text)
             
-            else:
-                # General AI response (placeholder for now)
-                return f"I heard you say: '{text}'. This is a general response. In a full implementation, this would be processed by an AI model to provide intelligent responses."
+            with metrics.time("route"):
+                intent = self.router.match(text)
+            if intent is not None:
+                for sentence in split_sentences(await self._run_intent(intent, text)):
+                    yield sentence
+                return
         
         except Exception as e:
-            self.logger.error(f"Error processing text command: {e}")
-            return "I'm sorry, I encountered an error while processing your request."
+            self.logger.error("Error processing text command: %s", e)
+            yield TEXT_ERROR_MESSAGE
+            return
+        
+        key = self.response_cache.key(text)
+        cached = self.response_cache.get(key) if key is not None else None
+        if cached is not None:
+            for sentence in split_sentences(cached):
+                yield sentence
+            return
+        
+        chunker = SentenceChunker()
+        sentences = []
+        try:
+            async for fragment in self.llm.stream(text):
+                for sentence in chunker.feed(fragment):
+                    sentences.append(sentence)
+                    yield sentence
+        except Exception as e:
+            self.logger.error("Error streaming from %s backend: %s", self.llm.name, e)
+            chunker.flush()
+            yield LLM_ERROR_MESSAGE
+            return
+        
+        remainder = chunker.flush()
+        if remainder:
+            sentences.append(remainder)
+            yield remainder
+        if key is not None and sentences:
+            self.response_cache.set(key, " ".join(sentences))
+    
+    async def _run_intent(self, intent: Intent, text: str) -> str:
+        """Call an intent handler, awaiting it if it is a coroutine."""
+        response = intent.handler(text)
+        if asyncio.iscoroutine(response):
+            response = await response
+        return response
+    
+    def _build_router(self) -> IntentRouter:
+        """Register the built-in command handlers."""
+        router = IntentRouter()
+        router.register(
+            "describe_image",
+            ["describe", "image", "images", "picture", "pictures", "photo", "photos"],
+            self._handle_image_description_request,
+        )
+        router.register("time", ["time", "clock"], self._handle_time_request, cacheable=False)
+        router.register("help", ["help", "commands", "what can you do"], self._handle_help_request)
+        router.register("greeting", ["hello", "hi", "hey"], self._handle_greeting)
+        router.register("goodbye", ["bye", "goodbye", "exit", "quit"], self._handle_goodbye)
+        router.compile()
+        return router
+    
+    def _uncacheable_keywords(self) -> set:
+        """Single-word keywords of intents that opted out of caching."""
+        return {
+            keyword
+            for intent in self.router.intents
+            if not intent.cacheable
+            for keyword in intent.keywords
+            if " " not in keyword
+        }
+    
+    async def _handle_general_request(self, text: str) -> str:
+        """Answer anything without a dedicated handler using the language model."""
+        key = self.response_cache.key(text)
+        if key is not None:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        try:
+            with metrics.time("llm", backend=self.llm.name):
+                response = await self.llm.generate(text)
+        except Exception as e:
+            self.logger.error("Error from %s backend: %s", self.llm.name, e)
+            return LLM_ERROR_MESSAGE
+        
+        if key is not None:
+            self.response_cache.set(key, response)
+        return response
     
-    async def _handle_image_description_request(self) -> str:
+    async def _handle_image_description_request(self, text: str = "") -> str:
         """Handle requests to describe images."""
-        return "To describe an image, please use the web interface to upload a photo, or specify the path to an image file if using the command line interface."
+        return IMAGE_HINT_MESSAGE
     
-    def _handle_time_request(self) -> str:
+    def _handle_time_request(self, text: str = "") -> str:
         """Handle requests for current time."""
         now = datetime.now()
         time_str = now.strftime("%I:%M %p")
         date_str = now.strftime("%A, %B %d, %Y")
         return f"The current time is {time_str} on {date_str}."
     
-    def _handle_help_request(self) -> str:
+    def _handle_help_request(self, text: str = "") -> str:
         """Handle help requests."""
         return """I can help you with several tasks:
         
@@ -114,20 +341,79 @@ class AIAgent:
         
         I'm designed to be accessible for blind and visually impaired users. All responses are provided through text-to-speech."""
     
-    async def speak(self, text: str) -> None:
-        """Convert text to speech and play it."""
+    def _handle_greeting(self, text: str = "") -> str:
+        """Handle greetings."""
+        return "Hello! I'm your AI assistant. I can help you with image descriptions, telling time, reading text, and many other tasks. Just ask me what you need!"
+    
+    def _handle_goodbye(self, text: str = "") -> str:
+        """Handle farewells."""
+        return "Goodbye! Feel free to come back anytime you need assistance."
+    
+    async def speak(
+        self,
+        text: str,
+        session_id: Optional[str] = None,
+        priority: int = NORMAL,
+        key: Optional[str] = None,
+    ) -> None:
+        """Convert text to speech and play it.
+        
+        ``priority`` and ``key`` are passed to the speech queue: ``URGENT``
+        text goes ahead of queued text, and a ``key`` replaces queued text
+        with the same key.
+        """
         try:
-            await self.tts.speak(text)
+            with metrics.time("speak"):
+                await self.tts.speak(text, priority, key)
             
             # Add to session history
-            self.session_history.append({
-                "timestamp": datetime.now().isoformat(),
-                "type": "agent_response",
-                "content": text
-            })
+            self._record(session_id, AGENT_RESPONSE, text)
             
         except Exception as e:
-            self.logger.error(f"Error in text-to-speech: {e}")
+            self.logger.error("Error in text-to-speech: %s", e)
+    
+    async def synthesize_speech(self, text: str) -> Optional[bytes]:
+        """Render text to an audio clip, or None if speech is unavailable."""
+        try:
+            return await self.tts.synthesize(text)
+        except Exception as e:
+            self.logger.error("Error synthesizing speech: %s", e)
+            return None
+    
+    def fixed_responses(self) -> List[str]:
+        """Responses that never change, worth rendering ahead of time."""
+        return [
+            self._handle_greeting(),
+            self._handle_help_request(),
+            self._handle_goodbye(),
+            IMAGE_HINT_MESSAGE,
+            TEXT_ERROR_MESSAGE,
+            LLM_ERROR_MESSAGE,
+            IMAGE_ERROR_MESSAGE,
+            VOICE_ERROR_MESSAGE,
+        ]
+    
+    async def prewarm_speech(self) -> int:
+        """Render the fixed responses into the speech clip cache."""
+        try:
+            count = await self.tts.prewarm(self.fixed_responses())
+            self.logger.info("Pre-rendered %d speech clips", count)
+            return count
+        except Exception as e:
+            self.logger.error("Error pre-rendering speech: %s", e)
+            return 0
+    
+    def interrupt_speech(self) -> int:
+        """Stop current and queued speech, e.g. when the user barges in."""
+        if self._tts is None:
+            return 0
+        return self._tts.interrupt()
+    
+    def skip_speech(self, offset: int) -> bool:
+        """Move the response being spoken forward or back by sentences."""
+        if self._tts is None:
+            return False
+        return self._tts.skip(offset)
     
     async def analyze_image(self, image_path: str) -> str:
         """Analyze an image and return a description."""
@@ -135,14 +421,74 @@ class AIAgent:
             description = await self.image_analyzer.describe_image(image_path)
             return description
         except Exception as e:
-            self.logger.error(f"Error analyzing image: {e}")
-            return "I'm sorry, I couldn't analyze the image. Please make sure the file is a valid image format."
+            self.logger.error("Error analyzing image: %s", e)
+            return IMAGE_ERROR_MESSAGE
+    
+    async def analyze_image_data(self, data: bytes) -> str:
+        """Analyze image bytes, such as an upload, and return a description."""
+        try:
+            return await self.image_analyzer.describe_image_data(data)
+        except Exception as e:
+            self.logger.error("Error analyzing image: %s", e)
+            return IMAGE_ERROR_MESSAGE
+    
+    def _record(self, session_id: Optional[str], kind: str, content: str) -> None:
+        """Add an entry to a session's history and queue it for persistence."""
+        record = self.sessions.get(session_id).add(kind, content)
+        if self.history_store is not None:
+            self.history_store.append(session_id or DEFAULT_SESSION_ID, record)
+    
+    async def get_history_page(
+        self,
+        session_id: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Get up to ``limit`` history entries newer than ``cursor``.
+        
+        Returns the entries and the cursor for the next page, which is None
+        once the end of the history has been reached.
+        """
+        session = self.sessions.peek(session_id)
+        
+        if self.history_store is None or (session is not None and session.covers(cursor)):
+            records = session.after(cursor, limit) if session else []
+        else:
+            loop = asyncio.get_event_loop()
+            records = await loop.run_in_executor(
+                None, self.history_store.page, session_id or DEFAULT_SESSION_ID, cursor, limit
+            )
+            # The newest entries may still be queued for writing
+            if len(records) < limit and session is not None:
+                last_id = records[-1].id if records else cursor
+                records.extend(session.after(last_id, limit - len(records)))
+        
+        next_cursor = records[-1].id if len(records) == limit else None
+        return [record.to_dict() for record in records], next_cursor
+    
+    def get_session_history(self, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the history of a session."""
+        session = self.sessions.peek(session_id)
+        return session.to_list() if session else []
+    
+    def clear_session_history(self, session_id: Optional[str] = None) -> None:
+        """Clear the history of a session."""
+        self.sessions.discard(session_id)
+        if self.history_store is not None:
+            self.history_store.clear(session_id or DEFAULT_SESSION_ID)
+        self.logger.info("Session history cleared")
     
-    def get_session_history(self) -> List[Dict[str, Any]]:
-        """Get the current session history."""
-        return self.session_history.copy()
+    def close(self) -> None:
+        """Flush persisted history and release resources."""
+        if self._tts is not None:
+            self._tts.close()
+        if self._stt is not None:
+            self._stt.close()
+        if self.history_store is not None:
+            self.history_store.close()
     
-    def clear_session_history(self) -> None:
-        """Clear the session history."""
-        self.session_history.clear()
-        self.logger.info("Session history cleared")
\ No newline at end of file
+    async def aclose(self) -> None:
+        """Close network clients, then release everything else."""
+        if self._llm is not None:
+            await self._llm.aclose()
+        self.close()
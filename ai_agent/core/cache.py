@@ -0,0 +1,98 @@
+"""Response caching for the general-conversation path."""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from ..utils.text import normalize_text
+
+
+# Questions containing these words usually expect a fresh answer
+TIME_SENSITIVE_WORDS = frozenset({
+    "now", "today", "tonight", "tomorrow", "yesterday", "current", "currently",
+    "latest", "recent", "news", "weather", "forecast", "score", "date",
+})
+
+
+class ResponseCache:
+    """Size-bounded LRU of responses with a time-to-live.
+
+    Keys are normalized text, so rephrasings that differ only in case,
+    punctuation, spacing or filler words share an entry. Text containing any
+    ``bypass_words`` is never cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        bypass_words: Iterable[str] = TIME_SENSITIVE_WORDS,
+    ):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.bypass_words = frozenset(bypass_words)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def key(self, text: str) -> Optional[str]:
+        """Cache key for the text, or None if it should not be cached."""
+        key = normalize_text(text)
+        if not key or not self.bypass_words.isdisjoint(key.split()):
+            self.bypasses += 1
+            return None
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a fresh cached response, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response, evicting the least recently used entries."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -13,36 +13,162 @@ class Config:
     openai_api_key: Optional[str] = None
     anthropic_api_key: Optional[str] = None
     
+    # Language model for general conversation
+    llm_backend: str = "auto"
+    llm_base_url: Optional[str] = None
+    llm_model: Optional[str] = None
+    llm_timeout: float = 30.0
+    llm_max_connections: int = 20
+    llm_max_retries: int = 2
+    llm_max_tokens: int = 300
+    response_cache_size: int = 1024
+    response_cache_ttl: float = 3600.0
+    
+    # Run without audio devices: speech components are replaced by stubs
+    # and speech libraries are never imported
+    headless: bool = False
+    
     # Speech settings
     tts_engine: str = "pyttsx3"
     tts_rate: int = 180
     tts_voice_id: Optional[str] = None
+    # Speech is played in sentence chunks; the first one is sized to start
+    # playing within tts_first_audio_budget seconds
+    tts_chunk_chars: int = 200
+    tts_first_audio_budget: float = 0.3
+    
+    # Rendered speech clips for /speech, cached in memory and on disk
+    # (an empty speech_cache_dir keeps them in memory only)
+    speech_cache_bytes: int = 32 * 1024 * 1024
+    speech_cache_dir: str = "temp/speech"
+    speech_disk_cache_bytes: int = 256 * 1024 * 1024
+    speech_max_chars: int = 1000
+    # Worker processes rendering clips in parallel, each with its own
+    # engine (0 renders on the playback engine's thread)
+    tts_pool_size: int = 0
     
     # Web interface
     web_host: str = "0.0.0.0"
     web_port: int = 8000
     debug_mode: bool = False
+    static_max_age: int = 86400
+    
+    # On-demand request profiling (X-Profile header and /admin/profiles)
+    profiling_enabled: bool = False
+    profile_store_size: int = 10
+    admin_token: Optional[str] = None
+    
+    # Admission control: concurrent requests and queued waiters per endpoint
+    text_max_concurrency: int = 32
+    text_max_queue: int = 64
+    image_max_concurrency: int = 4
+    image_max_queue: int = 8
+    voice_max_concurrency: int = 1
+    voice_max_queue: int = 2
+    speech_max_concurrency: int = 4
+    speech_max_queue: int = 16
+    admission_queue_timeout: float = 10.0
+    retry_after_seconds: int = 2
     
     # Audio settings
     audio_timeout: int = 5
     audio_phrase_timeout: float = 1.0
+    # Speech recognizers in priority order; each next one starts when the
+    # previous fails, is unsure or is slower than usual (stt_hedge_delay
+    # until its latency is known; 0 runs them all at once)
+    stt_backends: str = "google,sphinx"
+    stt_hedge_delay: float = 1.0
+    stt_min_confidence: float = 0.6
+    stt_request_timeout: float = 10.0
+    # Ambient noise sampled in the background at start-up
+    audio_calibration_seconds: float = 1.0
+    # Continuous listening keeps the microphone open and cuts utterances at
+    # pauses of vad_pause_seconds
+    continuous_listening: bool = False
+    vad_pause_seconds: float = 0.8
+    vad_pre_roll_seconds: float = 0.3
+    vad_max_utterance_seconds: float = 15.0
+    # Time constant of the noise level the speech threshold follows
+    vad_adaptation_seconds: float = 2.0
+    
+    # Session history
+    session_max_count: int = 1000
+    session_history_size: int = 100
+    session_idle_timeout: float = 3600.0
+    history_db: Optional[str] = None
     
     # File paths
     log_file: str = "ai_agent.log"
     temp_dir: str = "temp"
     
+    # Logging (written by a background thread; the file rotates at log_max_bytes)
+    log_json: bool = False
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 5
+    log_rate_limit: int = 20
+    
     @classmethod
     def from_env(cls) -> "Config":
         """Load configuration from environment variables."""
         return cls(
             openai_api_key=os.getenv("OPENAI_API_KEY"),
             anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
+            llm_backend=os.getenv("LLM_BACKEND", "auto"),
+            llm_base_url=os.getenv("LLM_BASE_URL") or None,
+            llm_model=os.getenv("LLM_MODEL") or None,
+            llm_timeout=float(os.getenv("LLM_TIMEOUT", "30")),
+            llm_max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "20")),
+            llm_max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+            llm_max_tokens=int(os.getenv("LLM_MAX_TOKENS", "300")),
+            response_cache_size=int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+            response_cache_ttl=float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+            headless=os.getenv("HEADLESS", "false").lower() == "true",
+            tts_engine=os.getenv("TTS_ENGINE", "pyttsx3"),
             tts_rate=int(os.getenv("TTS_RATE", "180")),
+            tts_chunk_chars=int(os.getenv("TTS_CHUNK_CHARS", "200")),
+            tts_first_audio_budget=float(os.getenv("TTS_FIRST_AUDIO_BUDGET", "0.3")),
+            speech_cache_bytes=int(os.getenv("SPEECH_CACHE_BYTES", str(32 * 1024 * 1024))),
+            speech_cache_dir=os.getenv("SPEECH_CACHE_DIR", "temp/speech"),
+            speech_disk_cache_bytes=int(os.getenv("SPEECH_DISK_CACHE_BYTES", str(256 * 1024 * 1024))),
+            speech_max_chars=int(os.getenv("SPEECH_MAX_CHARS", "1000")),
+            tts_pool_size=int(os.getenv("TTS_POOL_SIZE", "0")),
             web_host=os.getenv("WEB_HOST", "0.0.0.0"),
             web_port=int(os.getenv("WEB_PORT", "8000")),
             debug_mode=os.getenv("DEBUG", "false").lower() == "true",
+            static_max_age=int(os.getenv("STATIC_MAX_AGE", "86400")),
+            profiling_enabled=os.getenv("PROFILING_ENABLED", "false").lower() == "true",
+            profile_store_size=int(os.getenv("PROFILE_STORE_SIZE", "10")),
+            admin_token=os.getenv("ADMIN_TOKEN"),
+            text_max_concurrency=int(os.getenv("TEXT_MAX_CONCURRENCY", "32")),
+            text_max_queue=int(os.getenv("TEXT_MAX_QUEUE", "64")),
+            image_max_concurrency=int(os.getenv("IMAGE_MAX_CONCURRENCY", "4")),
+            image_max_queue=int(os.getenv("IMAGE_MAX_QUEUE", "8")),
+            voice_max_concurrency=int(os.getenv("VOICE_MAX_CONCURRENCY", "1")),
+            voice_max_queue=int(os.getenv("VOICE_MAX_QUEUE", "2")),
+            speech_max_concurrency=int(os.getenv("SPEECH_MAX_CONCURRENCY", "4")),
+            speech_max_queue=int(os.getenv("SPEECH_MAX_QUEUE", "16")),
+            admission_queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10")),
+            retry_after_seconds=int(os.getenv("RETRY_AFTER_SECONDS", "2")),
             audio_timeout=int(os.getenv("AUDIO_TIMEOUT", "5")),
             audio_phrase_timeout=float(os.getenv("AUDIO_PHRASE_TIMEOUT", "1.0")),
+            stt_backends=os.getenv("STT_BACKENDS", "google,sphinx"),
+            stt_hedge_delay=float(os.getenv("STT_HEDGE_DELAY", "1.0")),
+            stt_min_confidence=float(os.getenv("STT_MIN_CONFIDENCE", "0.6")),
+            stt_request_timeout=float(os.getenv("STT_REQUEST_TIMEOUT", "10")),
+            audio_calibration_seconds=float(os.getenv("AUDIO_CALIBRATION_SECONDS", "1.0")),
+            continuous_listening=os.getenv("CONTINUOUS_LISTENING", "false").lower() == "true",
+            vad_pause_seconds=float(os.getenv("VAD_PAUSE_SECONDS", "0.8")),
+            vad_pre_roll_seconds=float(os.getenv("VAD_PRE_ROLL_SECONDS", "0.3")),
+            vad_max_utterance_seconds=float(os.getenv("VAD_MAX_UTTERANCE_SECONDS", "15")),
+            vad_adaptation_seconds=float(os.getenv("VAD_ADAPTATION_SECONDS", "2")),
+            session_max_count=int(os.getenv("SESSION_MAX_COUNT", "1000")),
+            session_history_size=int(os.getenv("SESSION_HISTORY_SIZE", "100")),
+            session_idle_timeout=float(os.getenv("SESSION_IDLE_TIMEOUT", "3600")),
+            history_db=os.getenv("HISTORY_DB") or None,
             log_file=os.getenv("LOG_FILE", "ai_agent.log"),
+            log_json=os.getenv("LOG_JSON", "false").lower() == "true",
+            log_max_bytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            log_backup_count=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+            log_rate_limit=int(os.getenv("LOG_RATE_LIMIT", "20")),
             temp_dir=os.getenv("TEMP_DIR", "temp"),
         )
\ No newline at end of file
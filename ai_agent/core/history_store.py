@@ -0,0 +1,184 @@
+"""Durable, append-only storage for session history."""
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+from typing import List, Optional, Tuple
+
+from ..utils.metrics import metrics
+from .session import HistoryRecord
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_session_id ON history (session_id, id);
+"""
+
+_INSERT = "INSERT INTO history (session_id, id, kind, content, timestamp) VALUES (?, ?, ?, ?, ?)"
+
+_CLEAR = object()
+_STOP = object()
+
+
+class HistoryStore:
+    """Append-only SQLite log of history records.
+
+    Writes are queued and applied by a background thread that commits them in
+    batches, so callers never wait on disk I/O. The database runs in WAL mode,
+    which lets readers page through history while the writer appends. Records
+    that are still queued are not yet visible to ``page``. The writer thread
+    also creates the schema, so the first append does no disk I/O either.
+    """
+
+    def __init__(self, path: str, batch_size: int = 256, max_pending: int = 10000):
+        """Initialize the store. The writer thread starts on first use."""
+        self.path = path
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+        self.dropped = 0
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._writer: Optional[threading.Thread] = None
+        self._ready = threading.Event()  # set once the writer has the schema in place
+        self._start_lock = threading.Lock()
+        self._local = threading.local()
+
+        metrics.gauge(
+            "ai_agent_history_queue_depth", self._queue.qsize,
+            "History writes waiting for the writer thread",
+        )
+
+    def append(self, session_id: str, record: HistoryRecord) -> None:
+        """Queue a record for writing without blocking."""
+        self._submit((session_id, record))
+
+    def clear(self, session_id: str) -> None:
+        """Queue deletion of a session's records."""
+        self._submit((_CLEAR, session_id))
+
+    def page(self, session_id: str, cursor: Optional[int], limit: int) -> List[HistoryRecord]:
+        """Read up to ``limit`` records with an ID greater than ``cursor``.
+
+        This touches the disk, so async callers should run it in an executor.
+        """
+        if self._writer is not None:
+            self._ready.wait()
+        rows = self._reader().execute(
+            "SELECT id, kind, content, timestamp FROM history "
+            "WHERE session_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (session_id, -1 if cursor is None else cursor, limit),
+        ).fetchall()
+        return [
+            HistoryRecord(kind, content, timestamp, record_id)
+            for record_id, kind, content, timestamp in rows
+        ]
+
+    def flush(self) -> None:
+        """Block until every queued write has been committed."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Commit pending writes and stop the writer thread."""
+        with self._start_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(_STOP)
+            writer.join()
+
+    def _submit(self, item) -> None:
+        """Hand an item to the writer, dropping it if the queue is full."""
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            self.logger.warning("History write queue full, dropping record")
+
+    def _ensure_writer(self) -> None:
+        """Start the writer thread if it is not running."""
+        if self._writer is not None:
+            return
+        with self._start_lock:
+            if self._writer is None:
+                self._ready.clear()
+                self._writer = threading.Thread(
+                    target=self._run_writer, name="history-writer", daemon=True
+                )
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the schema in place."""
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=FULL")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """Return this thread's read connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    def _run_writer(self) -> None:
+        """Drain the queue, committing each batch in one transaction."""
+        try:
+            connection: Optional[sqlite3.Connection] = self._connect()
+        except Exception as e:
+            self.logger.error("Error opening history database %s: %s", self.path, e)
+            connection = None
+        finally:
+            self._ready.set()
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            running = not any(item is _STOP for item in batch)
+            try:
+                if connection is None:
+                    self.dropped += sum(item is not _STOP for item in batch)
+                else:
+                    self._write_batch(connection, batch)
+            except Exception as e:
+                self.logger.error("Error writing history batch: %s", e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        if connection is not None:
+            connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: list) -> None:
+        """Apply a batch of writes in a single transaction."""
+        inserts: List[Tuple] = []
+        with connection:
+            for item in batch:
+                if item is _STOP:
+                    continue
+                first, second = item
+                if first is _CLEAR:
+                    if inserts:
+                        connection.executemany(_INSERT, inserts)
+                        inserts = []
+                    connection.execute("DELETE FROM history WHERE session_id = ?", (second,))
+                else:
+                    inserts.append((first, second.id, second.kind, second.content, second.timestamp))
+            if inserts:
+                connection.executemany(_INSERT, inserts)
@@ -0,0 +1,116 @@
+"""Compiled keyword intent routing."""
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class Intent:
+    """A named command with the keywords that trigger it."""
+
+    __slots__ = ("name", "keywords", "handler", "priority", "cacheable")
+
+    def __init__(
+        self,
+        name: str,
+        keywords: Tuple[str, ...],
+        handler: Callable,
+        priority: int,
+        cacheable: bool = True,
+    ):
+        self.name = name
+        self.keywords = keywords
+        self.handler = handler
+        self.priority = priority
+        self.cacheable = cacheable
+
+    def __repr__(self) -> str:
+        return f"Intent({self.name!r}, priority={self.priority})"
+
+
+class IntentRouter:
+    """Route text to intents using a precompiled token index.
+
+    Keywords are matched on whole words, and multi-word keywords such as
+    "what can you do" must appear as a consecutive phrase. When several
+    intents match, the one registered first wins, which mirrors the order
+    of an if/elif chain.
+    """
+
+    def __init__(self):
+        """Initialize an empty router."""
+        self._intents: List[Intent] = []
+        # first token -> [(remaining phrase tokens, intent priority)]
+        self._index: Optional[Dict[str, List[Tuple[Tuple[str, ...], int]]]] = None
+
+    def register(
+        self,
+        name: str,
+        keywords: Iterable[str],
+        handler: Callable,
+        cacheable: bool = True,
+    ) -> Intent:
+        """Register an intent. Earlier registrations take precedence."""
+        phrases = tuple(" ".join(tokenize(keyword)) for keyword in keywords)
+        if not all(phrases):
+            raise ValueError(f"Intent {name!r} has an empty keyword")
+
+        intent = Intent(name, phrases, handler, len(self._intents), cacheable)
+        self._intents.append(intent)
+        self._index = None
+        return intent
+
+    def compile(self) -> None:
+        """Build the token index. Called lazily on the first match."""
+        index: Dict[str, List[Tuple[Tuple[str, ...], int]]] = {}
+        for intent in self._intents:
+            for phrase in intent.keywords:
+                first, *rest = phrase.split(" ")
+                index.setdefault(first, []).append((tuple(rest), intent.priority))
+
+        # Check higher-priority entries first so a match can stop the scan early.
+        for entries in index.values():
+            entries.sort(key=lambda entry: entry[1])
+        self._index = index
+
+    def match(self, text: str) -> Optional[Intent]:
+        """Return the highest-priority intent mentioned in the text."""
+        if self._index is None:
+            self.compile()
+
+        index = self._index
+        tokens = tokenize(text)
+        best = len(self._intents)
+
+        for position, token in enumerate(tokens):
+            entries = index.get(token)
+            if not entries:
+                continue
+            for rest, priority in entries:
+                if priority >= best:
+                    break
+                end = position + 1 + len(rest)
+                if not rest or tuple(tokens[position + 1:end]) == rest:
+                    best = priority
+                    break
+            if best == 0:
+                break
+
+        if best < len(self._intents):
+            return self._intents[best]
+        return None
+
+    @property
+    def intents(self) -> List[Intent]:
+        """Registered intents in priority order."""
+        return list(self._intents)
+
+    def __len__(self) -> int:
+        return len(self._intents)
@@ -0,0 +1,231 @@
+"""Per-session conversation history."""
+
+import itertools
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+USER_INPUT = sys.intern("user_input")
+AGENT_RESPONSE = sys.intern("agent_response")
+
+DEFAULT_SESSION_ID = "default"
+
+_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+_id_lock = threading.Lock()
+_last_id = 0
+
+
+def next_record_id() -> int:
+    """Return a strictly increasing record ID based on epoch microseconds.
+
+    IDs double as pagination cursors and stay ordered across restarts as long
+    as the clock does not jump backwards.
+    """
+    global _last_id
+    with _id_lock:
+        _last_id = max(_last_id + 1, time.time_ns() // 1000)
+        return _last_id
+
+
+def is_valid_session_id(session_id: Optional[str]) -> bool:
+    """Check that a client-supplied session ID is safe to use as a key.
+
+    The default session belongs to the local user, so clients cannot claim it.
+    """
+    return (
+        bool(session_id)
+        and session_id != DEFAULT_SESSION_ID
+        and _SESSION_ID_RE.match(session_id) is not None
+    )
+
+
+class HistoryRecord:
+    """A single history entry.
+
+    Timestamps are stored as float epoch seconds and only formatted when the
+    record is serialized. Record types are interned so every record of the
+    same type shares one string.
+    """
+
+    __slots__ = ("id", "kind", "content", "timestamp")
+
+    def __init__(
+        self,
+        kind: str,
+        content: str,
+        timestamp: Optional[float] = None,
+        record_id: Optional[int] = None,
+    ):
+        self.id = next_record_id() if record_id is None else record_id
+        self.kind = sys.intern(kind)
+        self.content = content
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HistoryRecord":
+        """Build a record from its serialized form."""
+        timestamp = data.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp).timestamp()
+        return cls(data["type"], data["content"], timestamp, data.get("id"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the record in the public history format."""
+        return {
+            "id": self.id,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "type": self.kind,
+            "content": self.content,
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        """Allow dict-style access to the serialized fields."""
+        if key == "id":
+            return self.id
+        if key == "type":
+            return self.kind
+        if key == "content":
+            return self.content
+        if key == "timestamp":
+            return datetime.fromtimestamp(self.timestamp).isoformat()
+        raise KeyError(key)
+
+    def __repr__(self) -> str:
+        return f"HistoryRecord({self.kind!r}, {self.content!r}, {self.timestamp!r})"
+
+
+class SessionHistory:
+    """Bounded ring buffer of history records for one session."""
+
+    __slots__ = ("_records", "last_access")
+
+    def __init__(self, max_records: int = 100):
+        self._records: deque = deque(maxlen=max_records)
+        self.last_access = time.monotonic()
+
+    def add(self, kind: str, content: str) -> HistoryRecord:
+        """Record a new entry, dropping the oldest one when full."""
+        record = HistoryRecord(kind, content)
+        self._records.append(record)
+        return record
+
+    def append(self, record: Union[HistoryRecord, Dict[str, Any]]) -> None:
+        """Append an existing record or a serialized dict."""
+        if not isinstance(record, HistoryRecord):
+            record = HistoryRecord.from_dict(record)
+        self._records.append(record)
+
+    def clear(self) -> None:
+        """Remove all records."""
+        self._records.clear()
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Serialize all records, oldest first."""
+        return [record.to_dict() for record in self._records]
+
+    def after(self, cursor: Optional[int], limit: int) -> List[HistoryRecord]:
+        """Return up to ``limit`` records with an ID greater than ``cursor``."""
+        records = self._records
+        if cursor is None:
+            start = 0
+        else:
+            # IDs increase monotonically, so scan back from the newest record.
+            start = len(records)
+            while start > 0 and records[start - 1].id > cursor:
+                start -= 1
+        return list(itertools.islice(records, start, start + limit))
+
+    def covers(self, cursor: Optional[int]) -> bool:
+        """Whether every record newer than ``cursor`` is still in memory."""
+        return bool(self._records) and cursor is not None and cursor >= self._records[0].id
+
+    @property
+    def max_records(self) -> Optional[int]:
+        """Maximum number of records kept."""
+        return self._records.maxlen
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[HistoryRecord]:
+        return iter(self._records)
+
+    def __getitem__(self, index: int) -> HistoryRecord:
+        return self._records[index]
+
+
+class SessionManager:
+    """Session histories keyed by session ID with LRU and idle eviction.
+
+    Sessions are kept in least-recently-used order. Creating a session beyond
+    ``max_sessions`` evicts the least recently used one, and sessions idle for
+    longer than ``idle_timeout`` seconds are dropped as they reach the front
+    of the queue. Intended to be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        max_history: int = 100,
+        idle_timeout: float = 3600.0,
+    ):
+        """Initialize the session manager."""
+        self.max_sessions = max_sessions
+        self.max_history = max_history
+        self.idle_timeout = idle_timeout
+        self._sessions: "OrderedDict[str, SessionHistory]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, session_id: Optional[str] = None) -> SessionHistory:
+        """Return the history for a session, creating it if needed."""
+        session_id = session_id or DEFAULT_SESSION_ID
+        now = time.monotonic()
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = SessionHistory(self.max_history)
+            self._sessions[session_id] = session
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_access = now
+
+        self._evict(now)
+        return session
+
+    def peek(self, session_id: Optional[str] = None) -> Optional[SessionHistory]:
+        """Return a session without creating it or refreshing its LRU position."""
+        return self._sessions.get(session_id or DEFAULT_SESSION_ID)
+
+    def discard(self, session_id: Optional[str] = None) -> None:
+        """Drop a session if it exists."""
+        self._sessions.pop(session_id or DEFAULT_SESSION_ID, None)
+
+    def evict_idle(self) -> int:
+        """Drop every session that has been idle too long."""
+        return self._evict(time.monotonic())
+
+    def _evict(self, now: float) -> int:
+        """Evict over-capacity and idle sessions from the LRU end."""
+        evicted = 0
+        deadline = now - self.idle_timeout
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and session.last_access >= deadline:
+                break
+            del self._sessions[session_id]
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
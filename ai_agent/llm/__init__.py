@@ -0,0 +1 @@
+# LLM backends module
\ No newline at end of file
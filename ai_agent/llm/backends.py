@@ -0,0 +1,287 @@
+"""Language model backends for general conversation."""
+
+import asyncio
+import json
+import logging
+import random
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional
+
+from ..core.config import Config
+
+if TYPE_CHECKING:
+    import httpx
+
+
+SYSTEM_PROMPT = (
+    "You are a helpful assistant for blind and visually impaired users. "
+    "Your replies are read aloud, so answer in short, plain sentences "
+    "without markdown, lists or visual formatting."
+)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class LLMBackend:
+    """Base class for general-conversation backends."""
+
+    name = "base"
+
+    async def generate(self, prompt: str) -> str:
+        """Return a reply to the user's prompt."""
+        raise NotImplementedError
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield the reply in fragments as they are produced.
+
+        Backends without native streaming yield the whole reply at once.
+        """
+        yield await self.generate(prompt)
+
+    async def aclose(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class PlaceholderBackend(LLMBackend):
+    """Canned reply used when no model is configured."""
+
+    name = "placeholder"
+
+    async def generate(self, prompt: str) -> str:
+        """Echo the prompt back with an explanation."""
+        return f"I heard you say: '{prompt}'. This is a general response. In a full implementation, this would be processed by an AI model to provide intelligent responses."
+
+
+class HTTPBackend(LLMBackend):
+    """Backend that calls a model over HTTP through one pooled client.
+
+    The ``httpx.AsyncClient`` is created on first use and shared by every
+    request, so connections are kept alive and reused instead of being
+    opened per call. Transport errors and retryable statuses are retried
+    with exponential backoff and full jitter.
+    """
+
+    default_base_url = ""
+    default_model = ""
+
+    def __init__(
+        self,
+        config: Config,
+        api_key: Optional[str] = None,
+        client: Optional["httpx.AsyncClient"] = None,
+        retry_base_delay: float = 0.25,
+        retry_max_delay: float = 4.0,
+    ):
+        """Initialize the backend."""
+        self.config = config
+        self.api_key = api_key
+        self.base_url = (config.llm_base_url or self.default_base_url).rstrip("/")
+        self.model = config.llm_model or self.default_model
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.logger = logging.getLogger(__name__)
+        self._client = client
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        """The shared, connection-pooled HTTP client."""
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(
+                    max_connections=self.config.llm_max_connections,
+                    max_keepalive_connections=self.config.llm_max_connections,
+                    keepalive_expiry=30.0,
+                ),
+                timeout=httpx.Timeout(self.config.llm_timeout, connect=5.0),
+            )
+        return self._client
+
+    def _headers(self) -> Dict[str, str]:
+        """Headers sent with every request."""
+        return {}
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a JSON payload, retrying transient failures."""
+        import httpx
+
+        attempts = self.config.llm_max_retries + 1
+        for attempt in range(attempts):
+            try:
+                response = await self.client.post(path, json=payload, headers=self._headers())
+                if response.status_code in RETRY_STATUSES and attempt + 1 < attempts:
+                    self.logger.warning("%s returned %s, retrying", self.name, response.status_code)
+                    await asyncio.sleep(self._backoff(attempt, response.headers.get("retry-after")))
+                    continue
+                response.raise_for_status()
+                return response.json()
+
+            except httpx.TransportError as e:
+                if attempt + 1 >= attempts:
+                    raise
+                self.logger.warning("%s request failed (%r), retrying", self.name, e)
+                await asyncio.sleep(self._backoff(attempt))
+
+        raise RuntimeError("unreachable")
+
+    async def _stream_events(self, path: str, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """POST a streaming request and yield its server-sent JSON events.
+
+        Failures are retried like ``_post`` until the first event arrives;
+        after that an error is raised to the caller.
+        """
+        import httpx
+
+        attempts = self.config.llm_max_retries + 1
+        for attempt in range(attempts):
+            retry_after = None
+            started = False
+            try:
+                async with self.client.stream("POST", path, json=payload, headers=self._headers()) as response:
+                    if response.status_code in RETRY_STATUSES and attempt + 1 < attempts:
+                        self.logger.warning("%s returned %s, retrying", self.name, response.status_code)
+                        retry_after = response.headers.get("retry-after")
+                    else:
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[5:].strip()
+                            if data == "[DONE]":
+                                return
+                            started = True
+                            yield json.loads(data)
+                        return
+
+            except httpx.TransportError as e:
+                if started or attempt + 1 >= attempts:
+                    raise
+                self.logger.warning("%s stream failed (%r), retrying", self.name, e)
+
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before the next attempt, honoring Retry-After when given."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.retry_max_delay)
+            except ValueError:
+                pass
+        ceiling = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def aclose(self) -> None:
+        """Close the pooled client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class OpenAIBackend(HTTPBackend):
+    """OpenAI-compatible chat completions API."""
+
+    name = "openai"
+    default_base_url = "https://api.openai.com/v1"
+    default_model = "gpt-4o-mini"
+
+    def _headers(self) -> Dict[str, str]:
+        """Bearer authentication, when a key is set."""
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    async def generate(self, prompt: str) -> str:
+        """Ask the chat completions endpoint for a reply."""
+        data = await self._post("/chat/completions", {
+            "model": self.model,
+            "max_tokens": self.config.llm_max_tokens,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+        })
+        return data["choices"][0]["message"]["content"].strip()
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Stream the reply from the chat completions endpoint."""
+        events = self._stream_events("/chat/completions", {
+            "model": self.model,
+            "max_tokens": self.config.llm_max_tokens,
+            "stream": True,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+        })
+        async for event in events:
+            for choice in event.get("choices", []):
+                content = (choice.get("delta") or {}).get("content")
+                if content:
+                    yield content
+
+
+class AnthropicBackend(HTTPBackend):
+    """Anthropic messages API."""
+
+    name = "anthropic"
+    default_base_url = "https://api.anthropic.com/v1"
+    default_model = "claude-3-5-haiku-latest"
+
+    def _headers(self) -> Dict[str, str]:
+        """API key and version headers."""
+        headers = {"anthropic-version": "2023-06-01"}
+        if self.api_key:
+            headers["x-api-key"] = self.api_key
+        return headers
+
+    async def generate(self, prompt: str) -> str:
+        """Ask the messages endpoint for a reply."""
+        data = await self._post("/messages", {
+            "model": self.model,
+            "max_tokens": self.config.llm_max_tokens,
+            "system": SYSTEM_PROMPT,
+            "messages": [{"role": "user", "content": prompt}],
+        })
+        return "".join(block.get("text", "") for block in data["content"]).strip()
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Stream the reply from the messages endpoint."""
+        events = self._stream_events("/messages", {
+            "model": self.model,
+            "max_tokens": self.config.llm_max_tokens,
+            "stream": True,
+            "system": SYSTEM_PROMPT,
+            "messages": [{"role": "user", "content": prompt}],
+        })
+        async for event in events:
+            if event.get("type") == "content_block_delta":
+                text = event.get("delta", {}).get("text")
+                if text:
+                    yield text
+
+
+def create_backend(config: Config) -> LLMBackend:
+    """Create the backend selected by ``config.llm_backend``.
+
+    ``"auto"`` picks OpenAI or Anthropic based on which API key is set, an
+    OpenAI-compatible backend when only ``llm_base_url`` is set (such as the
+    local stub server), and the placeholder otherwise.
+    """
+    name = (config.llm_backend or "auto").lower()
+    if name == "auto":
+        if config.openai_api_key:
+            name = "openai"
+        elif config.anthropic_api_key:
+            name = "anthropic"
+        elif config.llm_base_url:
+            name = "openai"
+        else:
+            name = "placeholder"
+
+    if name == "openai":
+        return OpenAIBackend(config, config.openai_api_key)
+    if name == "anthropic":
+        return AnthropicBackend(config, config.anthropic_api_key)
+    if name == "placeholder":
+        return PlaceholderBackend()
+    raise ValueError(f"Unknown LLM backend: {config.llm_backend}")
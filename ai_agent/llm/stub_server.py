@@ -0,0 +1,126 @@
+"""Local stand-in for the OpenAI and Anthropic APIs.
+
+Lets the general-conversation path be exercised and load-tested offline:
+
+    python -m ai_agent.llm.stub_server --port 8081 --latency 0.2
+    LLM_BASE_URL=http://127.0.0.1:8081/v1 ai-agent text -t "tell me a story"
+"""
+
+import asyncio
+import json
+import random
+
+import click
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def make_reply(prompt: str) -> str:
+    """Deterministic reply for a prompt."""
+    return f"This is a stub reply to: {prompt}"
+
+
+def create_stub_app(
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    token_latency: float = 0.0,
+) -> FastAPI:
+    """Create the stub API app.
+
+    Each request waits ``latency`` plus up to ``jitter`` seconds, and fails
+    with a 503 with probability ``error_rate`` to exercise client retries.
+    Streaming requests then emit one word every ``token_latency`` seconds.
+    """
+    app = FastAPI(title="LLM stub server")
+
+    async def simulate() -> bool:
+        """Sleep for the simulated latency; return False to fail the request."""
+        await asyncio.sleep(latency + random.uniform(0, jitter))
+        return random.random() >= error_rate
+
+    def last_user_message(messages) -> str:
+        """Text of the last user message in a chat payload."""
+        for message in reversed(messages):
+            if message.get("role") == "user":
+                content = message.get("content", "")
+                if isinstance(content, list):
+                    content = " ".join(part.get("text", "") for part in content)
+                return content
+        return ""
+
+    def stream_words(reply: str, to_event):
+        """Stream a reply word by word as server-sent events."""
+        async def events():
+            words = reply.split(" ")
+            for index, word in enumerate(words):
+                if token_latency:
+                    await asyncio.sleep(token_latency)
+                fragment = word if index == 0 else " " + word
+                yield f"data: {json.dumps(to_event(fragment))}\n\n"
+            yield "data: [DONE]\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        """OpenAI-style chat completion."""
+        if not await simulate():
+            return JSONResponse({"error": "simulated overload"}, status_code=503)
+        payload = await request.json()
+        reply = make_reply(last_user_message(payload.get("messages", [])))
+        if payload.get("stream"):
+            return stream_words(reply, lambda fragment: {
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"content": fragment}}],
+            })
+        return JSONResponse({
+            "object": "chat.completion",
+            "model": payload.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop",
+            }],
+        })
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        """Anthropic-style message."""
+        if not await simulate():
+            return JSONResponse({"error": "simulated overload"}, status_code=503)
+        payload = await request.json()
+        reply = make_reply(last_user_message(payload.get("messages", [])))
+        if payload.get("stream"):
+            return stream_words(reply, lambda fragment: {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": fragment},
+            })
+        return JSONResponse({
+            "type": "message",
+            "role": "assistant",
+            "model": payload.get("model", "stub"),
+            "content": [{"type": "text", "text": reply}],
+            "stop_reason": "end_turn",
+        })
+
+    return app
+
+
+@click.command()
+@click.option('--host', default='127.0.0.1', help='Host to bind to')
+@click.option('--port', default=8081, help='Port to bind to')
+@click.option('--latency', default=0.0, help='Base response latency in seconds')
+@click.option('--jitter', default=0.0, help='Extra random latency in seconds')
+@click.option('--error-rate', default=0.0, help='Fraction of requests that fail with 503')
+@click.option('--token-latency', default=0.0, help='Delay between streamed words in seconds')
+def main(host, port, latency, jitter, error_rate, token_latency):
+    """Run the LLM stub server."""
+    import uvicorn
+
+    app = create_stub_app(latency, jitter, error_rate, token_latency)
+    uvicorn.run(app, host=host, port=port, log_level="warning")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+"""Load generator for the HTTP API.
+
+Drives a running WebInterface or app.py server with a weighted mix of text,
+history and image-upload requests over pooled connections, then reports
+throughput, errors and latency percentiles per endpoint.
+
+Two modes are supported:
+
+* closed loop (``concurrency``): that many workers send requests back to
+  back, which finds the throughput the server sustains;
+* open loop (``rate``): requests start on a fixed schedule whether or not
+  earlier ones have finished, and latency is measured from the scheduled
+  start, so a stalled server shows up as queueing delay instead of as fewer
+  requests.
+"""
+
+import asyncio
+import itertools
+import math
+import random
+import struct
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+from .core.config import Config
+
+
+DEFAULT_MIX = "text=8,history=1,image=1"
+
+TEXT_COMMANDS = [
+    "hello",
+    "what time is it",
+    "help",
+    "what can you do",
+    "tell me about the weather in paris",
+    "how do I make a cup of tea",
+    "goodbye",
+]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse ``"text=8,history=1"`` into weights per request kind."""
+    weights = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in REQUESTS:
+            raise ValueError(f"Unknown request kind {name!r}; choose from {', '.join(REQUESTS)}")
+        weights[name] = float(weight) if weight else 1.0
+    if not weights or sum(weights.values()) <= 0:
+        raise ValueError("The request mix must have a positive weight")
+    return weights
+
+
+def make_png(width: int = 32, height: int = 32) -> bytes:
+    """Encode a small gray PNG without needing Pillow."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = b"".join(b"\x00" + b"\x80" * width for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(rank, 1)) - 1]
+
+
+class EndpointStats:
+    """Latencies and outcomes for one request kind."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.statuses: Dict[str, int] = {}
+
+    def record(self, latency: float, status: str, ok: bool) -> None:
+        """Record one finished request."""
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> Dict[str, object]:
+        """Throughput, error rate and latency percentiles in milliseconds."""
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "throughput": count / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+async def _send_text(client: httpx.AsyncClient, session_id: str, rng: random.Random, image: bytes):
+    return await client.post(
+        "/process_text",
+        data={"text": rng.choice(TEXT_COMMANDS)},
+        headers={"X-Session-ID": session_id},
+    )
+
+
+async def _send_history(client: httpx.AsyncClient, session_id: str, rng: random.Random, image: bytes):
+    return await client.get("/history", params={"limit": 20}, headers={"X-Session-ID": session_id})
+
+
+async def _send_image(client: httpx.AsyncClient, session_id: str, rng: random.Random, image: bytes):
+    return await client.post(
+        "/analyze_image",
+        files={"file": ("load.png", image, "image/png")},
+        headers={"X-Session-ID": session_id},
+    )
+
+
+REQUESTS = {"text": _send_text, "history": _send_history, "image": _send_image}
+
+
+class LoadTest:
+    """One load test run against a base URL."""
+
+    def __init__(
+        self,
+        base_url: str,
+        mix: Dict[str, float],
+        duration: float = 10.0,
+        concurrency: int = 10,
+        rate: Optional[float] = None,
+        timeout: float = 30.0,
+        image: Optional[bytes] = None,
+        seed: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """Configure the run. ``rate`` switches from closed to open loop."""
+        self.base_url = base_url
+        self.mix = mix
+        self.duration = duration
+        self.concurrency = concurrency
+        self.rate = rate
+        self.timeout = timeout
+        self.image = image or make_png()
+        self.transport = transport
+        self.stats = {name: EndpointStats() for name in mix}
+
+        self._rng = random.Random(seed)
+        self._kinds = list(mix)
+        self._weights = [mix[name] for name in self._kinds]
+
+    async def run(self) -> Dict[str, object]:
+        """Run the test and return the report."""
+        connections = max(self.concurrency, int(self.rate or 0) * 2, 1)
+        client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+            transport=self.transport,
+        )
+        try:
+            start = time.perf_counter()
+            if self.rate:
+                await self._open_loop(client, start)
+            else:
+                await self._closed_loop(client, start)
+            elapsed = time.perf_counter() - start
+        finally:
+            await client.aclose()
+        return self.report(elapsed)
+
+    async def _closed_loop(self, client: httpx.AsyncClient, start: float) -> None:
+        """Keep ``concurrency`` requests in flight until the time is up."""
+        deadline = start + self.duration
+
+        async def worker():
+            session_id = uuid.uuid4().hex
+            while time.perf_counter() < deadline:
+                await self._request(client, session_id, time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def _open_loop(self, client: httpx.AsyncClient, start: float) -> None:
+        """Start requests at ``rate`` per second regardless of completions."""
+        interval = 1.0 / self.rate
+        sessions = [uuid.uuid4().hex for _ in range(max(1, self.concurrency))]
+        tasks = []
+        for index in itertools.count():
+            scheduled = start + index * interval
+            if scheduled >= start + self.duration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            session_id = sessions[index % len(sessions)]
+            tasks.append(asyncio.ensure_future(self._request(client, session_id, scheduled)))
+        await asyncio.gather(*tasks)
+
+    async def _request(self, client: httpx.AsyncClient, session_id: str, started: float) -> None:
+        """Send one request of a randomly chosen kind and record the outcome."""
+        kind = self._rng.choices(self._kinds, self._weights)[0]
+        try:
+            response = await REQUESTS[kind](client, session_id, self._rng, self.image)
+            status = str(response.status_code)
+            ok = response.is_success
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+            ok = False
+        self.stats[kind].record(time.perf_counter() - started, status, ok)
+
+    def report(self, elapsed: float) -> Dict[str, object]:
+        """Per-endpoint summaries plus totals."""
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.latencies.extend(stats.latencies)
+            total.errors += stats.errors
+            for status, count in stats.statuses.items():
+                total.statuses[status] = total.statuses.get(status, 0) + count
+        return {
+            "base_url": self.base_url,
+            "mode": f"rate={self.rate:g}/s" if self.rate else f"concurrency={self.concurrency}",
+            "duration": elapsed,
+            "endpoints": {name: stats.summary(elapsed) for name, stats in self.stats.items()},
+            "total": total.summary(elapsed),
+        }
+
+
+def format_report(report: Dict[str, object]) -> str:
+    """Render a report as a table."""
+    lines = [
+        f"Load test against {report['base_url']} ({report['mode']}, {report['duration']:.1f}s)",
+        f"{'endpoint':<10} {'requests':>8} {'req/s':>8} {'errors':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}",
+    ]
+    rows = list(report["endpoints"].items()) + [("total", report["total"])]
+    for name, row in rows:
+        lines.append(
+            f"{name:<10} {row['requests']:>8} {row['throughput']:>8.1f} {row['error_rate']:>6.1%} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+        )
+    statuses = ", ".join(f"{status}: {count}" for status, count in report["total"]["statuses"].items())
+    lines.append(f"Responses: {statuses or 'none'}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def local_server(config: Optional[Config] = None) -> Iterator[str]:
+    """Serve a headless WebInterface on a free local port and yield its URL.
+
+    Lets CI load-test the real HTTP stack without a separate server process.
+    """
+    import uvicorn
+
+    from .core.agent import AIAgent
+    from .web.interface import WebInterface
+
+    if config is None:
+        config = Config.from_env()
+        config.headless = True
+        config.log_file = None
+    web = WebInterface(AIAgent(config), config)
+    server = uvicorn.Server(uvicorn.Config(web.app, host="127.0.0.1", port=0, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="loadtest-server", daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not server.started:
+            if not thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("Local server failed to start")
+            time.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
@@ -0,0 +1,267 @@
+"""Text-to-speech engine backends, selected by ``Config.tts_engine``.
+
+Every backend produces an engine with the pyttsx3 engine interface
+(``say``, ``save_to_file``, ``runAndWait``, ``stop``, ``connect``,
+``setProperty`` and ``getProperty``), so the speech worker and the
+synthesis pool drive any of them the same way.
+
+* ``pyttsx3``: the platform engine (SAPI, NSSpeechSynthesizer or espeak).
+* ``espeak``: runs espeak-ng or espeak as a subprocess per utterance. It
+  starts quickly and needs no Python bindings.
+* ``fake``: deterministic and in-process. It renders silent WAV clips and
+  plays nothing, for tests and benchmarks.
+
+``profile_backend`` reports a backend's start-up cost and real-time factor
+(rendering time over audio duration), to pick the fastest engine for a
+deployment.
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import wave
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional
+
+
+Voice = namedtuple("Voice", ["id", "name"])
+
+TTS_BACKENDS: Dict[str, Callable[[], Any]] = {}
+
+PROFILE_TEXT = (
+    "The image shows a wide landscape with a bright blue sky. "
+    "In the foreground, a path leads to a small wooden bridge."
+)
+
+
+def register_backend(name: str):
+    """Register an engine factory under a backend name."""
+    def register(factory):
+        TTS_BACKENDS[name] = factory
+        return factory
+    return register
+
+
+def create_engine(name: str = "pyttsx3"):
+    """Create an engine for the named backend."""
+    factory = TTS_BACKENDS.get((name or "pyttsx3").lower())
+    if factory is None:
+        raise ValueError(f"Unknown TTS engine: {name}; choose from {', '.join(sorted(TTS_BACKENDS))}")
+    return factory()
+
+
+def audio_seconds(clip: bytes) -> Optional[float]:
+    """Duration of a WAV clip, or None for other formats."""
+    try:
+        with wave.open(io.BytesIO(clip)) as audio:
+            return audio.getnframes() / audio.getframerate()
+    except (wave.Error, EOFError, ZeroDivisionError):
+        return None
+
+
+def profile_backend(name: str, text: str = PROFILE_TEXT) -> Dict[str, Optional[float]]:
+    """Time creating an engine and rendering ``text`` with it.
+
+    ``real_time_factor`` is rendering time over audio duration, so values
+    below 1 mean faster than real time. It is None when the clip is not WAV.
+    """
+    start = time.perf_counter()
+    engine = create_engine(name)
+    init_seconds = time.perf_counter() - start
+
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        engine.save_to_file(text, path)
+        engine.runAndWait()
+        render_seconds = time.perf_counter() - start
+        with open(path, "rb") as f:
+            duration = audio_seconds(f.read())
+    finally:
+        os.remove(path)
+
+    return {
+        "init_ms": init_seconds * 1000,
+        "render_ms": render_seconds * 1000,
+        "audio_seconds": duration,
+        "real_time_factor": render_seconds / duration if duration else None,
+    }
+
+
+@register_backend("pyttsx3")
+def _create_pyttsx3():
+    import pyttsx3
+    return pyttsx3.init()
+
+
+class _QueuedEngine:
+    """pyttsx3-style command queue and callbacks shared by the engines below."""
+
+    def __init__(self):
+        self.properties: Dict[str, Any] = {"rate": 180, "volume": 1.0}
+        self._queue: List = []  # (text, name, output path or None)
+        self._callbacks: Dict[str, Callable] = {}
+        self._stopped = False
+
+    def connect(self, topic: str, callback: Callable) -> None:
+        """Register a callback for ``started-utterance`` or ``started-word``."""
+        self._callbacks[topic] = callback
+
+    def _notify(self, topic: str, *args) -> None:
+        callback = self._callbacks.get(topic)
+        if callback is not None:
+            callback(*args)
+
+    def getProperty(self, name: str):
+        """Return a property value."""
+        return self.properties.get(name)
+
+    def setProperty(self, name: str, value) -> None:
+        """Set a property for later utterances."""
+        self.properties[name] = value
+
+    def say(self, text: str, name: Optional[str] = None) -> None:
+        """Queue text to be spoken."""
+        self._queue.append((text, name, None))
+
+    def save_to_file(self, text: str, path: str, name: Optional[str] = None) -> None:
+        """Queue text to be written to an audio file."""
+        self._queue.append((text, name, path))
+
+    def stop(self) -> None:
+        """Stop the current utterance and drop the queue."""
+        self._stopped = True
+
+    def runAndWait(self) -> None:
+        """Process the queue until it is empty or stopped."""
+        self._stopped = False
+        while self._queue and not self._stopped:
+            text, name, path = self._queue.pop(0)
+            if path is not None:
+                self._save(text, path)
+            else:
+                self._notify("started-utterance", name)
+                self._play(text, name)
+        self._queue.clear()
+
+    def _save(self, text: str, path: str) -> None:
+        raise NotImplementedError
+
+    def _play(self, text: str, name: Optional[str]) -> None:
+        raise NotImplementedError
+
+
+class EspeakEngine(_QueuedEngine):
+    """Engine that runs espeak-ng (or espeak) once per utterance."""
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, binary: Optional[str] = None):
+        """Find the espeak binary; raises RuntimeError if it is not installed."""
+        super().__init__()
+        self.binary = binary or shutil.which("espeak-ng") or shutil.which("espeak")
+        if not self.binary:
+            raise RuntimeError("espeak-ng is not installed")
+        self.properties["voice"] = "en"
+        self._process: Optional[subprocess.Popen] = None
+        self._voices: Optional[List[Voice]] = None
+
+    def getProperty(self, name: str):
+        """Return a property value; ``voices`` lists the installed voices."""
+        if name == "voices":
+            if self._voices is None:
+                self._voices = self._list_voices()
+            return self._voices
+        return super().getProperty(name)
+
+    def _list_voices(self) -> List[Voice]:
+        """Parse ``espeak --voices``: language in column 2, name in column 4."""
+        try:
+            output = subprocess.run(
+                [self.binary, "--voices"], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return []
+        voices = []
+        for line in output.splitlines()[1:]:
+            columns = line.split()
+            if len(columns) >= 4:
+                voices.append(Voice(columns[1], columns[3]))
+        return voices
+
+    def _command(self, *extra: str) -> List[str]:
+        amplitude = int(float(self.properties.get("volume", 1.0)) * 100)
+        return [
+            self.binary,
+            "-v", str(self.properties.get("voice") or "en"),
+            "-s", str(int(self.properties.get("rate") or 180)),
+            "-a", str(amplitude),
+            *extra,
+            "--stdin",
+        ]
+
+    def _save(self, text: str, path: str) -> None:
+        subprocess.run(self._command("-w", path), input=text.encode("utf-8"), check=True, timeout=60)
+
+    def _play(self, text: str, name: Optional[str]) -> None:
+        self._process = subprocess.Popen(self._command(), stdin=subprocess.PIPE)
+        try:
+            self._process.stdin.write(text.encode("utf-8"))
+            self._process.stdin.close()
+            # Word callbacks let the owner stop playback between polls
+            while self._process.poll() is None:
+                self._notify("started-word", name, 0, 0)
+                if self._stopped:
+                    self._process.terminate()
+                    break
+                time.sleep(self.POLL_INTERVAL)
+        finally:
+            self._process.wait()
+            self._process = None
+
+
+class FakeTTSEngine(_QueuedEngine):
+    """Deterministic engine that renders silence and plays nothing."""
+
+    SAMPLE_RATE = 16000
+    SECONDS_PER_CHAR = 0.06
+
+    def __init__(self):
+        """Initialize with a single fake voice."""
+        super().__init__()
+        self.properties["voice"] = "fake"
+        self.properties["voices"] = [Voice("fake", "Fake voice")]
+        self.spoken: List[str] = []
+
+    def _samples(self, count: int) -> bytes:
+        """16-bit mono PCM for ``count`` samples."""
+        return bytes(2 * count)
+
+    def _save(self, text: str, path: str) -> None:
+        # Faster speech gives shorter clips, as with a real engine
+        rate = int(self.properties.get("rate") or 180)
+        count = int(len(text) * self.SECONDS_PER_CHAR * 180 / rate * self.SAMPLE_RATE)
+        with wave.open(path, "wb") as output:
+            output.setnchannels(1)
+            output.setsampwidth(2)
+            output.setframerate(self.SAMPLE_RATE)
+            output.writeframes(self._samples(count))
+
+    def _play(self, text: str, name: Optional[str]) -> None:
+        self._notify("started-word", name, 0, len(text))
+        if not self._stopped:
+            self.spoken.append(text)
+
+
+@register_backend("espeak")
+def _create_espeak():
+    return EspeakEngine()
+
+
+@register_backend("fake")
+def _create_fake():
+    return FakeTTSEngine()
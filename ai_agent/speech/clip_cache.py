@@ -0,0 +1,189 @@
+"""Content-addressed cache of rendered speech clips.
+
+Clips are keyed by a hash of the text, voice and rate that produced them.
+A byte-bounded LRU in memory sits in front of a larger byte-bounded LRU of
+files on disk, so clips survive restarts and hot ones are served without
+touching the disk.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+CLIP_SUFFIX = ".clip"
+
+
+def clip_key(text: str, voice: str, rate: int) -> str:
+    """Cache key for a clip of ``text`` spoken with a voice and rate."""
+    return hashlib.sha256(f"{voice}\0{rate}\0{text}".encode("utf-8")).hexdigest()
+
+
+def clip_media_type(clip: bytes) -> str:
+    """Media type of a rendered clip, from its header."""
+    if clip[:4] == b"RIFF":
+        return "audio/wav"
+    if clip[:4] == b"FORM":
+        return "audio/aiff"
+    return "application/octet-stream"
+
+
+class ClipCache:
+    """Two-tier LRU of audio clips: memory first, then disk.
+
+    Both tiers are bounded in bytes. Methods are thread-safe; disk access
+    happens in ``load`` and ``put`` only, so callers on the event loop can
+    run those in an executor and keep ``get`` on the loop.
+    """
+
+    def __init__(self, max_bytes: int, directory: Optional[str] = None, max_disk_bytes: int = 0):
+        """Initialize the cache, indexing clips already on disk."""
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.logger = logging.getLogger(__name__)
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> size
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if directory:
+            self._index_directory()
+
+    def _index_directory(self) -> None:
+        """Load the sizes of clips on disk, least recently used first."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = [
+                entry for entry in os.scandir(self.directory)
+                if entry.is_file() and entry.name.endswith(CLIP_SUFFIX)
+            ]
+        except OSError as e:
+            self.logger.error("Error opening speech cache directory %s: %s", self.directory, e)
+            self.directory = None
+            return
+
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            size = entry.stat().st_size
+            self._disk[entry.name[:-len(CLIP_SUFFIX)]] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CLIP_SUFFIX)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return a clip from memory, or None."""
+        with self._lock:
+            clip = self._memory.get(key)
+            if clip is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+            return clip
+
+    def load(self, key: str) -> Optional[bytes]:
+        """Return a clip from memory or disk, promoting disk hits to memory."""
+        clip = self.get(key)
+        if clip is not None:
+            return clip
+
+        with self._lock:
+            on_disk = self.directory is not None and key in self._disk
+        if not on_disk:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            with open(self._path(key), "rb") as f:
+                clip = f.read()
+            os.utime(self._path(key))
+        except OSError as e:
+            self.logger.error("Error reading cached speech clip: %s", e)
+            with self._lock:
+                self._forget_disk(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self.disk_hits += 1
+            self._remember(key, clip)
+        return clip
+
+    def put(self, key: str, clip: bytes) -> None:
+        """Store a clip in memory and on disk."""
+        with self._lock:
+            self._remember(key, clip)
+            if self.directory is None or key in self._disk:
+                return
+
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(clip)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            self.logger.error("Error writing cached speech clip: %s", e)
+            return
+
+        with self._lock:
+            self._disk[key] = len(clip)
+            self._disk_bytes += len(clip)
+            self._evict_disk()
+
+    def _remember(self, key: str, clip: bytes) -> None:
+        """Add a clip to the memory tier. The caller holds the lock."""
+        if len(clip) > self.max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = clip
+        self._memory_bytes += len(clip)
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _forget_disk(self, key: str) -> None:
+        """Drop a key from the disk index. The caller holds the lock."""
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+
+    def _evict_disk(self) -> None:
+        """Delete the least recently used files over the disk budget."""
+        while self._disk and self._disk_bytes > self.max_disk_bytes:
+            key = next(iter(self._disk))
+            self._forget_disk(key)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, float]:
+        """Counters for monitoring."""
+        with self._lock:
+            return {
+                "entries": len(self._memory),
+                "bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def __len__(self) -> int:
+        return len(self._memory)
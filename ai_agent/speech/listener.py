@@ -0,0 +1,222 @@
+"""Continuous capture of utterances from a microphone or recorded audio.
+
+A capture thread keeps one audio stream open, feeds it through a
+VoiceActivityDetector and puts each utterance on an asyncio queue. Speech
+that starts while a previous command is still being processed is therefore
+queued rather than lost.
+
+Sources have ``sample_rate`` and ``sample_width`` attributes, a ``read()``
+method returning the next chunk of 16-bit mono PCM (empty at the end of the
+stream), and are context managers that open and close the stream.
+``WavSource`` plays WAV files, so listening can be tested without a
+microphone.
+
+The microphone also hears the agent's own replies. While ``muted()`` is
+true, and for a short echo tail after, captured audio is read and thrown
+away, and an utterance in progress is dropped, so the agent's speech is
+never queued as the next command.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import wave
+from typing import Any, Callable, List, Optional
+
+from .vad import VoiceActivityDetector
+
+
+# Audio still buffered, or echoing in the room, after playback stops
+ECHO_TAIL_SECONDS = 0.3
+
+
+class Segment:
+    """One utterance of 16-bit mono PCM."""
+
+    __slots__ = ("pcm", "sample_rate", "sample_width", "captured_at")
+
+    def __init__(self, pcm: bytes, sample_rate: int, sample_width: int = 2):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.captured_at = time.time()
+
+    @property
+    def duration(self) -> float:
+        """Length in seconds."""
+        return len(self.pcm) / (self.sample_rate * self.sample_width)
+
+
+class WavSource:
+    """Audio source that reads WAV files in place of a microphone.
+
+    The files must be 16-bit mono at one sample rate. Silence is inserted
+    between files so each is heard as a separate utterance. With
+    ``realtime`` set, chunks are delivered at the pace they would be
+    recorded.
+    """
+
+    def __init__(
+        self,
+        paths: List[str],
+        chunk_frames: int = 1024,
+        gap_seconds: float = 1.0,
+        realtime: bool = False,
+    ):
+        """Check the files' formats."""
+        self.paths = list(paths)
+        self.chunk_frames = chunk_frames
+        self.gap_seconds = gap_seconds
+        self.realtime = realtime
+        self.sample_width = 2
+        self.sample_rate = 0
+        for path in self.paths:
+            with wave.open(path, "rb") as audio:
+                if audio.getnchannels() != 1 or audio.getsampwidth() != 2:
+                    raise ValueError(f"{path}: expected 16-bit mono audio")
+                if self.sample_rate and audio.getframerate() != self.sample_rate:
+                    raise ValueError(f"{path}: sample rate differs from {self.sample_rate} Hz")
+                self.sample_rate = audio.getframerate()
+        self._chunks: List[bytes] = []
+
+    def __enter__(self) -> "WavSource":
+        gap = bytes(2 * int(self.sample_rate * self.gap_seconds))
+        self._chunks = []
+        for path in self.paths:
+            with wave.open(path, "rb") as audio:
+                pcm = audio.readframes(audio.getnframes())
+            step = 2 * self.chunk_frames
+            self._chunks.extend(pcm[offset:offset + step] for offset in range(0, len(pcm), step))
+            self._chunks.append(gap)
+        self._chunks.reverse()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._chunks = []
+
+    def read(self) -> bytes:
+        """Next chunk of PCM, or b"" after the last file."""
+        if not self._chunks:
+            return b""
+        chunk = self._chunks.pop()
+        if self.realtime:
+            time.sleep(len(chunk) / (2 * self.sample_rate))
+        return chunk
+
+
+class ContinuousListener:
+    """Capture thread that cuts a source into utterances for the event loop."""
+
+    def __init__(
+        self,
+        source: Any,
+        detector_factory: Callable[[int], VoiceActivityDetector] = VoiceActivityDetector,
+        max_queue: int = 8,
+        muted: Optional[Callable[[], bool]] = None,
+        echo_tail_seconds: float = ECHO_TAIL_SECONDS,
+    ):
+        """Prepare to listen; ``detector_factory`` is called with the sample rate.
+
+        ``muted`` is polled for every chunk; while it returns true, such as
+        while the agent is speaking, nothing is heard.
+        """
+        self.source = source
+        self.logger = logging.getLogger(__name__)
+        self.detector: Optional[VoiceActivityDetector] = None
+        self.dropped = 0
+        self.suppressed = 0
+        self.finished = False
+        self.echo_tail_seconds = echo_tail_seconds
+
+        self._detector_factory = detector_factory
+        self._max_queue = max_queue
+        self._muted = muted
+        self._muted_until = 0.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the capture thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Open the source and start capturing. Call from the event loop."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._thread = threading.Thread(target=self._capture, name="stt-capture", daemon=True)
+        self._thread.start()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Segment]:
+        """Next utterance, or None on timeout or at the end of the stream."""
+        if self._queue is None or (self.finished and self._queue.empty()):
+            return None
+        try:
+            segment = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if segment is None:
+            self.finished = True
+        return segment
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Stop capturing and close the source."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _capture(self) -> None:
+        """Read the source until it ends or the listener is closed."""
+        try:
+            with self.source as source:
+                if source.sample_width != 2:
+                    raise ValueError(f"Unsupported sample width: {source.sample_width} bytes")
+                self.detector = self._detector_factory(source.sample_rate)
+                self.logger.info("Continuous listening started at %d Hz", source.sample_rate)
+                while not self._stop.is_set():
+                    chunk = source.read()
+                    if not chunk:
+                        break
+                    if self._is_muted():
+                        # Our own voice: drop it, and whatever it interrupted
+                        if self.detector.flush() is not None:
+                            self.suppressed += 1
+                        continue
+                    for pcm in self.detector.feed(chunk):
+                        self._emit(Segment(pcm, source.sample_rate))
+                pcm = self.detector.flush()
+                if pcm:
+                    self._emit(Segment(pcm, source.sample_rate))
+        except Exception as e:
+            self.logger.error("Error capturing audio: %s", e)
+        finally:
+            self._emit(None)
+
+    def _is_muted(self) -> bool:
+        """Whether to ignore audio now: while muted and for the echo tail after."""
+        now = time.monotonic()
+        if self._muted is not None and self._muted():
+            self._muted_until = now + self.echo_tail_seconds
+            return True
+        return now < self._muted_until
+
+    def _emit(self, segment: Optional[Segment]) -> None:
+        """Hand an utterance (or the end-of-stream marker) to the event loop."""
+        try:
+            self._loop.call_soon_threadsafe(self._put, segment)
+        except RuntimeError:
+            # The event loop has been closed
+            pass
+
+    def _put(self, segment: Optional[Segment]) -> None:
+        """Queue an utterance on the loop, dropping the oldest when full."""
+        if segment is not None and self._queue.qsize() >= self._max_queue:
+            self._queue.get_nowait()
+            self.dropped += 1
+            self.logger.warning("Dropped an unprocessed utterance")
+        self._queue.put_nowait(segment)
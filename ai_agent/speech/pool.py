@@ -0,0 +1,281 @@
+"""Process pool of speech engines for concurrent synthesis.
+
+One engine renders one clip at a time, so a single TextToSpeech serializes
+synthesis for every user of a web deployment. The pool runs N worker
+processes, each owning its own engine, and renders clips into audio
+buffers in parallel.
+
+Jobs are routed by (voice, rate) affinity: each combination prefers one
+worker, so that worker's engine keeps its voice configured instead of
+switching for every job. A job goes to the least busy worker instead when
+the preferred one is more than ``AFFINITY_SLACK`` jobs behind it.
+
+A worker process that dies, for example when its engine crashes, has its
+unfinished jobs resolved to None and is replaced. A worker that dies
+``MAX_RESTARTS`` times in a row without rendering a clip is not replaced;
+once none are left, new jobs resolve to None at once.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..utils.metrics import STAGE_METRIC, metrics
+from .backends import create_engine
+
+
+AFFINITY_SLACK = 2
+MAX_RESTARTS = 3
+WORKER_CHECK_INTERVAL = 0.25
+
+
+def _render(engine, text: str) -> bytes:
+    """Synthesize text to a temporary file and return its bytes."""
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        engine.save_to_file(text, path)
+        engine.runAndWait()
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _resolve(future: Future, result: Optional[bytes]) -> None:
+    """Set a future's result unless the caller already cancelled it."""
+    try:
+        future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+def _worker_main(engine_factory: Callable[[], Any], jobs, results) -> None:
+    """Worker process loop: render jobs until a None job arrives."""
+    try:
+        engine = engine_factory()
+        error = None
+    except Exception as e:
+        engine = None
+        error = f"Error initializing TTS engine: {e}"
+
+    settings: Dict[str, Any] = {}
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job_id, text, voice, rate = job
+        if engine is None:
+            results.put((job_id, None, error))
+            continue
+        try:
+            # Only reconfigure when this job's voice or rate differs
+            for name, value in (("voice", voice), ("rate", rate)):
+                if value and settings.get(name) != value:
+                    engine.setProperty(name, value)
+                    settings[name] = value
+            results.put((job_id, _render(engine, text) or None, None))
+        except Exception as e:
+            results.put((job_id, None, f"Error rendering speech: {e}"))
+
+
+class _Worker:
+    """A worker process, its job queue and its backlog."""
+
+    __slots__ = ("index", "process", "jobs", "pending", "restarts")
+
+    def __init__(self, index: int, process, jobs, restarts: int = 0):
+        self.index = index
+        self.process = process
+        self.jobs = jobs
+        self.pending = 0
+        self.restarts = restarts
+
+
+class SynthesisPool:
+    """Render speech clips in parallel across worker processes."""
+
+    def __init__(
+        self,
+        size: int,
+        engine_factory: Callable[[], Any] = create_engine,
+        start_method: str = "spawn",
+    ):
+        """Start ``size`` worker processes.
+
+        ``engine_factory`` runs in each worker and must be picklable, such as
+        a module-level function or a ``functools.partial`` of one. The
+        default creates a pyttsx3 engine. Workers are spawned rather than forked so
+        they do not inherit the parent's threads and locks.
+        """
+        self.size = size
+        self.logger = logging.getLogger(__name__)
+        self.routed = 0
+        self.rebalanced = 0
+        self.restarted = 0
+
+        self._engine_factory = engine_factory
+        self._context = multiprocessing.get_context(start_method)
+        self._results = self._context.Queue()
+        self._workers: List[_Worker] = [self._start_worker(index) for index in range(size)]
+
+        self._futures: Dict[int, Tuple[Future, _Worker, float]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._render_time = metrics.histogram(
+            STAGE_METRIC, "Time spent in each pipeline stage", stage="tts_pool_render"
+        )
+        metrics.gauge(
+            "ai_agent_tts_pool_pending", lambda: len(self._futures),
+            "Clips queued or rendering in the synthesis pool",
+        )
+
+        self._reader = threading.Thread(target=self._read_results, name="tts-pool-results", daemon=True)
+        self._reader.start()
+
+    def _start_worker(self, index: int, restarts: int = 0) -> _Worker:
+        """Start a worker process with its own job queue."""
+        jobs = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self._engine_factory, jobs, self._results),
+            name=f"tts-pool-{index}",
+            daemon=True,
+        )
+        process.start()
+        return _Worker(index, process, jobs, restarts)
+
+    def submit(self, text: str, voice: str = "", rate: int = 0) -> "Future[Optional[bytes]]":
+        """Queue text to be rendered; the future resolves to the clip or None."""
+        future: Future = Future()
+        with self._lock:
+            worker = None if self._closed else self._route(voice, rate)
+            if worker is None:
+                future.set_result(None)
+                return future
+            job_id = next(self._ids)
+            self._futures[job_id] = (future, worker, time.perf_counter())
+            worker.pending += 1
+        worker.jobs.put((job_id, text, voice, rate))
+        return future
+
+    def _route(self, voice: str, rate: int) -> Optional[_Worker]:
+        """Pick a live worker by affinity, falling back to the least busy one.
+
+        Returns None when no worker is alive. The caller holds the lock.
+        """
+        alive = [worker for worker in self._workers if worker.process.is_alive()]
+        if not alive:
+            return None
+        preferred = alive[zlib.crc32(f"{voice}\0{rate}".encode("utf-8")) % len(alive)]
+        least_busy = min(alive, key=lambda worker: worker.pending)
+        if preferred.pending - least_busy.pending > AFFINITY_SLACK:
+            self.rebalanced += 1
+            return least_busy
+        self.routed += 1
+        return preferred
+
+    def _read_results(self) -> None:
+        """Resolve futures as workers report results, and replace dead workers."""
+        next_check = time.monotonic() + WORKER_CHECK_INTERVAL
+        while True:
+            try:
+                message = self._results.get(timeout=WORKER_CHECK_INTERVAL)
+            except queue.Empty:
+                message = ()
+            if message is None:
+                return
+            if message:
+                self._complete(*message)
+            if time.monotonic() >= next_check:
+                self._replace_dead_workers()
+                next_check = time.monotonic() + WORKER_CHECK_INTERVAL
+
+    def _complete(self, job_id: int, clip: Optional[bytes], error: Optional[str]) -> None:
+        """Resolve one job's future with its clip."""
+        with self._lock:
+            entry = self._futures.pop(job_id, None)
+            if entry is not None:
+                entry[1].pending -= 1
+                entry[1].restarts = 0
+        if entry is None:
+            return
+        future, _, submitted = entry
+        self._render_time.observe(time.perf_counter() - submitted)
+        if error:
+            self.logger.error(error)
+        _resolve(future, clip)
+
+    def _replace_dead_workers(self) -> None:
+        """Resolve the jobs of dead workers to None and start replacements."""
+        with self._lock:
+            if self._closed:
+                return
+            dead = [worker for worker in self._workers if not worker.process.is_alive()]
+            if not dead:
+                return
+            lost = [job_id for job_id, entry in self._futures.items() if entry[1] in dead]
+            futures = [self._futures.pop(job_id)[0] for job_id in lost]
+            for worker in dead:
+                worker.pending = 0
+                if worker.restarts >= MAX_RESTARTS:
+                    self._workers.remove(worker)
+
+        for future in futures:
+            _resolve(future, None)
+        for worker in dead:
+            self.logger.error(
+                "TTS pool worker %s exited with code %s", worker.process.name, worker.process.exitcode
+            )
+            if worker.restarts >= MAX_RESTARTS:
+                self.logger.error("Not restarting %s after %d restarts", worker.process.name, worker.restarts)
+                continue
+
+            replacement = self._start_worker(worker.index, worker.restarts + 1)
+            with self._lock:
+                closed = self._closed
+                if not closed:
+                    self._workers[self._workers.index(worker)] = replacement
+                    self.restarted += 1
+            if closed:
+                replacement.jobs.put(None)
+
+    def pending(self) -> List[int]:
+        """Jobs queued or rendering on each worker."""
+        with self._lock:
+            return [worker.pending for worker in self._workers]
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the workers; unfinished jobs resolve to None."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for worker in self._workers:
+            worker.jobs.put(None)
+        for worker in self._workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+        self._results.put(None)
+        self._reader.join(timeout)
+        with self._lock:
+            leftovers, self._futures = list(self._futures.values()), {}
+        for future, _, _ in leftovers:
+            _resolve(future, None)
+
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,287 @@
+"""Speech recognizer backends and a hedged race between them.
+
+Backends are tried in priority order, but not one after another. The first
+starts at once. Each following backend starts when the previous one fails,
+understands no speech, returns a low-confidence result, or takes longer
+than it usually does (its hedge delay). The first acceptable result wins,
+and the rest are abandoned: backends not yet started never start, and
+results that arrive late are ignored.
+
+A result without a confidence cannot be compared with a scored one, so it
+only wins once every backend ranked above it has finished without a
+better answer.
+
+Hedge delays adapt to each backend's latency. They are a smoothed mean plus
+twice the smoothed deviation, estimated the way TCP estimates round-trip
+time. A hedge delay of 0 runs every backend in parallel.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import speech_recognition as sr
+
+from ..utils.metrics import metrics
+
+
+LATENCY_SMOOTHING = 0.125
+DEVIATION_SMOOTHING = 0.25
+HEDGE_DEVIATIONS = 2.0
+MIN_HEDGE_DELAY = 0.05
+MAX_HEDGE_DELAY = 5.0
+
+
+class Recognition:
+    """A transcript and how it was produced."""
+
+    __slots__ = ("text", "confidence", "backend", "latency")
+
+    def __init__(self, text: str, confidence: Optional[float] = None, backend: str = "", latency: float = 0.0):
+        self.text = text
+        self.confidence = confidence
+        self.backend = backend
+        self.latency = latency
+
+    def __repr__(self) -> str:
+        return f"Recognition({self.text!r}, confidence={self.confidence}, backend={self.backend!r})"
+
+
+class RecognizerBackend:
+    """A speech recognizer. Subclasses set ``name`` and implement ``recognize``."""
+
+    name = "base"
+
+    def recognize(self, audio: sr.AudioData) -> Optional[Recognition]:
+        """Transcribe audio; None if no speech was understood.
+
+        Raises when the recognizer cannot be used, for example on a
+        network error, so the race moves on to the next backend.
+        """
+        raise NotImplementedError
+
+
+class GoogleRecognizer(RecognizerBackend):
+    """Google Web Speech API, which usually reports a confidence."""
+
+    name = "google"
+
+    def __init__(self, recognizer: sr.Recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio: sr.AudioData) -> Optional[Recognition]:
+        # The raw response, because with_confidence fills in 0.5 when
+        # Google leaves the confidence out
+        try:
+            response = self.recognizer.recognize_google(audio, show_all=True)
+        except sr.UnknownValueError:
+            return None
+        alternatives = response.get("alternative") if isinstance(response, dict) else None
+        if not alternatives or "transcript" not in alternatives[0]:
+            return None
+        best = alternatives[0]
+        return Recognition(best["transcript"], best.get("confidence"))
+
+
+class SphinxRecognizer(RecognizerBackend):
+    """Offline CMU PocketSphinx. It reports no confidence, so results are taken as they are."""
+
+    name = "sphinx"
+
+    def __init__(self, recognizer: sr.Recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio: sr.AudioData) -> Optional[Recognition]:
+        try:
+            return Recognition(self.recognizer.recognize_sphinx(audio))
+        except sr.UnknownValueError:
+            return None
+
+
+RECOGNIZERS = {
+    "google": GoogleRecognizer,
+    "sphinx": SphinxRecognizer,
+}
+
+
+def create_recognizers(names: str, recognizer: sr.Recognizer) -> List[RecognizerBackend]:
+    """Backends for a comma-separated list of names, in priority order."""
+    backends = []
+    for name in (part.strip().lower() for part in names.split(",")):
+        if not name:
+            continue
+        if name not in RECOGNIZERS:
+            raise ValueError(f"Unknown speech recognizer: {name}; choose from {', '.join(sorted(RECOGNIZERS))}")
+        backends.append(RECOGNIZERS[name](recognizer))
+    return backends
+
+
+class LatencyTracker:
+    """Smoothed latency and deviation of one backend."""
+
+    def __init__(self):
+        self.mean: Optional[float] = None
+        self.deviation = 0.0
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Record one call's latency."""
+        with self._lock:
+            self.samples += 1
+            if self.mean is None:
+                self.mean, self.deviation = seconds, seconds / 2
+                return
+            self.deviation += DEVIATION_SMOOTHING * (abs(seconds - self.mean) - self.deviation)
+            self.mean += LATENCY_SMOOTHING * (seconds - self.mean)
+
+    def estimate(self) -> Optional[float]:
+        """Latency that calls rarely exceed, or None before any were measured."""
+        with self._lock:
+            if self.mean is None:
+                return None
+            return self.mean + HEDGE_DEVIATIONS * self.deviation
+
+
+class RecognizerRace:
+    """Run recognizer backends as a hedged race."""
+
+    def __init__(
+        self,
+        backends: Sequence[RecognizerBackend],
+        hedge_delay: float = 1.0,
+        min_confidence: float = 0.6,
+    ):
+        """Initialize the race.
+
+        ``hedge_delay`` is used until a backend's latency has been measured;
+        0 starts every backend at once. Results below ``min_confidence`` are
+        kept only if no backend does better. Results without a confidence
+        are accepted once the backends ranked above them have finished.
+        """
+        self.backends = list(backends)
+        self.hedge_delay = hedge_delay
+        self.min_confidence = min_confidence
+        self.logger = logging.getLogger(__name__)
+        self.latency: Dict[str, LatencyTracker] = {backend.name: LatencyTracker() for backend in self.backends}
+        self.wins: Dict[str, int] = {backend.name: 0 for backend in self.backends}
+        self.hedged = 0
+
+        # Abandoned calls keep running to completion, so give them their own threads
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, 2 * len(self.backends)), thread_name_prefix="stt-recognizer"
+        )
+
+    def delay_after(self, backend: RecognizerBackend) -> float:
+        """How long to wait for ``backend`` before starting the next one."""
+        if self.hedge_delay <= 0:
+            return 0.0
+        estimate = self.latency[backend.name].estimate()
+        if estimate is None:
+            return self.hedge_delay
+        return min(max(estimate, MIN_HEDGE_DELAY), MAX_HEDGE_DELAY)
+
+    def acceptable(self, result: Recognition) -> bool:
+        """Whether a scored result is good enough to end the race."""
+        return result.confidence is not None and result.confidence >= self.min_confidence
+
+    async def recognize(self, audio: Any) -> Optional[Recognition]:
+        """Transcribe audio with the first acceptable backend result.
+
+        Returns None when no backend understood any speech, failing or
+        hearing nothing.
+        """
+        if not self.backends:
+            return None
+
+        pending: Dict[asyncio.Future, RecognizerBackend] = {}
+        candidates: List[Recognition] = []
+        unscored: Dict[int, Recognition] = {}
+        started = 0
+
+        def start_next() -> None:
+            nonlocal started
+            backend = self.backends[started]
+            started += 1
+            future = asyncio.wrap_future(self._executor.submit(self._run, backend, audio))
+            pending[future] = backend
+
+        start_next()
+        try:
+            while pending:
+                timeout = None
+                if started < len(self.backends):
+                    timeout = self.delay_after(self.backends[started - 1])
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Slower than usual: hedge with the next backend
+                    self.hedged += 1
+                    start_next()
+                    continue
+
+                move_on = False
+                for future in done:
+                    backend = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.logger.error("Speech recognizer %s failed: %s", backend.name, e)
+                        move_on = True
+                        continue
+                    if result is None:
+                        # Another backend may still understand it
+                        move_on = True
+                        continue
+                    if result.confidence is None:
+                        unscored[self.backends.index(backend)] = result
+                        continue
+                    if self.acceptable(result):
+                        self.wins[backend.name] += 1
+                        return result
+                    candidates.append(result)
+                    move_on = True
+
+                # An unscored result wins once no backend ranked above it is running
+                if unscored:
+                    running = min(
+                        (self.backends.index(backend) for backend in pending.values()),
+                        default=len(self.backends),
+                    )
+                    rank = min(unscored)
+                    if rank < running:
+                        self.wins[unscored[rank].backend] += 1
+                        return unscored[rank]
+                if move_on and started < len(self.backends):
+                    start_next()
+        finally:
+            for future in pending:
+                future.cancel()
+
+        if not candidates:
+            return None
+        best = max(candidates, key=lambda result: result.confidence)
+        self.wins[best.backend] += 1
+        return best
+
+    def _run(self, backend: RecognizerBackend, audio: Any) -> Optional[Recognition]:
+        """Call one backend on a worker thread and record its latency.
+
+        Only calls that return count towards the latency estimate: fast
+        failures, such as a refused connection, would shrink the hedge delay.
+        """
+        start = time.perf_counter()
+        with metrics.time("stt_transcribe", engine=backend.name):
+            result = backend.recognize(audio)
+        latency = time.perf_counter() - start
+        self.latency[backend.name].observe(latency)
+        if result is not None:
+            result.backend = backend.name
+            result.latency = latency
+        return result
+
+    def close(self) -> None:
+        """Stop accepting work; calls in progress finish in the background."""
+        self._executor.shutdown(wait=False)
@@ -2,104 +2,211 @@
 
 import asyncio
 import logging
-from typing import Optional
+import threading
+from functools import partial
+from typing import Any, Callable, List, Optional
 import speech_recognition as sr
 
 from ..core.config import Config
+from ..utils.metrics import metrics
+from .listener import ContinuousListener
+from .recognizers import RecognizerBackend, RecognizerRace, create_recognizers
+from .vad import VoiceActivityDetector
+
+
+class MicrophoneSource:
+    """Listener source that keeps a speech_recognition microphone open."""
+    
+    def __init__(self, microphone: sr.Microphone):
+        self.microphone = microphone
+        self.sample_rate = microphone.SAMPLE_RATE
+        self.sample_width = microphone.SAMPLE_WIDTH
+    
+    def __enter__(self) -> "MicrophoneSource":
+        self.microphone.__enter__()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.microphone.__exit__(*exc_info)
+    
+    def read(self) -> bytes:
+        """Next chunk of PCM from the microphone."""
+        return self.microphone.stream.read(self.microphone.CHUNK)
 
 
 class SpeechToText:
-    """Speech-to-Text engine for converting audio to text."""
+    """Speech-to-Text engine for converting audio to text.
+    
+    By default each call opens the microphone and listens for one phrase.
+    With ``config.continuous_listening`` the stream stays open and a voice
+    activity detector queues every utterance, including those spoken while
+    a previous command is still being handled. ``source`` replaces the
+    microphone in continuous mode, for example with a ``WavSource``.
+    Continuous listening ignores audio while ``muted()`` returns true, which
+    the agent sets to whether its own speech is playing.
     
-    def __init__(self, config: Config):
+    The energy threshold is calibrated to the room without delaying start-up.
+    In continuous mode the detector calibrates itself and then follows the
+    noise level. Otherwise a background thread samples the room once, and
+    the recognizer's dynamic threshold follows it while listening.
+    
+    Audio is transcribed by a hedged race of recognizers (``config.stt_backends``):
+    an offline fallback no longer waits for the network to time out.
+    """
+    
+    def __init__(
+        self,
+        config: Config,
+        source: Optional[Any] = None,
+        muted: Optional[Callable[[], bool]] = None,
+    ):
         """Initialize the STT engine."""
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.recognizer = sr.Recognizer()
+        self.recognizer.operation_timeout = config.stt_request_timeout
         self.microphone = None
-        self._initialize_microphone()
+        self.race = RecognizerRace(
+            self._create_recognizers(), config.stt_hedge_delay, config.stt_min_confidence
+        )
+        self.listener: Optional[ContinuousListener] = None
+        self._source = source
+        self._muted = muted
+        # Held while the microphone is open; listening waits for calibration
+        self._microphone_lock = threading.Lock()
+        self._calibration: Optional[threading.Thread] = None
+        metrics.gauge(
+            "ai_agent_stt_energy_threshold", self.energy_threshold,
+            "Audio energy above which sound counts as speech",
+        )
+        if source is None:
+            self._initialize_microphone()
+    
+    def _create_recognizers(self) -> List[RecognizerBackend]:
+        """Recognizers named in the config, in priority order."""
+        try:
+            return create_recognizers(self.config.stt_backends, self.recognizer)
+        except ValueError as e:
+            self.logger.error("%s; using google,sphinx", e)
+            return create_recognizers("google,sphinx", self.recognizer)
     
     def _initialize_microphone(self):
-        """Initialize the microphone."""
+        """Initialize the microphone and start calibrating in the background."""
         try:
             self.microphone = sr.Microphone()
-            
-            # Adjust for ambient noise
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-            
             self.logger.info("Microphone initialized successfully")
             
         except Exception as e:
-            self.logger.error(f"Error initializing microphone: {e}")
+            self.logger.error("Error initializing microphone: %s", e)
             self.microphone = None
+            return
+        
+        if not self.config.continuous_listening:
+            self._calibration = threading.Thread(target=self._calibrate, name="stt-calibration", daemon=True)
+            self._calibration.start()
+    
+    def _calibrate(self) -> None:
+        """Set the energy threshold from the room's ambient noise."""
+        try:
+            with self._microphone_lock, self.microphone as source:
+                with metrics.time("stt_calibrate"):
+                    self.recognizer.adjust_for_ambient_noise(source, duration=self.config.audio_calibration_seconds)
+            self.logger.info("Energy threshold calibrated to %.0f", self.recognizer.energy_threshold)
+        except Exception as e:
+            self.logger.error("Error calibrating microphone: %s", e)
+    
+    def energy_threshold(self) -> float:
+        """Current speech energy threshold."""
+        detector = self.listener.detector if self.listener is not None else None
+        if detector is not None:
+            return detector.energy_threshold
+        return self.recognizer.energy_threshold
     
     async def listen_and_transcribe(self) -> Optional[str]:
         """Listen for audio and transcribe to text."""
-        if not self.microphone:
+        if not self.microphone and self._source is None:
             self.logger.error("Microphone not available")
             return None
         
         try:
             # Run speech recognition in a separate thread
             loop = asyncio.get_event_loop()
-            audio_data = await loop.run_in_executor(None, self._listen_sync)
+            if self.config.continuous_listening:
+                audio_data = await self._next_utterance()
+            else:
+                audio_data = await loop.run_in_executor(None, self._listen_sync)
             
             if audio_data:
-                text = await loop.run_in_executor(None, self._transcribe_sync, audio_data)
-                return text
+                return await self._transcribe(audio_data)
             
         except Exception as e:
-            self.logger.error(f"Error in speech recognition: {e}")
+            self.logger.error("Error in speech recognition: %s", e)
         
         return None
     
+    async def _next_utterance(self) -> Optional[sr.AudioData]:
+        """Wait for the next utterance cut by the continuous listener."""
+        if self.listener is None:
+            detector = partial(
+                VoiceActivityDetector,
+                energy_threshold=self.recognizer.energy_threshold,
+                pause_seconds=self.config.vad_pause_seconds,
+                pre_roll_seconds=self.config.vad_pre_roll_seconds,
+                max_utterance_seconds=self.config.vad_max_utterance_seconds,
+                calibration_seconds=self.config.audio_calibration_seconds,
+                adaptation_seconds=self.config.vad_adaptation_seconds,
+            )
+            self.listener = ContinuousListener(
+                self._source or MicrophoneSource(self.microphone), detector, muted=self._muted
+            )
+            self.listener.start()
+        
+        with metrics.time("stt_listen"):
+            segment = await self.listener.get(timeout=self.config.audio_timeout)
+        if segment is None:
+            self.logger.info("Listening timeout - no speech detected")
+            return None
+        return sr.AudioData(segment.pcm, segment.sample_rate, segment.sample_width)
+    
     def _listen_sync(self) -> Optional[sr.AudioData]:
         """Listen for audio synchronously."""
         try:
-            with self.microphone as source:
+            with self._microphone_lock, self.microphone as source:
                 self.logger.info("Listening for audio...")
-                audio = self.recognizer.listen(
-                    source, 
-                    timeout=self.config.audio_timeout,
-                    phrase_time_limit=self.config.audio_phrase_timeout
-                )
+                with metrics.time("stt_listen"):
+                    audio = self.recognizer.listen(
+                        source, 
+                        timeout=self.config.audio_timeout,
+                        phrase_time_limit=self.config.audio_phrase_timeout
+                    )
                 return audio
                 
         except sr.WaitTimeoutError:
             self.logger.info("Listening timeout - no speech detected")
             return None
         except Exception as e:
-            self.logger.error(f"Error listening for audio: {e}")
+            self.logger.error("Error listening for audio: %s", e)
             return None
     
-    def _transcribe_sync(self, audio_data: sr.AudioData) -> Optional[str]:
-        """Transcribe audio to text synchronously."""
-        try:
-            # Try Google Speech Recognition first
-            text = self.recognizer.recognize_google(audio_data)
-            self.logger.info(f"Transcribed text: {text}")
-            return text
-            
-        except sr.UnknownValueError:
+    async def _transcribe(self, audio_data: sr.AudioData) -> Optional[str]:
+        """Transcribe audio with the first acceptable recognizer result."""
+        result = await self.race.recognize(audio_data)
+        if result is None:
             self.logger.info("Could not understand audio")
             return None
-        except sr.RequestError as e:
-            self.logger.error(f"Could not request results from Google Speech Recognition: {e}")
-            
-            # Fallback to offline recognition if available
-            try:
-                text = self.recognizer.recognize_sphinx(audio_data)
-                self.logger.info(f"Offline transcribed text: {text}")
-                return text
-            except Exception as offline_e:
-                self.logger.error(f"Offline recognition also failed: {offline_e}")
-                return None
+        self.logger.info("Transcribed text (%s, %.0f ms): %s", result.backend, result.latency * 1000, result.text)
+        return result.text
+    
+    def close(self) -> None:
+        """Stop continuous listening and recognizer threads."""
+        if self.listener is not None:
+            self.listener.close()
+        self.race.close()
     
     def get_microphone_names(self) -> list:
         """Get list of available microphones."""
         try:
             return sr.Microphone.list_microphone_names()
         except Exception as e:
-            self.logger.error(f"Error getting microphone names: {e}")
+            self.logger.error("Error getting microphone names: %s", e)
             return []
\ No newline at end of file
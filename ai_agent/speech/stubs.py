@@ -0,0 +1,83 @@
+"""Capability stubs used when the agent runs headless.
+
+They expose the same interface as TextToSpeech and SpeechToText without
+importing pyttsx3 or speech_recognition, so servers without audio devices
+(such as serverless deployments) can run the full agent.
+"""
+
+import logging
+from typing import Iterable, Optional
+
+from ..core.config import Config
+from .worker import NORMAL
+
+
+class NullTextToSpeech:
+    """Text-to-speech stand-in that accepts text and produces no audio."""
+    
+    available = False
+    is_speaking = False
+    
+    def __init__(self, config: Config):
+        """Initialize the stub."""
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.engine = None
+    
+    async def speak(self, text: str, priority: int = NORMAL, key: Optional[str] = None) -> bool:
+        """Discard the text; clients speak responses themselves."""
+        self.logger.debug("Headless mode, not speaking: %s", text[:50])
+        return False
+    
+    async def synthesize(self, text: str, priority: int = NORMAL) -> Optional[bytes]:
+        """No audio can be rendered."""
+        return None
+    
+    async def prewarm(self, texts: Iterable[str]) -> int:
+        """Nothing to render."""
+        return 0
+    
+    def interrupt(self) -> int:
+        """Nothing is ever being spoken."""
+        return 0
+    
+    def skip(self, offset: int) -> bool:
+        """Nothing is ever being spoken."""
+        return False
+    
+    def close(self) -> None:
+        """Nothing to release."""
+    
+    def get_available_voices(self) -> list:
+        """No voices are available."""
+        return []
+    
+    def set_voice(self, voice_id: str) -> bool:
+        """Voices cannot be changed."""
+        return False
+    
+    def set_rate(self, rate: int) -> bool:
+        """The rate cannot be changed."""
+        return False
+
+
+class NullSpeechToText:
+    """Speech-to-text stand-in with no microphone."""
+    
+    available = False
+    
+    def __init__(self, config: Config):
+        """Initialize the stub."""
+        self.config = config
+        self.microphone = None
+    
+    async def listen_and_transcribe(self) -> Optional[str]:
+        """Nothing can be heard."""
+        return None
+    
+    def close(self) -> None:
+        """Nothing to release."""
+    
+    def get_microphone_names(self) -> list:
+        """No microphones are available."""
+        return []
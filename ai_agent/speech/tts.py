@@ -2,100 +2,200 @@
 
 import asyncio
 import logging
-from typing import Optional
-import pyttsx3
+import time
+from functools import partial
+from typing import Dict, Iterable, List, Optional
 
 from ..core.config import Config
+from ..utils.metrics import metrics
+from ..utils.singleflight import SingleFlight
+from .backends import audio_seconds, create_engine
+from .clip_cache import ClipCache, clip_key
+from .pool import SynthesisPool
+from .worker import BACKGROUND, NORMAL, SpeechWorker
+
+
+ENGINE_INIT_TIMEOUT = 10.0
+RENDER_TIMEOUT = 30.0
 
 
 class TextToSpeech:
-    """Text-to-Speech engine for converting text to audio."""
+    """Text-to-Speech engine for converting text to audio.
+    
+    The engine named by ``config.tts_engine`` lives on a dedicated worker
+    thread, so concurrent callers queue behind each other instead of racing
+    on the engine. Text can also be rendered to audio clips, which are
+    cached by text, voice and rate.
+    """
     
     def __init__(self, config: Config):
         """Initialize the TTS engine."""
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.engine = None
-        self._initialize_engine()
+        self.init_seconds: Optional[float] = None
+        self._voices: List[Dict[str, str]] = []
+        self._voice_id = ""
+        self.clip_cache = ClipCache(
+            config.speech_cache_bytes,
+            config.speech_cache_dir or None,
+            config.speech_disk_cache_bytes,
+        )
+        self._renders = SingleFlight()
+        self._worker = SpeechWorker(
+            self._initialize_engine,
+            max_chunk_chars=config.tts_chunk_chars,
+            first_audio_budget=config.tts_first_audio_budget,
+        )
+        if not self._worker.ready.wait(ENGINE_INIT_TIMEOUT):
+            self.logger.error("TTS engine did not initialize within %.0f seconds", ENGINE_INIT_TIMEOUT)
+        self.engine = self._worker.engine
+        
+        # Clips for web clients render in parallel processes when configured
+        self._pool: Optional[SynthesisPool] = None
+        if self.engine and config.tts_pool_size > 0:
+            self._pool = SynthesisPool(config.tts_pool_size, partial(create_engine, config.tts_engine))
+        self._real_time_factor = metrics.histogram(
+            "ai_agent_tts_real_time_factor", "Clip rendering time, including queueing, over audio duration",
+            engine=config.tts_engine,
+        )
     
     def _initialize_engine(self):
-        """Initialize the pyttsx3 engine."""
-        try:
-            self.engine = pyttsx3.init()
-            
-            # Configure voice settings
-            self.engine.setProperty('rate', self.config.tts_rate)
-            
-            # Set voice if specified
-            if self.config.tts_voice_id:
-                voices = self.engine.getProperty('voices')
-                for voice in voices:
-                    if self.config.tts_voice_id in voice.id:
-                        self.engine.setProperty('voice', voice.id)
-                        break
-            
-            self.logger.info("TTS engine initialized successfully")
-            
-        except Exception as e:
-            self.logger.error(f"Error initializing TTS engine: {e}")
-            self.engine = None
+        """Initialize the configured engine. Runs on the worker thread."""
+        start = time.perf_counter()
+        with metrics.time("tts_init", engine=self.config.tts_engine):
+            engine = create_engine(self.config.tts_engine)
+        self.init_seconds = time.perf_counter() - start
+        
+        # Configure voice settings
+        engine.setProperty('rate', self.config.tts_rate)
+        
+        voices = engine.getProperty('voices') or []
+        self._voices = [{"id": voice.id, "name": voice.name} for voice in voices]
+        
+        # Set voice if specified
+        if self.config.tts_voice_id:
+            for voice in voices:
+                if self.config.tts_voice_id in voice.id:
+                    engine.setProperty('voice', voice.id)
+                    break
+        self._voice_id = str(engine.getProperty('voice') or "")
+        
+        self.logger.info(
+            "TTS engine %s initialized in %.0f ms", self.config.tts_engine, self.init_seconds * 1000
+        )
+        return engine
     
-    async def speak(self, text: str) -> None:
-        """Convert text to speech asynchronously."""
+    async def speak(self, text: str, priority: int = NORMAL, key: Optional[str] = None) -> bool:
+        """Queue text to be spoken and wait until it has been.
+        
+        ``URGENT`` text is spoken before anything queued at ``NORMAL``
+        priority. Text submitted with a ``key`` replaces queued text with the
+        same key. Returns False if the text was cancelled or not spoken.
+        """
         if not self.engine:
             self.logger.error("TTS engine not available")
-            return
+            return False
         
         try:
-            # Run TTS in a separate thread to avoid blocking
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._speak_sync, text)
+            return await asyncio.wrap_future(self._worker.submit(text, priority, key))
             
         except Exception as e:
-            self.logger.error(f"Error in text-to-speech: {e}")
+            self.logger.error("Error in text-to-speech: %s", e)
+            return False
     
-    def _speak_sync(self, text: str) -> None:
-        """Synchronous speech method."""
-        try:
-            self.engine.say(text)
-            self.engine.runAndWait()
-            
-        except Exception as e:
-            self.logger.error(f"Error in synchronous speech: {e}")
+    @property
+    def available(self) -> bool:
+        """Whether the engine initialized."""
+        return self.engine is not None
     
-    def get_available_voices(self) -> list:
-        """Get list of available voices."""
+    @property
+    def is_speaking(self) -> bool:
+        """Whether speech is playing aloud right now."""
+        return self._worker.speaking.is_set()
+    
+    async def synthesize(self, text: str, priority: int = NORMAL) -> Optional[bytes]:
+        """Render text to an audio clip (WAV on most platforms), using the cache.
+        
+        Returns None if the engine is unavailable or rendering failed.
+        Concurrent requests for the same clip share one rendering.
+        """
         if not self.engine:
-            return []
+            return None
+        
+        key = clip_key(text, self._voice_id, self.config.tts_rate)
+        clip = self.clip_cache.get(key)
+        if clip is not None:
+            return clip
         
         try:
-            voices = self.engine.getProperty('voices')
-            return [{"id": voice.id, "name": voice.name} for voice in voices]
+            return await self._renders.do(key, lambda: self._render(key, text, priority))
         except Exception as e:
-            self.logger.error(f"Error getting voices: {e}")
-            return []
+            self.logger.error("Error synthesizing speech: %s", e)
+            return None
+    
+    async def _render(self, key: str, text: str, priority: int) -> Optional[bytes]:
+        """Load a clip from disk, or render and store it."""
+        loop = asyncio.get_event_loop()
+        clip = await loop.run_in_executor(None, self.clip_cache.load, key)
+        if clip is None:
+            start = time.perf_counter()
+            if self._pool is not None:
+                job = self._pool.submit(text, self._voice_id, self.config.tts_rate)
+            else:
+                job = self._worker.render(text, priority)
+            try:
+                clip = await asyncio.wait_for(asyncio.wrap_future(job), RENDER_TIMEOUT)
+            except asyncio.TimeoutError:
+                self.logger.error("Speech rendering did not finish within %.0f seconds", RENDER_TIMEOUT)
+                return None
+            if clip:
+                duration = audio_seconds(clip)
+                if duration:
+                    self._real_time_factor.observe((time.perf_counter() - start) / duration)
+                await loop.run_in_executor(None, self.clip_cache.put, key, clip)
+        return clip
+    
+    async def prewarm(self, texts: Iterable[str]) -> int:
+        """Render clips ahead of time at background priority.
+        
+        Returns the number of clips now cached.
+        """
+        clips = await asyncio.gather(*(self.synthesize(text, BACKGROUND) for text in texts))
+        return sum(1 for clip in clips if clip)
+    
+    def interrupt(self) -> int:
+        """Stop the current utterance and drop queued ones (barge-in)."""
+        return self._worker.cancel()
+    
+    def skip(self, offset: int) -> bool:
+        """Skip the current utterance forward or back by ``offset`` sentences."""
+        return self._worker.skip(offset)
+    
+    def close(self) -> None:
+        """Stop the worker thread and any synthesis processes."""
+        self._worker.close()
+        if self._pool is not None:
+            self._pool.close()
+    
+    def get_available_voices(self) -> list:
+        """Get list of available voices."""
+        return list(self._voices)
     
     def set_voice(self, voice_id: str) -> bool:
         """Set the voice for TTS."""
         if not self.engine:
             return False
         
-        try:
-            self.engine.setProperty('voice', voice_id)
-            return True
-        except Exception as e:
-            self.logger.error(f"Error setting voice: {e}")
-            return False
+        self._worker.set_property('voice', voice_id)
+        self._voice_id = voice_id
+        return True
     
     def set_rate(self, rate: int) -> bool:
         """Set the speech rate."""
         if not self.engine:
             return False
         
-        try:
-            self.engine.setProperty('rate', rate)
-            self.config.tts_rate = rate
-            return True
-        except Exception as e:
-            self.logger.error(f"Error setting rate: {e}")
-            return False
\ No newline at end of file
+        self._worker.set_property('rate', rate)
+        self.config.tts_rate = rate
+        return True
\ No newline at end of file
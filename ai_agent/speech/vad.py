@@ -0,0 +1,215 @@
+"""Energy and zero-crossing voice-activity detection over 16-bit PCM.
+
+Audio is split into 30 ms frames, and each batch of frames is classified at
+once with NumPy. A frame is speech when its RMS energy is above the
+threshold and its zero-crossing rate is low, as in voiced sound. A frame
+well above the threshold is speech at any zero-crossing rate, which keeps
+loud fricatives. Quiet hiss, which crosses zero often, is not speech.
+
+An utterance starts after a few consecutive speech frames and ends after a
+pause. It is cut from a ring buffer of recent frames, together with a short
+pre-roll so that the first syllable is not clipped.
+
+The threshold follows the room. The first ``calibration_seconds`` of audio
+are taken to be noise, as ``adjust_for_ambient_noise`` does, but without
+blocking: the threshold is set from them before they are classified. After
+that it is an exponential moving average over non-speech
+frames only. A sudden jump in noise is classified as speech and so cannot
+feed the average. Such noise runs into the utterance length limit, and the
+threshold is then raised to just above the quietest frame of that
+utterance.
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+FRAME_SECONDS = 0.03
+MAX_ZERO_CROSSING_RATE = 0.35
+LOUD_FACTOR = 2.0
+# Threshold over the noise level, as in speech_recognition's dynamic threshold
+ENERGY_RATIO = 1.5
+MIN_ENERGY_THRESHOLD = 50.0
+CALIBRATION_ADAPTATION_SECONDS = 0.1
+MIN_SPEECH_FRAMES = 3
+# Frames classified per step; bounds how far the ring must reach back
+BATCH_FRAMES = 32
+
+
+def frame_features(frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """RMS energy and zero-crossing rate of each row of int16 samples."""
+    samples = frames.astype(np.float32)
+    energy = np.sqrt(np.mean(samples * samples, axis=1))
+    signs = np.signbit(frames)
+    crossings = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1)
+    return energy, crossings / max(1, frames.shape[1] - 1)
+
+
+class FrameRing:
+    """Fixed-capacity ring of PCM frames addressed by absolute frame number."""
+
+    def __init__(self, capacity: int, frame_samples: int):
+        """Allocate room for ``capacity`` frames."""
+        self.capacity = capacity
+        self.total = 0
+        self._frames = np.zeros((capacity, frame_samples), dtype=np.int16)
+
+    def extend(self, frames: np.ndarray) -> None:
+        """Append frames, overwriting the oldest."""
+        count = len(frames)
+        if count > self.capacity:
+            self.total += count - self.capacity
+            frames, count = frames[-self.capacity:], self.capacity
+        start = self.total % self.capacity
+        first = min(count, self.capacity - start)
+        self._frames[start:start + first] = frames[:first]
+        self._frames[:count - first] = frames[first:]
+        self.total += count
+
+    def read(self, start: int, stop: int) -> bytes:
+        """PCM of frames ``start`` to ``stop``, limited to those still held."""
+        start = max(start, self.total - self.capacity, 0)
+        return self._frames[np.arange(start, stop) % self.capacity].tobytes()
+
+
+class VoiceActivityDetector:
+    """Cut a stream of 16-bit mono PCM into utterances."""
+
+    def __init__(
+        self,
+        sample_rate: int,
+        energy_threshold: float = 300.0,
+        pause_seconds: float = 0.8,
+        pre_roll_seconds: float = 0.3,
+        max_utterance_seconds: float = 15.0,
+        calibration_seconds: float = 1.0,
+        adaptation_seconds: float = 2.0,
+    ):
+        """Initialize the detector.
+
+        ``energy_threshold`` is the starting RMS level on the int16 scale,
+        the same scale as ``speech_recognition.Recognizer.energy_threshold``.
+        ``adaptation_seconds`` is the time constant of the noise average.
+        """
+        self.sample_rate = sample_rate
+        self.energy_threshold = energy_threshold
+        self.frame_samples = max(2, int(sample_rate * FRAME_SECONDS))
+        self.pause_frames = max(1, math.ceil(pause_seconds / FRAME_SECONDS))
+        self.pre_roll_frames = math.ceil(pre_roll_seconds / FRAME_SECONDS)
+        self.max_frames = max(MIN_SPEECH_FRAMES, math.ceil(max_utterance_seconds / FRAME_SECONDS))
+        self.calibration_frames = math.ceil(calibration_seconds / FRAME_SECONDS)
+        self._calibration_rate = 1 - math.exp(-FRAME_SECONDS / CALIBRATION_ADAPTATION_SECONDS)
+        self._adaptation_rate = 1 - math.exp(-FRAME_SECONDS / max(adaptation_seconds, FRAME_SECONDS))
+
+        self._ring = FrameRing(
+            self.pre_roll_frames + self.max_frames + self.pause_frames + BATCH_FRAMES,
+            self.frame_samples,
+        )
+        self._pending = b""
+        self._run = 0  # consecutive speech frames before an utterance starts
+        self._start: Optional[int] = None
+        self._last_speech = 0
+        self._floor = math.inf  # quietest frame of the current utterance
+        self._calibration_left = self.calibration_frames
+
+    @property
+    def in_utterance(self) -> bool:
+        """Whether an utterance has started and not yet ended."""
+        return self._start is not None
+
+    @property
+    def calibrated(self) -> bool:
+        """Whether the initial calibration period has passed."""
+        return self._calibration_left == 0
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        """Boolean speech flag for each row of int16 samples."""
+        return self._decide(*frame_features(frames))
+
+    def _decide(self, energy: np.ndarray, crossings: np.ndarray) -> np.ndarray:
+        voiced = (energy > self.energy_threshold) & (crossings < MAX_ZERO_CROSSING_RATE)
+        return voiced | (energy > self.energy_threshold * LOUD_FACTOR)
+
+    def _adapt(self, noise: np.ndarray, rate: float) -> None:
+        """Move the threshold toward the level of noise frames."""
+        if not len(noise):
+            return
+        # The moving average over the frames in closed form:
+        # (1 - rate)^n * old + sum of rate * (1 - rate)^(n - 1 - i) * target_i
+        decay = (1 - rate) ** np.arange(len(noise) - 1, -1, -1)
+        threshold = (1 - rate) ** len(noise) * self.energy_threshold
+        threshold += float(rate * decay @ (noise * ENERGY_RATIO))
+        self.energy_threshold = max(MIN_ENERGY_THRESHOLD, threshold)
+
+    def feed(self, pcm: bytes) -> List[bytes]:
+        """Add PCM and return the utterances that ended within it."""
+        data = self._pending + pcm
+        frame_bytes = 2 * self.frame_samples
+        usable = len(data) - len(data) % frame_bytes
+        self._pending = data[usable:]
+        if not usable:
+            return []
+
+        frames = np.frombuffer(data[:usable], dtype="<i2").reshape(-1, self.frame_samples)
+        utterances = []
+        for offset in range(0, len(frames), BATCH_FRAMES):
+            batch = frames[offset:offset + BATCH_FRAMES]
+            energy, crossings = frame_features(batch)
+            calibrating = min(self._calibration_left, len(batch))
+            if calibrating:
+                self._adapt(energy[:calibrating], self._calibration_rate)
+                self._calibration_left -= calibrating
+            speech = self._decide(energy, crossings)
+            utterances.extend(self._process(batch, speech, energy, crossings))
+            self._adapt(energy[calibrating:][~speech[calibrating:]], self._adaptation_rate)
+        return utterances
+
+    def _process(
+        self, frames: np.ndarray, speech: np.ndarray, energy: np.ndarray, crossings: np.ndarray
+    ) -> List[bytes]:
+        """Advance the utterance state machine over one batch."""
+        first = self._ring.total
+        self._ring.extend(frames)
+        flags = speech.tolist()
+        levels = energy.tolist()
+        utterances = []
+        for offset in range(len(frames)):
+            index, is_speech, level = first + offset, flags[offset], levels[offset]
+            if self._start is None:
+                self._run = self._run + 1 if is_speech else 0
+                if self._run >= MIN_SPEECH_FRAMES:
+                    self._start = index - self._run + 1
+                    self._last_speech = index
+                    self._floor = level
+                continue
+            self._floor = min(self._floor, level)
+            if is_speech:
+                self._last_speech = index
+            if index - self._last_speech >= self.pause_frames:
+                utterances.append(self._cut(index + 1))
+            elif index + 1 - self._start >= self.max_frames:
+                # Speech has gaps; sound this steady is more likely new noise
+                self.energy_threshold = max(self.energy_threshold, self._floor * ENERGY_RATIO)
+                utterances.append(self._cut(index + 1))
+                rest = slice(offset + 1, None)
+                flags[rest] = self._decide(energy[rest], crossings[rest]).tolist()
+                speech[rest] = flags[rest]
+        return utterances
+
+    def flush(self) -> Optional[bytes]:
+        """End of stream: return the utterance in progress, if any."""
+        self._pending = b""
+        if self._start is None:
+            return None
+        return self._cut(self._ring.total)
+
+    def _cut(self, stop: int) -> bytes:
+        """Return the current utterance with its pre-roll and reset."""
+        # Keep a little of the trailing pause so the last word decays naturally
+        stop = min(stop, self._last_speech + 1 + self.pre_roll_frames)
+        pcm = self._ring.read(self._start - self.pre_roll_frames, stop)
+        self._start = None
+        self._run = 0
+        return pcm
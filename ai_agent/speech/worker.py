@@ -0,0 +1,344 @@
+"""Single-owner speech worker with a prioritized, cancellable queue.
+
+Speech engines such as pyttsx3 are not thread-safe and some must be used
+from the thread that created them, so one worker thread creates the engine
+and performs every call on it. Callers submit utterances and receive
+futures that resolve to True once the text has been spoken, or False if it
+was cancelled, superseded or could not be spoken.
+
+* Utterances are spoken in priority order (``URGENT`` before ``NORMAL``),
+  first come first served within a priority.
+* Submitting with a ``key`` supersedes queued utterances with the same key,
+  so stale status messages are dropped instead of spoken late.
+* ``cancel()`` drops everything queued and stops the current utterance at
+  the next word boundary (barge-in).
+
+Utterances are spoken as a pipeline of sentence and clause chunks. All
+remaining chunks are queued on the engine at once, so the driver can
+prepare chunk N+1 while chunk N plays. The first chunk is sized to start
+playing within ``first_audio_budget`` seconds, from a running estimate of
+how long the engine takes per character before audio starts. ``skip()``
+moves playback forward or back by whole chunks.
+
+``render()`` queues text to be synthesized into an audio buffer instead of
+played. Renders share the queue and the engine but are not affected by
+``cancel()``, which only concerns playback.
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.metrics import STAGE_METRIC, metrics
+from ..utils.text import split_speech_chunks
+
+
+URGENT = 0
+NORMAL = 1
+BACKGROUND = 2
+
+# First chunk size before the engine's startup latency has been measured
+DEFAULT_FIRST_CHUNK_CHARS = 80
+MIN_FIRST_CHUNK_CHARS = 20
+LATENCY_SMOOTHING = 0.2
+
+
+class Utterance:
+    """Text waiting to be spoken or rendered and the future of its outcome."""
+
+    __slots__ = ("text", "priority", "key", "render", "future")
+
+    def __init__(self, text: str, priority: int, key: Optional[str], render: bool = False):
+        self.text = text
+        self.priority = priority
+        self.key = key
+        self.render = render
+        self.future: Future = Future()
+
+
+def _resolve(future: Future, result: Any) -> None:
+    """Set a future's result unless the caller already cancelled it."""
+    try:
+        future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+class SpeechWorker:
+    """Thread that owns a speech engine and speaks queued utterances."""
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], Any],
+        name: str = "tts-worker",
+        max_chunk_chars: int = 200,
+        first_audio_budget: float = 0.3,
+    ):
+        """Start the worker thread, which creates the engine with ``engine_factory``."""
+        self.logger = logging.getLogger(__name__)
+        self.engine = None
+        self.max_chunk_chars = max_chunk_chars
+        self.first_audio_budget = first_audio_budget
+        self.ready = threading.Event()
+        # Set while the engine plays speech aloud
+        self.speaking = threading.Event()
+        self.coalesced = 0
+        self.interrupted = 0
+
+        self._factory = engine_factory
+        self._queue: List = []  # heap of (priority, sequence, utterance)
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._current: Optional[Utterance] = None
+        self._stop_current = False
+        self._properties: Dict[str, Any] = {}
+        self._closed = False
+
+        # Playback position within the current utterance
+        self._chunks: List[str] = []
+        self._chunk_index = 0
+        self._jump: Optional[int] = None
+        self._run_started: Optional[float] = None
+        self._first_chunk_length = 0
+        self._seconds_per_char: Optional[float] = None
+        self._first_audio = metrics.histogram(
+            STAGE_METRIC, "Time spent in each pipeline stage", stage="tts_first_audio"
+        )
+
+        metrics.gauge(
+            "ai_agent_tts_queue_depth", lambda: len(self),
+            "Utterances waiting to be spoken", worker=name,
+        )
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str, priority: int = NORMAL, key: Optional[str] = None) -> "Future[bool]":
+        """Queue text to be spoken and return the future of its outcome."""
+        return self._enqueue(Utterance(text, priority, key), False)
+
+    def render(self, text: str, priority: int = NORMAL) -> "Future[Optional[bytes]]":
+        """Queue text to be synthesized; the future resolves to the audio file bytes."""
+        return self._enqueue(Utterance(text, priority, None, render=True), None)
+
+    def _enqueue(self, utterance: Utterance, closed_result: Any) -> Future:
+        """Add an utterance to the queue unless the worker is closed."""
+        with self._cond:
+            if self._closed:
+                _resolve(utterance.future, closed_result)
+                return utterance.future
+            if utterance.key is not None:
+                self._supersede(utterance.key)
+            heapq.heappush(self._queue, (utterance.priority, next(self._sequence), utterance))
+            self._cond.notify()
+        return utterance.future
+
+    def _supersede(self, key: str) -> None:
+        """Drop queued utterances with the key. The caller holds the lock."""
+        kept = []
+        for entry in self._queue:
+            if entry[2].key == key:
+                _resolve(entry[2].future, False)
+                self.coalesced += 1
+            else:
+                kept.append(entry)
+        if len(kept) != len(self._queue):
+            heapq.heapify(kept)
+            self._queue = kept
+
+    def cancel(self) -> int:
+        """Drop queued utterances and stop the one being spoken.
+
+        Returns the number of utterances cancelled, including the current one.
+        Renders are left alone.
+        """
+        with self._cond:
+            dropped = [entry[2] for entry in self._queue if not entry[2].render]
+            if dropped:
+                self._queue = [entry for entry in self._queue if entry[2].render]
+                heapq.heapify(self._queue)
+            if self._current is not None and not self._current.render:
+                self._stop_current = True
+                dropped.append(self._current)
+        for utterance in dropped:
+            _resolve(utterance.future, False)
+        if dropped:
+            self.interrupted += len(dropped)
+            self.logger.debug("Cancelled %d utterances", len(dropped))
+        return len(dropped)
+
+    def skip(self, offset: int) -> bool:
+        """Move playback of the current utterance by ``offset`` chunks.
+
+        Negative offsets go back; skipping past the last chunk ends the
+        utterance. Returns False if nothing is being spoken.
+        """
+        with self._cond:
+            if self._current is None or self._current.render or not self._chunks:
+                return False
+            base = self._chunk_index if self._jump is None else self._jump
+            self._jump = max(0, min(base + offset, len(self._chunks)))
+            return True
+
+    def set_property(self, name: str, value: Any) -> None:
+        """Set an engine property on the worker thread before the next utterance."""
+        with self._cond:
+            self._properties[name] = value
+            self._cond.notify()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Cancel outstanding speech and stop the worker thread."""
+        with self._cond:
+            self._closed = True
+            renders = [entry[2] for entry in self._queue if entry[2].render]
+            self._cond.notify()
+        self.cancel()
+        for utterance in renders:
+            _resolve(utterance.future, None)
+        self._thread.join(timeout)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def _run(self) -> None:
+        """Create the engine, then speak utterances until closed."""
+        try:
+            self.engine = self._factory()
+            if self.engine is not None:
+                self.engine.connect("started-utterance", self._on_utterance)
+                self.engine.connect("started-word", self._on_word)
+        except Exception as e:
+            self.logger.error("Error initializing TTS engine: %s", e)
+            self.engine = None
+        finally:
+            self.ready.set()
+
+        while True:
+            with self._cond:
+                while not self._queue and not self._properties and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                properties, self._properties = self._properties, {}
+                utterance = heapq.heappop(self._queue)[2] if self._queue else None
+                self._current = utterance
+                self._stop_current = False
+
+            self._apply(properties)
+            if utterance is not None:
+                if utterance.render:
+                    result = self._render(utterance)
+                else:
+                    result = self._speak(utterance)
+                with self._cond:
+                    self._current = None
+                _resolve(utterance.future, result)
+
+    def _apply(self, properties: Dict[str, Any]) -> None:
+        """Set pending engine properties."""
+        if self.engine is None:
+            return
+        for name, value in properties.items():
+            try:
+                self.engine.setProperty(name, value)
+            except Exception as e:
+                self.logger.error("Error setting TTS property %s: %s", name, e)
+
+    def _speak(self, utterance: Utterance) -> bool:
+        """Speak one utterance; False if it was skipped or stopped."""
+        if self.engine is None:
+            self.logger.error("TTS engine not available")
+            return False
+        # Callers cancel a future by abandoning it; such text is not spoken
+        try:
+            if not utterance.future.set_running_or_notify_cancel():
+                return False
+        except RuntimeError:
+            # Already resolved by cancel() between dequeueing and here
+            return False
+
+        chunks = split_speech_chunks(utterance.text, self.max_chunk_chars, self._first_chunk_chars())
+        with self._cond:
+            self._chunks = chunks
+            self._chunk_index = 0
+            self._jump = None
+        start = 0
+        self.speaking.set()
+        try:
+            with metrics.time("tts_speak"):
+                while start < len(chunks) and not self._stop_current:
+                    for index in range(start, len(chunks)):
+                        self.engine.say(chunks[index], str(index))
+                    if start == 0:
+                        self._run_started = time.perf_counter()
+                        self._first_chunk_length = len(chunks[0])
+                    self.engine.runAndWait()
+                    with self._cond:
+                        jump, self._jump = self._jump, None
+                    if jump is None:
+                        break
+                    start = jump
+        except Exception as e:
+            self.logger.error("Error in synchronous speech: %s", e)
+            return False
+        finally:
+            self.speaking.clear()
+            with self._cond:
+                self._chunks = []
+                self._run_started = None
+        return not self._stop_current
+
+    def _first_chunk_chars(self) -> int:
+        """Longest first chunk expected to start playing within the budget."""
+        if self._seconds_per_char is None:
+            return min(DEFAULT_FIRST_CHUNK_CHARS, self.max_chunk_chars)
+        fitting = int(self.first_audio_budget / self._seconds_per_char)
+        return max(MIN_FIRST_CHUNK_CHARS, min(fitting, self.max_chunk_chars))
+
+    def _render(self, utterance: Utterance) -> Optional[bytes]:
+        """Synthesize one utterance into a file and return its bytes."""
+        if self.engine is None or not utterance.future.set_running_or_notify_cancel():
+            return None
+
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            with metrics.time("tts_render"):
+                self.engine.save_to_file(utterance.text, path)
+                self.engine.runAndWait()
+            with open(path, "rb") as f:
+                return f.read() or None
+        except Exception as e:
+            self.logger.error("Error rendering speech: %s", e)
+            return None
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _on_utterance(self, name: Optional[str]) -> None:
+        """Engine callback when a chunk starts playing."""
+        try:
+            self._chunk_index = int(name)
+        except (TypeError, ValueError):
+            return
+        if self._run_started is not None:
+            latency = time.perf_counter() - self._run_started
+            self._run_started = None
+            self._first_audio.observe(latency)
+            per_char = latency / max(1, self._first_chunk_length)
+            if self._seconds_per_char is None:
+                self._seconds_per_char = per_char
+            else:
+                self._seconds_per_char += LATENCY_SMOOTHING * (per_char - self._seconds_per_char)
+
+    def _on_word(self, name: Optional[str], location: int, length: int) -> None:
+        """Engine callback on the worker thread; stops speech when cancelled or skipped."""
+        if self._stop_current or self._jump is not None:
+            self.engine.stop()
@@ -1,40 +1,159 @@
-"""Logging utilities."""
+"""Logging utilities.
 
+Records are handed to a queue and written by a listener thread, so logging
+never blocks the event loop on console or disk I/O. Use lazy ``%``-style
+arguments (``logger.info("Heard: %s", text)``) so messages below the active
+level are never formatted.
+"""
+
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Optional
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Serialize the record."""
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most ``burst`` copies of a message per ``interval``.
+
+    Messages are grouped by logger and unformatted message template, so a
+    retry warning that fires on every request is sampled while distinct
+    messages are unaffected. The first record after a quiet period carries
+    the number of copies that were dropped in between. Errors and above are
+    never dropped.
+    """
+
+    def __init__(self, burst: int = 20, interval: float = 60.0):
+        """Initialize the filter."""
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.suppressed_total = 0
+        self._windows: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether to keep a record."""
+        if record.levelno >= logging.ERROR:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            # [window start, records let through, records dropped]
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                dropped = window[2] if window else 0
+                if len(self._windows) > 10000:
+                    self._windows.clear()
+                self._windows[key] = [now, 1, 0]
+                if dropped:
+                    record.suppressed = dropped
+                    record.msg = f"{record.getMessage()} ({dropped} similar messages suppressed)"
+                    record.args = ()
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            self.suppressed_total += 1
+            return False
 
 
-def setup_logger(log_file: Optional[str] = None, log_level: int = logging.INFO) -> logging.Logger:
-    """Set up logging configuration."""
-    
+def setup_logger(
+    log_file: Optional[str] = None,
+    log_level: int = logging.INFO,
+    json_format: bool = False,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    rate_limit: int = 20,
+) -> logging.Logger:
+    """Set up logging configuration.
+
+    The ``ai_agent`` logger gets a single queue handler; the console and
+    rotating file handlers run on a listener thread. ``rate_limit`` caps
+    repeats of one message per minute (0 disables sampling).
+    """
+    global _listener
+
     # Create logger
     logger = logging.getLogger("ai_agent")
     logger.setLevel(log_level)
-    
+
     # Prevent duplicate handlers
     if logger.handlers:
         return logger
-    
+
     # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
+    formatter = JsonFormatter() if json_format else logging.Formatter(LOG_FORMAT)
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler if log file is specified
+    handlers = [console_handler]
+
+    # Rotating file handler if log file is specified
+    file_error = None
     if log_file:
         try:
-            file_handler = logging.FileHandler(log_file)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count
+            )
             file_handler.setLevel(log_level)
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
         except Exception as e:
-            logger.error(f"Could not create file handler: {e}")
-    
-    return logger
\ No newline at end of file
+            file_error = e
+
+    log_queue: "queue.Queue" = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    if rate_limit > 0:
+        queue_handler.addFilter(RateLimitFilter(burst=rate_limit))
+    logger.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    if file_error is not None:
+        logger.error("Could not create file handler: %s", file_error)
+
+    return logger
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
@@ -0,0 +1,238 @@
+"""Low-overhead latency histograms and gauges.
+
+Timing a stage costs two ``perf_counter`` calls and a bucket increment, so
+instrumentation stays on in production. Everything is recorded in the
+process-wide ``metrics`` registry and rendered in the Prometheus text format.
+
+    with metrics.time("stt_listen"):
+        audio = recognizer.listen(source)
+"""
+
+import bisect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Upper bounds in seconds, from a cache hit to a slow speech round trip
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_METRIC = "ai_agent_stage_seconds"
+REQUEST_METRIC = "ai_agent_request_seconds"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_key(labels: Dict[str, object]) -> Labels:
+    """Sorted label pairs with string values, so series always sort and render."""
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render labels as ``{a="1",b="2"}``."""
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets."""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation in seconds."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket holding it."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+class MetricsRegistry:
+    """Named histograms and callback gauges, keyed by label set."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._gauges: Dict[str, Dict[Labels, Callable[[], float]]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str = "", **labels: str) -> Histogram:
+        """Return the histogram for a name and label set, creating it if needed."""
+        key = _label_key(labels)
+        series = self._histograms.get(name)
+        if series is not None:
+            histogram = series.get(key)
+            if histogram is not None:
+                return histogram
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if help_text:
+                self._help[name] = help_text
+            return series.setdefault(key, Histogram())
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record an observation on a histogram."""
+        self.histogram(name, **labels).observe(value)
+
+    @contextmanager
+    def time(self, stage: str, **labels: str) -> Iterator[None]:
+        """Time a block as a pipeline stage, including when it raises."""
+        histogram = self.histogram(STAGE_METRIC, "Time spent in each pipeline stage", stage=stage, **labels)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    def gauge(self, name: str, func: Callable[[], float], help_text: str = "", **labels: str) -> None:
+        """Register a gauge read from ``func`` when metrics are rendered.
+
+        Registering the same name and labels again replaces the callback.
+        """
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = func
+            if help_text:
+                self._help[name] = help_text
+
+    def clear(self) -> None:
+        """Drop every metric."""
+        with self._lock:
+            self._histograms.clear()
+            self._gauges.clear()
+            self._help.clear()
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name, series in sorted(self._gauges.items()):
+            self._header(lines, name, "gauge")
+            for labels, func in list(series.items()):
+                try:
+                    value = float(func())
+                except Exception:
+                    continue
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+        for name, series in sorted(self._histograms.items()):
+            self._header(lines, name, "histogram")
+            for labels, histogram in list(series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', f'{bound:g}'))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, kind: str) -> None:
+        """Append the HELP and TYPE lines for a metric."""
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def summary(self) -> List[Dict[str, object]]:
+        """Per-series count, mean and estimated p50/p95 for every histogram."""
+        rows = []
+        for name, series in sorted(self._histograms.items()):
+            for labels, histogram in sorted(list(series.items()), key=lambda item: item[0]):
+                if not histogram.count:
+                    continue
+                rows.append({
+                    "metric": name,
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "mean_ms": histogram.sum / histogram.count * 1000,
+                    "p50_ms": histogram.quantile(0.5) * 1000,
+                    "p95_ms": histogram.quantile(0.95) * 1000,
+                })
+        return rows
+
+    def format_summary(self) -> str:
+        """Human-readable summary table for debug output."""
+        rows = self.summary()
+        if not rows:
+            return "No metrics recorded."
+        lines = [f"{'series':<40} {'count':>7} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}"]
+        for row in rows:
+            label = ",".join(f"{key}={value}" for key, value in row["labels"].items())
+            lines.append(
+                f"{label or row['metric']:<40} {row['count']:>7} "
+                f"{row['mean_ms']:>9.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f}"
+            )
+        return "\n".join(lines)
+
+
+class InstrumentedExecutor(ThreadPoolExecutor):
+    """Thread pool that reports its busy workers and queued tasks as gauges."""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str, registry: Optional[MetricsRegistry] = None):
+        """Initialize the pool and register its gauges."""
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.busy = 0
+        self._busy_lock = threading.Lock()
+
+        registry = registry or metrics
+        registry.gauge(
+            "ai_agent_executor_busy_threads", lambda: self.busy,
+            "Worker threads currently running a task", executor=thread_name_prefix,
+        )
+        registry.gauge(
+            "ai_agent_executor_queued_tasks", lambda: self.pending,
+            "Tasks waiting for a worker thread", executor=thread_name_prefix,
+        )
+        registry.gauge(
+            "ai_agent_executor_utilization", lambda: self.busy / self._max_workers,
+            "Fraction of worker threads busy", executor=thread_name_prefix,
+        )
+
+    @property
+    def pending(self) -> int:
+        """Tasks submitted but not yet picked up by a worker."""
+        return self._work_queue.qsize()
+
+    def submit(self, fn, *args, **kwargs):
+        """Submit a task, counting it as busy while it runs."""
+        def tracked():
+            with self._busy_lock:
+                self.busy += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._busy_lock:
+                    self.busy -= 1
+        return super().submit(tracked)
+
+
+# Process-wide registry shared by every component
+metrics = MetricsRegistry()
@@ -0,0 +1,266 @@
+"""On-demand profiling of single requests.
+
+Nothing is hooked until a caller asks for a profile, so the normal request
+path pays nothing. A capture starts a sampling thread that reads every
+thread's stack with ``sys._current_frames`` about once a millisecond,
+charges the time since the previous sample to each stack it records, and
+stores the result as collapsed stacks (``outer;inner;leaf <microseconds>``),
+the input format of flame graph tools.
+
+Two kinds of thread are sampled. The capturing thread is sampled only
+while it runs the profiled request: on an event loop, that means the task
+that started the capture or a task created from it. Other requests
+interleaved on the same loop are left out. Thread pool workers are sampled
+while they run a work item, under a root frame named after the pool, so
+image decoding, hashing and speech work sent to executors shows up too.
+Pools are shared, so work that a concurrent request queued on one may also
+appear.
+
+Only one capture runs at a time.
+"""
+
+import asyncio
+import concurrent.futures.thread
+import heapq
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+
+MAX_STACK_DEPTH = 64
+SAMPLE_INTERVAL = 0.001
+
+# Frames below a pool worker's work item belong to the executor machinery
+_WORKER_FILE = concurrent.futures.thread.__file__
+
+# The capture a task was created under, so its child tasks can be attributed
+_active_sampler: ContextVar[Optional["_Sampler"]] = ContextVar("active_sampler", default=None)
+
+
+def _frame_label(frame) -> str:
+    """``function (file.py:line)`` for a frame."""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _stack_key(frame, leaf: Optional[str] = None) -> str:
+    """Collapsed stack for a frame, outermost first."""
+    labels = [leaf] if leaf else []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _worker_stack_key(frame, thread_name: str) -> Optional[str]:
+    """Collapsed stack of the work item a pool worker runs, or None if it is idle."""
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == "run" and code.co_filename == _WORKER_FILE:
+            if len(labels) > MAX_STACK_DEPTH:
+                labels = labels[:MAX_STACK_DEPTH]
+            labels.append(f"[{_pool_name(thread_name)}]")
+            return ";".join(reversed(labels))
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return None
+
+
+def _pool_name(thread_name: str) -> str:
+    """``stt-recognizer`` for worker ``stt-recognizer_3``, so a pool's workers merge."""
+    prefix, _, index = thread_name.rpartition("_")
+    return prefix if prefix and index.isdigit() else thread_name
+
+
+class Profile:
+    """Collapsed-stack timings of one captured request."""
+
+    __slots__ = ("id", "label", "duration", "created", "stacks")
+
+    def __init__(self, profile_id: int, label: str, duration: float, stacks: Dict[str, float]):
+        self.id = profile_id
+        self.label = label
+        self.duration = duration
+        self.created = time.time()
+        self.stacks = stacks
+
+    def collapsed(self) -> str:
+        """One ``stack microseconds`` line per stack, heaviest first.
+
+        Stacks are rounded up to one microsecond so brief calls still appear.
+        """
+        lines = [
+            f"{stack} {max(1, round(seconds * 1_000_000))}"
+            for stack, seconds in sorted(self.stacks.items(), key=lambda item: -item[1])
+        ]
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, object]:
+        """Metadata without the stacks."""
+        return {
+            "id": self.id,
+            "label": self.label,
+            "duration_ms": round(self.duration * 1000, 3),
+            "created": self.created,
+            "stacks": len(self.stacks),
+        }
+
+
+class _Sampler:
+    """Thread that samples the profiled request's stacks at a fixed interval."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Dict[str, float] = {}
+        self.thread_id = threading.get_ident()
+        try:
+            self.loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+            self.tasks = {asyncio.current_task()} - {None}
+        except RuntimeError:
+            self.loop = None
+            self.tasks = set()
+        self._previous_factory = None
+        self._token = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling and begin attributing new tasks to this capture."""
+        if self.loop is not None:
+            self._previous_factory = self.loop.get_task_factory()
+            self.loop.set_task_factory(self._create_task)
+        self._token = _active_sampler.set(self)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and restore the loop's task factory."""
+        self._stop.set()
+        self._thread.join()
+        _active_sampler.reset(self._token)
+        if self.loop is not None:
+            self.loop.set_task_factory(self._previous_factory)
+
+    def _create_task(self, loop, coro, **kwargs):
+        """Task factory that remembers tasks created by the profiled request."""
+        if self._previous_factory is not None:
+            task = self._previous_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        # Called in the creating task's context, which new tasks inherit
+        if _active_sampler.get() is self:
+            self.tasks.add(task)
+        return task
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def _sample(self, elapsed: float) -> None:
+        """Charge ``elapsed`` seconds to every stack working for the request."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self.thread_id:
+                if self.loop is not None and asyncio.current_task(self.loop) not in self.tasks:
+                    continue
+                key = _stack_key(frame)
+            else:
+                key = _worker_stack_key(frame, names.get(thread_id, str(thread_id)))
+                if key is None:
+                    continue
+            self.stacks[key] = self.stacks.get(key, 0.0) + elapsed
+
+
+class RequestProfiler:
+    """Capture profiles on demand and keep the slowest ones.
+
+    Usage::
+
+        with profiler.capture("process_text") as handle:
+            await agent.process_text_command(text)
+        handle.profile  # None if skipped or not among the slowest kept
+    """
+
+    def __init__(self, max_profiles: int = 10, interval: float = SAMPLE_INTERVAL):
+        """Initialize an empty store of at most ``max_profiles`` profiles.
+
+        Captures sample stacks every ``interval`` seconds.
+        """
+        self.max_profiles = max_profiles
+        self.interval = interval
+        self.logger = logging.getLogger(__name__)
+        self._profiles: List = []  # min-heap of (duration, id, profile)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._active = False
+
+    @contextmanager
+    def capture(self, label: str) -> Iterator["CaptureHandle"]:
+        """Profile the enclosed block and the pool work it waits for."""
+        handle = CaptureHandle()
+        with self._lock:
+            busy, self._active = self._active, True
+        if busy:
+            yield handle
+            return
+
+        sampler = _Sampler(self.interval)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            yield handle
+        finally:
+            sampler.stop()
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._active = False
+            handle.profile = self._store(label, duration, sampler.stacks)
+
+    def _store(self, label: str, duration: float, stacks: Dict[str, float]) -> Optional[Profile]:
+        """Keep a profile if it is among the slowest seen."""
+        profile = Profile(next(self._ids), label, duration, stacks)
+        with self._lock:
+            if len(self._profiles) < self.max_profiles:
+                heapq.heappush(self._profiles, (duration, profile.id, profile))
+            elif duration > self._profiles[0][0]:
+                heapq.heapreplace(self._profiles, (duration, profile.id, profile))
+            else:
+                return None
+        self.logger.info("Captured profile %d of %s in %.1f ms", profile.id, label, duration * 1000)
+        return profile
+
+    def profiles(self) -> List[Profile]:
+        """Stored profiles, slowest first."""
+        with self._lock:
+            return [profile for _, _, profile in sorted(self._profiles, reverse=True)]
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        """Return a stored profile by ID."""
+        with self._lock:
+            for _, stored_id, profile in self._profiles:
+                if stored_id == profile_id:
+                    return profile
+        return None
+
+    def clear(self) -> None:
+        """Drop every stored profile."""
+        with self._lock:
+            self._profiles.clear()
+
+
+class CaptureHandle:
+    """Result slot filled in when a capture ends."""
+
+    __slots__ = ("profile",)
+
+    def __init__(self):
+        self.profile: Optional[Profile] = None
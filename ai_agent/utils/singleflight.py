@@ -0,0 +1,45 @@
+"""In-flight de-duplication of concurrent async work."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one computation between concurrent callers with the same key.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task and receive the same result or
+    exception. Once it finishes the key is forgotten, so later calls start
+    fresh work. A cancelled caller does not cancel the shared task.
+    """
+
+    def __init__(self):
+        """Initialize with nothing in flight."""
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run ``func`` unless a call with the same key is already running."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        """Drop a finished task and mark its exception as retrieved."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,140 @@
+"""Text helpers for speech output and request keys."""
+
+import re
+from typing import List, Optional
+
+
+# A sentence ends at ., ! or ? (optionally followed by closing quotes or
+# brackets) when whitespace follows. Decimals such as "3.5" never split.
+_BOUNDARY_RE = re.compile(r"""[.!?]+["')\]]*(?=\s)""")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Clause boundaries where a long sentence can be broken for speech
+_CLAUSE_RE = re.compile(r"[,;:]\s+|\s+[-\u2013\u2014]\s+")
+
+_ABBREVIATIONS = {"mr.", "mrs.", "ms.", "dr.", "st.", "vs.", "etc.", "e.g.", "i.e.", "a.m.", "p.m."}
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+
+# Filler words that never change what is being asked. Pronouns and modal
+# verbs stay: "do you love me" and "do i love you" are different questions.
+STOP_WORDS = frozenset({"a", "an", "the", "please", "kindly", "just", "um", "uh"})
+
+
+def _clean(chunk: str) -> str:
+    """Collapse runs of whitespace."""
+    return _WHITESPACE_RE.sub(" ", chunk).strip()
+
+
+def _find_boundary(text: str, start: int = 0) -> int:
+    """Index just past the first sentence boundary at or after ``start``, or -1.
+
+    A line break also ends a sentence so list items are spoken separately.
+    """
+    position = start
+    while True:
+        newline = text.find("\n", position)
+        match = _BOUNDARY_RE.search(text, position)
+        if match is None and newline < 0:
+            return -1
+        if match is None or (0 <= newline < match.start()):
+            return newline + 1
+
+        words = text[:match.end()].split()
+        if words and words[-1].lower() in _ABBREVIATIONS:
+            position = match.end()
+            continue
+        return match.end()
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences and lines, dropping empty chunks."""
+    chunks = []
+    start = 0
+    while True:
+        end = _find_boundary(text, start)
+        if end < 0:
+            break
+        chunks.append(text[start:end])
+        start = end
+    chunks.append(text[start:])
+    return [cleaned for cleaned in (_clean(chunk) for chunk in chunks) if cleaned]
+
+
+def _cut_point(text: str, limit: int) -> int:
+    """Where to break ``text`` so the first part is at most ``limit`` characters.
+
+    Prefers the last clause boundary unless it leaves a very short first
+    part, then the last space, then a hard cut.
+    """
+    window = text[:limit + 1]
+    clauses = [match.end() for match in _CLAUSE_RE.finditer(window)]
+    if clauses and clauses[-1] >= limit // 3:
+        return clauses[-1]
+    space = window.rfind(" ")
+    if space > 0:
+        return space + 1
+    return limit
+
+
+def split_speech_chunks(text: str, max_chars: int = 200, first_max_chars: Optional[int] = None) -> List[str]:
+    """Split text into chunks for pipelined speech.
+
+    Each sentence is a chunk; sentences longer than ``max_chars`` are broken
+    at clause boundaries, then between words. The first chunk can be held
+    to a tighter ``first_max_chars`` so speech starts sooner.
+    """
+    chunks = []
+    for sentence in split_sentences(text):
+        limit = first_max_chars if first_max_chars and not chunks else max_chars
+        while len(sentence) > limit:
+            cut = _cut_point(sentence, limit)
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+            limit = max_chars
+        if sentence:
+            chunks.append(sentence)
+    return chunks
+
+
+class SentenceChunker:
+    """Group a stream of text fragments into complete sentences.
+
+    Feed tokens as they arrive; each call returns the sentences completed so
+    far. A boundary is only confirmed once the following whitespace has been
+    seen, so "Dr." at the end of a token is not split early.
+    """
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self._buffer = ""
+
+    def feed(self, fragment: str) -> List[str]:
+        """Add a fragment and return any sentences it completes."""
+        self._buffer += fragment
+        sentences = []
+        while True:
+            end = _find_boundary(self._buffer)
+            if end < 0:
+                break
+            sentence = _clean(self._buffer[:end])
+            self._buffer = self._buffer[end:]
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever text remains once the stream has ended."""
+        remainder = _clean(self._buffer)
+        self._buffer = ""
+        return remainder or None
+
+
+def normalize_text(text: str, stop_words=STOP_WORDS) -> str:
+    """Fold case, punctuation, whitespace and filler words.
+
+    Used to build response cache keys, so "Please, the capital of France?"
+    and "capital of france" share one key.
+    """
+    words = _PUNCTUATION_RE.sub(" ", text.lower()).split()
+    return " ".join(word for word in words if word not in stop_words)
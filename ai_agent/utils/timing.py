@@ -0,0 +1,48 @@
+"""Cold-start timing for serverless entry points."""
+
+import logging
+import time
+from typing import Dict, Optional
+
+
+class ColdStartTimer:
+    """Record how long each phase of a cold start takes.
+
+    Phases are marked in order; each one is timed from the end of the
+    previous phase, or from ``start`` for the first. Marking a phase a
+    second time is ignored, so ``first_request`` only records the first.
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        """Initialize the timer. ``start`` is a ``time.perf_counter()`` value."""
+        self.start = time.perf_counter() if start is None else start
+        self.phases: Dict[str, float] = {}
+        self.logger = logging.getLogger(__name__)
+        self._last = self.start
+
+    def mark(self, phase: str, since: Optional[float] = None) -> float:
+        """Record the end of a phase and return its duration in seconds.
+
+        ``since`` times the phase from an explicit start instead of the end
+        of the previous phase, for phases such as a request that do not
+        directly follow the last one.
+        """
+        if phase in self.phases:
+            return self.phases[phase]
+
+        now = time.perf_counter()
+        duration = now - (self._last if since is None else since)
+        self.phases[phase] = duration
+        self._last = now
+        return duration
+
+    def report(self) -> Dict[str, float]:
+        """Phase durations in milliseconds, plus their total."""
+        report = {f"{phase}_ms": round(seconds * 1000, 3) for phase, seconds in self.phases.items()}
+        report["total_ms"] = round(sum(self.phases.values()) * 1000, 3)
+        return report
+
+    def log(self) -> None:
+        """Log the breakdown on a single line."""
+        breakdown = ", ".join(f"{phase}={value:.1f}ms" for phase, value in self.report().items())
+        self.logger.info("Cold start: %s", breakdown)
@@ -1,13 +1,19 @@
 """Image analysis and description functionality."""
 
 import asyncio
+import hashlib
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 from PIL import Image
 import base64
 import io
 
 from ..core.config import Config
+from ..utils.metrics import InstrumentedExecutor, metrics
+from ..utils.singleflight import SingleFlight
+
+
+LOAD_ERROR_MESSAGE = "Could not load the image. Please check the file path and format."
 
 
 class ImageAnalyzer:
@@ -17,34 +23,74 @@ class ImageAnalyzer:
         """Initialize the image analyzer."""
         self.config = config
         self.logger = logging.getLogger(__name__)
+        
+        # Identical images analyzed concurrently share one analysis
+        self._inflight = SingleFlight()
+        
+        # A dedicated pool keeps image spikes from starving speech work on
+        # the default executor
+        self._executor = InstrumentedExecutor(
+            max_workers=max(1, config.image_max_concurrency), thread_name_prefix="vision"
+        )
     
     async def describe_image(self, image_path: str) -> str:
-        """Analyze an image and return a description."""
+        """Analyze an image file and return a description."""
+        try:
+            loop = asyncio.get_event_loop()
+            data, digest = await loop.run_in_executor(self._executor, self._read_and_hash, image_path)
+        except Exception as e:
+            self.logger.error("Error reading image: %s", e)
+            return LOAD_ERROR_MESSAGE
+        
+        return await self._inflight.do(digest, lambda: self._describe(data))
+    
+    async def describe_image_data(self, data: bytes) -> str:
+        """Analyze image bytes, such as an upload, and return a description."""
+        loop = asyncio.get_event_loop()
+        digest = await loop.run_in_executor(self._executor, self._hash, data)
+        return await self._inflight.do(digest, lambda: self._describe(data))
+    
+    @staticmethod
+    def _hash(data: bytes) -> str:
+        """Content hash used to coalesce identical images."""
+        return hashlib.sha256(data).hexdigest()
+    
+    @classmethod
+    def _read_and_hash(cls, image_path: str) -> Tuple[bytes, str]:
+        """Read an image file and hash its contents."""
+        with open(image_path, "rb") as f:
+            data = f.read()
+        return data, cls._hash(data)
+    
+    async def _describe(self, data: bytes) -> str:
+        """Describe image bytes."""
         try:
             # Load and validate the image
-            image = await self._load_image(image_path)
+            with metrics.time("image_load"):
+                image = await self._load_image(data)
             if not image:
-                return "Could not load the image. Please check the file path and format."
+                return LOAD_ERROR_MESSAGE
             
             # For now, provide a basic analysis
             # In a full implementation, this would use AI vision models
-            description = await self._analyze_basic_properties(image)
+            with metrics.time("image_analyze"):
+                description = await self._analyze_basic_properties(image)
             
             return description
             
         except Exception as e:
-            self.logger.error(f"Error analyzing image: {e}")
+            self.logger.error("Error analyzing image: %s", e)
             return "I encountered an error while analyzing the image."
     
-    async def _load_image(self, image_path: str) -> Optional[Image.Image]:
-        """Load an image from file path."""
+    async def _load_image(self, data: bytes) -> Optional[Image.Image]:
+        """Load an image from its encoded bytes."""
         try:
             loop = asyncio.get_event_loop()
-            image = await loop.run_in_executor(None, Image.open, image_path)
+            image = await loop.run_in_executor(self._executor, Image.open, io.BytesIO(data))
             return image
             
         except Exception as e:
-            self.logger.error(f"Error loading image: {e}")
+            self.logger.error("Error loading image: %s", e)
             return None
     
     async def _analyze_basic_properties(self, image: Image.Image) -> str:
@@ -95,7 +141,7 @@ class ImageAnalyzer:
             return description
             
         except Exception as e:
-            self.logger.error(f"Error in basic analysis: {e}")
+            self.logger.error("Error in basic analysis: %s", e)
             return "Could not analyze the image properties."
     
     def supported_formats(self) -> list:
@@ -0,0 +1,102 @@
+"""Admission control for the web endpoints."""
+
+import asyncio
+import math
+from typing import Dict, Optional
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed because its endpoint is saturated."""
+
+    def __init__(self, limiter: str, retry_after: float):
+        super().__init__(f"{limiter} is overloaded")
+        self.limiter = limiter
+        self.retry_after = retry_after
+
+    def retry_after_header(self) -> str:
+        """Retry-After value in whole seconds, rounded up and never 0."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded wait queue.
+
+    Up to ``max_concurrent`` requests run at once and up to ``max_queue``
+    more wait for a slot. Anything beyond that, or anything that waits longer
+    than ``queue_timeout`` seconds, is rejected with ``Overloaded`` so the
+    caller can answer 503 immediately instead of piling up latency.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        retry_after: float = 1.0,
+        queue_timeout: Optional[float] = None,
+    ):
+        """Initialize the limiter."""
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.queue_timeout = queue_timeout
+
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AdmissionLimiter":
+        """Take a slot, waiting in the queue if there is room."""
+        if self._semaphore is None:
+            # Created lazily so it binds to the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        if not self._semaphore.locked():
+            # A slot is free, so this returns without suspending
+            await self._semaphore.acquire()
+        else:
+            await self._wait_for_slot()
+
+        self.active += 1
+        self.admitted += 1
+        return self
+
+    async def _wait_for_slot(self) -> None:
+        """Queue for a slot, or reject if the queue is full or too slow."""
+        if self.waiting >= self.max_queue:
+            self._reject()
+
+        self.waiting += 1
+        try:
+            if self.queue_timeout is None:
+                await self._semaphore.acquire()
+            else:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject()
+        finally:
+            self.waiting -= 1
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Release the slot."""
+        self.active -= 1
+        self._semaphore.release()
+
+    def _reject(self) -> None:
+        """Count and raise a rejection."""
+        self.rejected += 1
+        raise Overloaded(self.name, self.retry_after)
+
+    def stats(self) -> Dict[str, int]:
+        """Current occupancy and counters."""
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,148 @@
+"""Precompressed, ETag-validated static assets."""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+from typing import Dict, Optional, Set
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+# Compressing tiny or already-compressed files only wastes CPU
+MIN_COMPRESS_SIZE = 256
+_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+def _accepted_encodings(header: str) -> Set[str]:
+    """Content codings the client accepts, ignoring any with q=0."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = params.strip().lower()
+        if quality.startswith("q=") and quality[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(coding)
+    return accepted
+
+
+class Asset:
+    """One file held in memory with its compressed variants.
+
+    Each variant gets its own strong ETag, derived from the content hash, so
+    caches never confuse the gzip and identity bodies.
+    """
+
+    __slots__ = ("media_type", "cache_control", "variants", "etags")
+
+    def __init__(self, body: bytes, media_type: str, cache_control: str):
+        """Compress the body up front."""
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.variants: Dict[str, bytes] = {"identity": body}
+
+        if len(body) >= MIN_COMPRESS_SIZE and media_type.startswith(_COMPRESSIBLE_TYPES):
+            if brotli is not None:
+                self._add_variant("br", brotli.compress(body, quality=11))
+            self._add_variant("gzip", gzip.compress(body, compresslevel=9, mtime=0))
+
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        self.etags = {
+            coding: f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+            for coding in self.variants
+        }
+
+    def _add_variant(self, coding: str, data: bytes) -> None:
+        """Keep a compressed variant only if it is actually smaller."""
+        if len(data) < len(self.variants["identity"]):
+            self.variants[coding] = data
+
+    def select(self, accept_encoding: str) -> str:
+        """Pick the smallest variant the client accepts."""
+        accepted = _accepted_encodings(accept_encoding)
+        for coding in ("br", "gzip"):
+            if coding in self.variants and coding in accepted:
+                return coding
+        return "identity"
+
+    def response(self, request: Request) -> Response:
+        """Serve the asset, or a 304 when the client's copy is current."""
+        coding = self.select(request.headers.get("accept-encoding", ""))
+        etag = self.etags[coding]
+        headers = {
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or etag in (tag.strip() for tag in if_none_match.split(","))
+        ):
+            return Response(status_code=304, headers=headers)
+
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        body = b"" if request.method == "HEAD" else self.variants[coding]
+        response = Response(body, media_type=self.media_type, headers=headers)
+        if request.method == "HEAD":
+            response.headers["Content-Length"] = str(len(self.variants[coding]))
+        return response
+
+
+class AssetStore:
+    """In-memory assets keyed by URL path."""
+
+    def __init__(self, max_age: int = 86400):
+        """Initialize an empty store.
+
+        Files loaded from a directory are cached for ``max_age`` seconds.
+        """
+        self.max_age = max_age
+        self.logger = logging.getLogger(__name__)
+        self._assets: Dict[str, Asset] = {}
+
+    def add(self, path: str, body: bytes, media_type: str, cache_control: Optional[str] = None) -> Asset:
+        """Add an asset at a URL path."""
+        asset = Asset(body, media_type, cache_control or f"public, max-age={self.max_age}")
+        self._assets[path] = asset
+        return asset
+
+    def add_directory(self, directory: str, prefix: str = "/static/") -> int:
+        """Load every file under a directory, returning how many were added."""
+        count = 0
+        for root, _, files in os.walk(directory):
+            for name in files:
+                file_path = os.path.join(root, name)
+                relative = os.path.relpath(file_path, directory).replace(os.sep, "/")
+                media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                if media_type.startswith("text/"):
+                    media_type += "; charset=utf-8"
+                try:
+                    with open(file_path, "rb") as f:
+                        self.add(prefix + relative, f.read(), media_type)
+                    count += 1
+                except OSError as e:
+                    self.logger.error("Error loading static file %s: %s", file_path, e)
+        return count
+
+    def get(self, path: str) -> Optional[Asset]:
+        """Return the asset at a URL path, if any."""
+        return self._assets.get(path)
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._assets
@@ -1,16 +1,38 @@
 """Web interface for the AI Agent."""
 
 import os
+import hmac
+import json
+import hashlib
+import time
+import uuid
+import asyncio
 import logging
 from typing import Optional
-from fastapi import FastAPI, Request, Form, File, UploadFile, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import Depends, FastAPI, Request, Form, File, UploadFile, HTTPException, Query
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 import uvicorn
 
 from ..core.agent import AIAgent
 from ..core.config import Config
+from ..core.session import is_valid_session_id
+from ..speech.clip_cache import clip_media_type
+from ..utils.metrics import REQUEST_METRIC, metrics
+from .admission import AdmissionLimiter, Overloaded
+from .assets import AssetStore
+
+
+SESSION_COOKIE = "session_id"
+SESSION_HEADER = "X-Session-ID"
+
+PAGE_TITLE = "AI Agent for Blind Users"
+
+PROFILE_HEADER = "X-Profile"
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+PROFILED_PATHS = {"/process_text", "/analyze_image", "/voice_command"}
+
+SPEECH_UNAVAILABLE_MESSAGE = "Speech audio is not available on this server."
 
 
 class WebInterface:
@@ -29,75 +51,221 @@ class WebInterface:
             version="1.0.0"
         )
         
-        # Setup templates and static files
-        self.templates = Jinja2Templates(directory="templates")
+        # Per-endpoint admission control so a spike in one kind of request
+        # sheds load instead of slowing every endpoint down together
+        self.limiters = {
+            name: AdmissionLimiter(
+                name,
+                max_concurrent=getattr(config, f"{name}_max_concurrency"),
+                max_queue=getattr(config, f"{name}_max_queue"),
+                retry_after=config.retry_after_seconds,
+                queue_timeout=config.admission_queue_timeout,
+            )
+            for name in ("text", "image", "voice", "speech")
+        }
+        for name, limiter in self.limiters.items():
+            metrics.gauge(
+                "ai_agent_admission_active", lambda limiter=limiter: limiter.active,
+                "Requests holding an admission slot", endpoint=name,
+            )
+            metrics.gauge(
+                "ai_agent_admission_waiting", lambda limiter=limiter: limiter.waiting,
+                "Requests queued for an admission slot", endpoint=name,
+            )
+        
+        # Render the page and load static files once at startup; both are
+        # served precompressed from memory and revalidated with ETags
+        self.assets = AssetStore(max_age=config.static_max_age)
+        if os.path.exists(os.path.join("templates", "index.html")):
+            templates = Jinja2Templates(directory="templates")
+            page = templates.get_template("index.html").render(title=PAGE_TITLE)
+            # The page itself is always revalidated so new releases show up at once
+            self.assets.add("/", page.encode("utf-8"), "text/html; charset=utf-8", cache_control="no-cache")
+        else:
+            self.logger.warning("templates/index.html not found, home page disabled")
         
-        # Mount static files if directory exists
         if os.path.exists("static"):
-            self.app.mount("/static", StaticFiles(directory="static"), name="static")
+            count = self.assets.add_directory("static")
+            self.logger.info("Loaded %s static files", count)
         
+        self._prewarm: Optional[asyncio.Future] = None
         self._setup_routes()
+        if config.profiling_enabled:
+            self._setup_profiling()
+    
+    def _admit(self, name: str):
+        """Dependency that holds a slot of the named limiter for the request."""
+        limiter = self.limiters[name]
+        
+        async def admission():
+            async with limiter:
+                yield
+        
+        return Depends(admission)
+    
+    def _serve_asset(self, request: Request, path: str):
+        """Serve a preloaded asset or raise a 404."""
+        asset = self.assets.get(path)
+        if asset is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        return asset.response(request)
+    
+    def _clip_response(self, request: Request, clip: bytes) -> Response:
+        """Serve an audio clip with an ETag and single byte-range support.
+        
+        Media elements in some browsers only play audio served with ranges.
+        """
+        etag = f'"{hashlib.sha256(clip).hexdigest()[:32]}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Accept-Ranges": "bytes"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        
+        media_type = clip_media_type(clip)
+        byte_range = request.headers.get("range", "")
+        if byte_range.startswith("bytes=") and "," not in byte_range:
+            start_text, _, end_text = byte_range[6:].partition("-")
+            try:
+                if start_text:
+                    start = int(start_text)
+                    end = min(int(end_text), len(clip) - 1) if end_text else len(clip) - 1
+                else:
+                    start, end = max(len(clip) - int(end_text), 0), len(clip) - 1
+            except ValueError:
+                start, end = 0, -1
+            if not 0 <= start <= end:
+                headers["Content-Range"] = f"bytes */{len(clip)}"
+                return Response(status_code=416, headers=headers)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(clip)}"
+            return Response(clip[start:end + 1], status_code=206, media_type=media_type, headers=headers)
+        
+        return Response(clip, media_type=media_type, headers=headers)
     
     def _setup_routes(self):
         """Set up web routes."""
         
-        @self.app.get("/", response_class=HTMLResponse)
+        @self.app.exception_handler(Overloaded)
+        async def overloaded(request: Request, exc: Overloaded):
+            """Shed load with a fast 503."""
+            self.logger.warning("Rejected request: %s", exc)
+            return JSONResponse(
+                {
+                    "response": "The assistant is busy right now. Please try again in a moment.",
+                    "success": False,
+                },
+                status_code=503,
+                headers={"Retry-After": exc.retry_after_header()},
+            )
+        
+        @self.app.middleware("http")
+        async def record_latency(request: Request, call_next):
+            """Time every request, up to its response headers, by route and status."""
+            start = time.perf_counter()
+            status = 500
+            try:
+                response = await call_next(request)
+                status = response.status_code
+                return response
+            finally:
+                route = request.scope.get("route")
+                metrics.histogram(
+                    REQUEST_METRIC,
+                    "Web request latency by endpoint",
+                    endpoint=getattr(route, "path", "unmatched"),
+                    method=request.method,
+                    status=str(status),
+                ).observe(time.perf_counter() - start)
+        
+        @self.app.middleware("http")
+        async def assign_session(request: Request, call_next):
+            """Resolve the caller's session from a header or cookie."""
+            if request.url.path.startswith("/static/"):
+                # Static files are publicly cacheable and must not carry a cookie
+                return await call_next(request)
+            
+            session_id = request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+            is_new = not is_valid_session_id(session_id)
+            if is_new:
+                session_id = uuid.uuid4().hex
+            request.state.session_id = session_id
+            
+            response = await call_next(request)
+            if is_new:
+                response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="lax")
+            return response
+        
+        @self.app.api_route("/", methods=["GET", "HEAD"], response_class=HTMLResponse)
         async def home(request: Request):
             """Home page."""
-            return self.templates.TemplateResponse(
-                "index.html", 
-                {"request": request, "title": "AI Agent for Blind Users"}
-            )
+            return self._serve_asset(request, "/")
+        
+        @self.app.api_route("/static/{path:path}", methods=["GET", "HEAD"])
+        async def static(request: Request, path: str):
+            """Static files."""
+            return self._serve_asset(request, f"/static/{path}")
         
-        @self.app.post("/process_text")
-        async def process_text(text: str = Form(...)):
+        @self.app.post("/process_text", dependencies=[self._admit("text")])
+        async def process_text(request: Request, text: str = Form(...)):
             """Process text input and return response."""
             try:
-                response = await self.agent.process_text_command(text)
+                response = await self.agent.process_text_command(text, request.state.session_id)
                 return JSONResponse({"response": response, "success": True})
             except Exception as e:
-                self.logger.error(f"Error processing text: {e}")
+                self.logger.error("Error processing text: %s", e)
                 return JSONResponse({
                     "response": "I encountered an error processing your request.",
                     "success": False
                 }, status_code=500)
         
-        @self.app.post("/voice_command")
-        async def voice_command():
+        @self.app.post("/process_text_stream")
+        async def process_text_stream(request: Request, text: str = Form(...)):
+            """Stream the response sentence by sentence as server-sent events."""
+            session_id = request.state.session_id
+            limiter = self.limiters["text"]
+            
+            async def events():
+                # The slot is held here rather than by a dependency, which
+                # would be released before the body is streamed
+                try:
+                    async with limiter:
+                        async for sentence in self.agent.stream_text_command(text, session_id):
+                            yield f"data: {json.dumps({'text': sentence})}\n\n"
+                        yield "event: done\ndata: {}\n\n"
+                except Overloaded as e:
+                    self.logger.warning("Rejected request: %s", e)
+                    retry_after = e.retry_after_header()
+                    yield f"event: error\ndata: {json.dumps({'retry_after': int(retry_after)})}\n\n"
+                except Exception as e:
+                    self.logger.error("Error streaming text response: %s", e)
+                    yield "event: error\ndata: {}\n\n"
+            
+            return StreamingResponse(
+                events(),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+        
+        @self.app.post("/voice_command", dependencies=[self._admit("voice")])
+        async def voice_command(request: Request):
             """Process voice command."""
             try:
-                response = await self.agent.process_voice_command()
+                response = await self.agent.process_voice_command(request.state.session_id)
                 return JSONResponse({
                     "response": response or "No speech detected",
                     "success": True
                 })
             except Exception as e:
-                self.logger.error(f"Error processing voice command: {e}")
+                self.logger.error("Error processing voice command: %s", e)
                 return JSONResponse({
                     "response": "I encountered an error processing your voice command.",
                     "success": False
                 }, status_code=500)
         
-        @self.app.post("/analyze_image")
+        @self.app.post("/analyze_image", dependencies=[self._admit("image")])
         async def analyze_image(file: UploadFile = File(...)):
             """Analyze uploaded image."""
             try:
-                # Save uploaded file temporarily
-                temp_path = f"temp/{file.filename}"
-                os.makedirs("temp", exist_ok=True)
-                
-                with open(temp_path, "wb") as buffer:
-                    content = await file.read()
-                    buffer.write(content)
-                
-                # Analyze image
-                description = await self.agent.analyze_image(temp_path)
-                
-                # Clean up temp file
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
+                content = await file.read()
+                description = await self.agent.analyze_image_data(content)
                 
                 return JSONResponse({
                     "description": description,
@@ -105,46 +273,136 @@ class WebInterface:
                 })
                 
             except Exception as e:
-                self.logger.error(f"Error analyzing image: {e}")
+                self.logger.error("Error analyzing image: %s", e)
                 return JSONResponse({
                     "description": "I encountered an error analyzing the image.",
                     "success": False
                 }, status_code=500)
         
+        @self.app.api_route("/speech", methods=["GET", "HEAD"], dependencies=[self._admit("speech")])
+        async def speech(
+            request: Request,
+            text: str = Query(..., min_length=1, max_length=self.config.speech_max_chars),
+        ):
+            """Text rendered to audio by the server's TTS engine."""
+            clip = await self.agent.synthesize_speech(text)
+            if clip is None:
+                return JSONResponse({"response": SPEECH_UNAVAILABLE_MESSAGE, "success": False}, status_code=503)
+            return self._clip_response(request, clip)
+        
         @self.app.get("/history")
-        async def get_history():
-            """Get session history."""
+        async def get_history(
+            request: Request,
+            cursor: Optional[int] = None,
+            limit: int = Query(100, ge=1, le=500),
+        ):
+            """Get a page of session history."""
             try:
-                history = self.agent.get_session_history()
-                return JSONResponse({"history": history, "success": True})
+                history, next_cursor = await self.agent.get_history_page(
+                    request.state.session_id, cursor, limit
+                )
+                return JSONResponse({"history": history, "next_cursor": next_cursor, "success": True})
             except Exception as e:
-                self.logger.error(f"Error getting history: {e}")
+                self.logger.error("Error getting history: %s", e)
                 return JSONResponse({
                     "history": [],
                     "success": False
                 }, status_code=500)
         
         @self.app.post("/clear_history")
-        async def clear_history():
+        async def clear_history(request: Request):
             """Clear session history."""
             try:
-                self.agent.clear_session_history()
+                self.agent.clear_session_history(request.state.session_id)
                 return JSONResponse({"message": "History cleared", "success": True})
             except Exception as e:
-                self.logger.error(f"Error clearing history: {e}")
+                self.logger.error("Error clearing history: %s", e)
                 return JSONResponse({
                     "message": "Error clearing history",
                     "success": False
                 }, status_code=500)
         
+        @self.app.on_event("startup")
+        async def prewarm_speech():
+            """Render the fixed responses in the background so they play at once."""
+            if not self.config.headless:
+                self._prewarm = asyncio.ensure_future(self.agent.prewarm_speech())
+        
+        @self.app.on_event("shutdown")
+        async def shutdown():
+            """Close clients and flush persisted history on shutdown."""
+            await self.agent.aclose()
+        
+        @self.app.get("/cache_stats")
+        async def cache_stats():
+            """Response cache counters for monitoring."""
+            return JSONResponse({"cache": self.agent.response_cache.stats(), "success": True})
+        
+        @self.app.get("/metrics")
+        async def metrics_endpoint():
+            """Latency histograms, queue depths and executor use in Prometheus format."""
+            return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+        
         @self.app.get("/health")
         async def health_check():
             """Health check endpoint."""
             return JSONResponse({"status": "healthy", "success": True})
     
+    def _is_admin(self, request: Request) -> bool:
+        """Whether the request carries the admin token; never true if none is configured."""
+        token = self.config.admin_token
+        return bool(token) and hmac.compare_digest(request.headers.get(ADMIN_TOKEN_HEADER, ""), token)
+    
+    def _require_admin(self, request: Request) -> None:
+        """Reject admin requests without the configured token."""
+        if not self._is_admin(request):
+            raise HTTPException(status_code=403, detail="Forbidden")
+    
+    def _setup_profiling(self):
+        """Profile requests that ask for it and serve the slowest profiles.
+        
+        Only registered when profiling is enabled, so it adds nothing to the
+        request path otherwise.
+        """
+        profiler = self.agent.profiler
+        
+        @self.app.middleware("http")
+        async def profile_request(request: Request, call_next):
+            """Capture a profile when an admin sets the X-Profile header."""
+            if (
+                not request.headers.get(PROFILE_HEADER)
+                or request.url.path not in PROFILED_PATHS
+                or not self._is_admin(request)
+            ):
+                return await call_next(request)
+            
+            with profiler.capture(request.url.path) as handle:
+                response = await call_next(request)
+            if handle.profile is not None:
+                response.headers["X-Profile-ID"] = str(handle.profile.id)
+            return response
+        
+        @self.app.get("/admin/profiles")
+        async def list_profiles(request: Request):
+            """The slowest captured profiles, slowest first."""
+            self._require_admin(request)
+            return JSONResponse({
+                "profiles": [profile.summary() for profile in profiler.profiles()],
+                "success": True,
+            })
+        
+        @self.app.get("/admin/profiles/{profile_id}")
+        async def get_profile(request: Request, profile_id: int):
+            """One profile as collapsed stacks, ready for a flame graph tool."""
+            self._require_admin(request)
+            profile = profiler.get(profile_id)
+            if profile is None:
+                raise HTTPException(status_code=404, detail="Profile not found")
+            return PlainTextResponse(profile.collapsed())
+    
     def run(self):
         """Run the web interface."""
-        self.logger.info(f"Starting web interface on {self.config.web_host}:{self.config.web_port}")
+        self.logger.info("Starting web interface on %s:%s", self.config.web_host, self.config.web_port)
         uvicorn.run(
             self.app,
             host=self.config.web_host,
@@ -1,32 +1,32 @@
-"""FastAPI application entry point for deployment."""
+"""FastAPI application entry point for deployment.
 
-import os
-import sys
-from pathlib import Path
+Serverless hosts import this module on every cold start, so it does as little
+as possible up front: the landing page is compressed on the first request for
+it, and the agent is only built when the first API request needs it. The
+timing of each phase is logged after the first request and served from
+``/cold_start``.
+"""
+
+import time
 
-# Add the project root to Python path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+_import_start = time.perf_counter()
 
-from fastapi import FastAPI, Form
-from fastapi.responses import HTMLResponse, JSONResponse
-from deploy_agent import AIAgent, Config
+import asyncio
+import os
+import uuid
+from functools import lru_cache
+from typing import Optional, Tuple
 
-# Create configuration
-config = Config.from_env()
-config.debug_mode = False
-config.web_port = int(os.environ.get("PORT", 8000))
-config.web_host = "0.0.0.0"
+from fastapi import FastAPI, Form, Request
+from fastapi.responses import JSONResponse
 
-# Create AI agent
-agent = AIAgent(config)
+from ai_agent.core.config import Config
+from ai_agent.core.session import is_valid_session_id
+from ai_agent.utils.timing import ColdStartTimer
+from ai_agent.web.assets import Asset
 
-# Create FastAPI app
-app = FastAPI(
-    title="AI Agent for Blind Users",
-    description="Accessible AI assistant web interface",
-    version="1.0.0"
-)
+timer = ColdStartTimer(_import_start)
+timer.mark("imports")
 
 # HTML template
 HTML_TEMPLATE = """
@@ -138,25 +138,109 @@ HTML_TEMPLATE = """
 </html>
 """
 
-@app.get("/", response_class=HTMLResponse)
-async def home():
-    return HTMLResponse(HTML_TEMPLATE)
-
-@app.post("/process_text")
-async def process_text(text: str = Form(...)):
-    try:
-        response = await agent.process_text_command(text)
-        return JSONResponse({"response": response, "success": True})
-    except Exception as e:
-        return JSONResponse({
-            "response": "Error processing request.",
-            "success": False
-        }, status_code=500)
-
-@app.get("/health")
-async def health_check():
-    return JSONResponse({"status": "healthy", "success": True})
+
+@lru_cache(maxsize=None)
+def landing_page() -> Asset:
+    """The landing page, compressed on first use and then served from memory or a 304."""
+    return Asset(HTML_TEMPLATE.encode("utf-8"), "text/html; charset=utf-8", "no-cache")
+
+
+def session_id_for(request: Request) -> Tuple[str, bool]:
+    """Session ID from the X-Session-ID header or session_id cookie, or a new one.
+
+    Also returns whether the ID is new, in which case it should be set as the
+    session cookie so the client's next request lands in the same session.
+    """
+    session_id = request.headers.get("X-Session-ID") or request.cookies.get("session_id")
+    if is_valid_session_id(session_id):
+        return session_id, False
+    return uuid.uuid4().hex, True
+
+
+def create_app(config: Optional[Config] = None, timer: Optional[ColdStartTimer] = None) -> FastAPI:
+    """Create the serverless app.
+
+    The agent is constructed on the first API request rather than here, so
+    a cold start that only serves the landing page or a health check never
+    pays for it.
+    """
+    if config is None:
+        # Serverless hosts have no audio devices and a read-only filesystem
+        config = Config.from_env()
+        config.headless = True
+        config.debug_mode = False
+        config.log_file = os.environ.get("LOG_FILE")
+    timer = timer or ColdStartTimer()
+
+    app = FastAPI(
+        title="AI Agent for Blind Users",
+        description="Accessible AI assistant web interface",
+        version="1.0.0"
+    )
+    app.state.agent = None
+    app.state.agent_lock = None
+
+    async def get_agent():
+        """Return the agent, building it on first use."""
+        if app.state.agent is None:
+            # Created here, inside the server's loop: on Python < 3.10 a lock
+            # made at import time binds to whatever loop was current then
+            if app.state.agent_lock is None:
+                app.state.agent_lock = asyncio.Lock()
+            async with app.state.agent_lock:
+                if app.state.agent is None:
+                    from ai_agent.core.agent import AIAgent
+
+                    app.state.agent = AIAgent(config)
+        return app.state.agent
+
+    @app.api_route("/", methods=["GET", "HEAD"])
+    async def home(request: Request):
+        return landing_page().response(request)
+
+    @app.post("/process_text")
+    async def process_text(request: Request, text: str = Form(...)):
+        request_start = time.perf_counter()
+        try:
+            agent = await get_agent()
+            session_id, is_new = session_id_for(request)
+            response = JSONResponse({
+                "response": await agent.process_text_command(text, session_id),
+                "success": True
+            })
+            if is_new:
+                response.set_cookie("session_id", session_id, httponly=True, samesite="lax")
+            return response
+        except Exception as e:
+            return JSONResponse({
+                "response": "Error processing request.",
+                "success": False
+            }, status_code=500)
+        finally:
+            if "first_request" not in timer.phases:
+                timer.mark("first_request", since=request_start)
+                timer.log()
+
+    @app.get("/health")
+    async def health_check():
+        return JSONResponse({"status": "healthy", "success": True})
+
+    @app.get("/cold_start")
+    async def cold_start():
+        """Timing breakdown of this instance's cold start."""
+        return JSONResponse({"cold_start": timer.report(), "success": True})
+
+    @app.on_event("shutdown")
+    async def shutdown():
+        if app.state.agent is not None:
+            await app.state.agent.aclose()
+
+    timer.mark("app")
+    return app
+
+
+app = create_app(timer=timer)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 8000)))
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 8000)))
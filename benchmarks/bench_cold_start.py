@@ -0,0 +1,106 @@
+"""Cold-start footprint of the agent: headless, full and serverless.
+
+Each scenario runs in a fresh interpreter and reports the wall time to
+import, construct the agent and answer one text command, plus peak RSS.
+The serverless scenario imports ``app.py`` and also reports its own
+breakdown into imports, app construction and first request.
+
+    python -m benchmarks.bench_cold_start
+    python -m benchmarks.bench_cold_start --json
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+_PRELUDE = """
+import resource, time
+start = time.perf_counter()
+"""
+
+_REPORT = """
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+modules = len(sys.modules)
+result = {"seconds": elapsed, "rss_mb": rss_kb / 1024, "modules": modules}
+result.update(globals().get("breakdown", {}))
+print(json.dumps(result))
+"""
+
+SCENARIOS = {
+    # What the Vercel entry point loads
+    "headless": """
+import asyncio, json, sys, logging
+logging.disable(logging.CRITICAL)
+from ai_agent import AIAgent, Config
+agent = AIAgent(Config(headless=True, log_file=None))
+agent.tts, agent.stt
+asyncio.run(agent.process_text_command("hello"))
+""",
+    # The desktop agent with its speech and vision stack loaded
+    "full": """
+import asyncio, json, sys, logging
+logging.disable(logging.CRITICAL)
+from ai_agent import AIAgent, Config
+agent = AIAgent(Config(log_file=None))
+agent.tts, agent.stt, agent.image_analyzer
+asyncio.run(agent.process_text_command("hello"))
+""",
+    # The Vercel entry point answering its first request
+    "serverless": """
+import asyncio, json, sys, logging
+logging.disable(logging.CRITICAL)
+import httpx
+import app
+
+async def first_request():
+    transport = httpx.ASGITransport(app=app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/process_text", data={"text": "hello"})
+
+asyncio.run(first_request())
+breakdown = app.timer.report()
+""",
+}
+
+
+def measure(name: str, repeat: int = 3) -> dict:
+    """Run a scenario ``repeat`` times and keep the fastest run."""
+    code = _PRELUDE + SCENARIOS[name] + _REPORT
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run["seconds"])
+
+
+def main() -> None:
+    """Print the footprint of each scenario."""
+    results = {name: measure(name) for name in SCENARIOS}
+    if "--json" in sys.argv:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'scenario':>10} {'time (ms)':>10} {'rss (MB)':>9} {'modules':>8}")
+    for name, result in results.items():
+        print(f"{name:>10} {result['seconds'] * 1000:>10.1f} {result['rss_mb']:>9.1f} {result['modules']:>8}")
+
+    breakdown = results["serverless"]
+    print()
+    print("serverless cold start (ms):")
+    for phase in ("imports_ms", "app_ms", "first_request_ms", "total_ms"):
+        print(f"{phase[:-3]:>14} {breakdown[phase]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Micro-benchmark: compiled intent router vs. chained substring checks.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_intents
+"""
+
+import random
+import timeit
+from typing import List
+
+from ai_agent.core.intents import IntentRouter
+
+
+INTENT_COUNTS = (10, 100, 1000)
+KEYWORDS_PER_INTENT = 3
+
+
+def make_keywords(count: int) -> List[List[str]]:
+    """Generate distinct keyword lists for ``count`` intents."""
+    return [
+        [f"kw{index}x{slot}" for slot in range(KEYWORDS_PER_INTENT)]
+        for index in range(count)
+    ]
+
+
+def make_inputs(keywords: List[List[str]], seed: int = 7) -> List[str]:
+    """Build a mix of commands hitting early, late and no intents."""
+    rng = random.Random(seed)
+    filler = "please could you tell me something about this right now".split()
+    inputs = []
+    for target in (0, len(keywords) // 2, len(keywords) - 1, None):
+        words = rng.sample(filler, 6)
+        if target is not None:
+            words.insert(3, keywords[target][-1])
+        inputs.append(" ".join(words))
+    return inputs
+
+
+def chained_match(keywords: List[List[str]], command: str):
+    """The original if/elif routing: substring scans in priority order."""
+    for index, words in enumerate(keywords):
+        if any(word in command for word in words):
+            return index
+    return None
+
+
+def run(number: int = 2000) -> None:
+    """Print per-call timings for both strategies."""
+    print(f"{'intents':>8} {'chain (us)':>12} {'router (us)':>12} {'speedup':>8}")
+    for count in INTENT_COUNTS:
+        keywords = make_keywords(count)
+        inputs = make_inputs(keywords)
+
+        router = IntentRouter()
+        for index, words in enumerate(keywords):
+            router.register(f"intent{index}", words, handler=None)
+        router.compile()
+
+        # Both strategies must agree before timing them.
+        for command in inputs:
+            expected = chained_match(keywords, command)
+            intent = router.match(command)
+            assert (intent.priority if intent else None) == expected
+
+        chain = timeit.timeit(
+            lambda: [chained_match(keywords, command) for command in inputs],
+            number=number,
+        )
+        compiled = timeit.timeit(
+            lambda: [router.match(command) for command in inputs],
+            number=number,
+        )
+        calls = number * len(inputs)
+        chain_us = chain / calls * 1e6
+        router_us = compiled / calls * 1e6
+        print(f"{count:>8} {chain_us:>12.2f} {router_us:>12.2f} {chain_us / router_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run()
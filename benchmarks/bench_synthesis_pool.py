@@ -0,0 +1,100 @@
+"""Synthesis throughput of the TTS process pool at 1, 2, 4 and 8 workers.
+
+Each run renders the same batch of clips through a fresh SynthesisPool and
+reports clips per second and the speedup over one worker. By default the
+workers use a CPU-bound fake engine, so results reflect the pool and the
+machine's cores; pass ``--engine pyttsx3`` or ``--engine espeak`` to time
+a real engine.
+
+    python -m benchmarks.bench_synthesis_pool
+    python -m benchmarks.bench_synthesis_pool --clips 64 --workers 1 2 4
+    python -m benchmarks.bench_synthesis_pool --engine pyttsx3 --json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from functools import partial
+from typing import Dict, List, Optional
+
+from ai_agent.speech.backends import create_engine
+from ai_agent.speech.pool import SynthesisPool
+
+from .fakes import fake_synthesis_engine
+
+
+ENGINES = {
+    "fake": fake_synthesis_engine,
+    "espeak": partial(create_engine, "espeak"),
+    "pyttsx3": partial(create_engine, "pyttsx3"),
+}
+
+SENTENCES = [
+    "Hello! I'm your AI assistant.",
+    "The current time is ten past three in the afternoon.",
+    "The image shows a wide landscape with a bright blue sky.",
+    "I'm sorry, I couldn't reach the AI service right now. Please try again in a moment.",
+]
+
+
+def measure(workers: int, clips: int, engine: str) -> Dict[str, float]:
+    """Render ``clips`` clips with a pool of ``workers`` processes."""
+    pool = SynthesisPool(workers, ENGINES[engine])
+    try:
+        # Start-up and engine creation are not part of the throughput
+        for future in [pool.submit("Warm up.", rate=180) for _ in range(workers * 2)]:
+            future.result()
+
+        start = time.perf_counter()
+        futures = [
+            pool.submit(f"{SENTENCES[index % len(SENTENCES)]} Clip {index}.", rate=180)
+            for index in range(clips)
+        ]
+        sizes = [len(future.result() or b"") for future in futures]
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+
+    return {
+        "workers": workers,
+        "clips": clips,
+        "failed": sum(1 for size in sizes if not size),
+        "seconds": round(elapsed, 3),
+        "clips_per_sec": round(clips / elapsed, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print throughput for each pool size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Pool sizes to run")
+    parser.add_argument("--clips", type=int, default=48, help="Clips rendered per run")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="fake", help="Engine used by workers")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    results = [measure(workers, args.clips, args.engine) for workers in args.workers]
+    baseline = results[0]["clips_per_sec"]
+    for result in results:
+        result["speedup"] = round(result["clips_per_sec"] / baseline, 2) if baseline else 0.0
+
+    if args.json:
+        print(json.dumps({"cpus": os.cpu_count(), "engine": args.engine, "results": results}, indent=2))
+        return 0
+
+    print(f"engine={args.engine}, {os.cpu_count()} CPUs, {args.clips} clips per run")
+    print(f"{'workers':>8} {'seconds':>9} {'clips/s':>9} {'speedup':>8} {'failed':>7}")
+    for result in results:
+        print(
+            f"{result['workers']:>8} {result['seconds']:>9.2f} {result['clips_per_sec']:>9.1f} "
+            f"{result['speedup']:>7.2f}x {result['failed']:>7}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
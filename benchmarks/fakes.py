@@ -0,0 +1,105 @@
+"""Deterministic stand-ins for the speech components.
+
+They follow the TextToSpeech and SpeechToText interfaces but never touch
+audio devices, so voice round trips can be timed repeatably on any machine.
+"""
+
+import itertools
+import math
+import struct
+from typing import Iterable, List, Optional
+
+from ai_agent.speech.backends import FakeTTSEngine
+from ai_agent.speech.worker import NORMAL
+
+
+class FakeTextToSpeech:
+    """Records spoken text instead of playing it."""
+
+    available = True
+    is_speaking = False
+
+    def __init__(self, config=None):
+        """Initialize an empty transcript."""
+        self.config = config
+        self.engine = None
+        self.spoken: List[str] = []
+
+    async def speak(self, text: str, priority: int = NORMAL, key: Optional[str] = None) -> bool:
+        """Remember the text."""
+        self.spoken.append(text)
+        return True
+
+    async def synthesize(self, text: str, priority: int = NORMAL) -> Optional[bytes]:
+        """No audio is rendered."""
+        return None
+
+    async def prewarm(self, texts: Iterable[str]) -> int:
+        """Nothing to render."""
+        return 0
+
+    def interrupt(self) -> int:
+        """Nothing is ever left to cancel."""
+        return 0
+
+    def skip(self, offset: int) -> bool:
+        """Speech finishes at once, so there is nothing to skip."""
+        return False
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+    def get_available_voices(self) -> list:
+        """No voices to choose from."""
+        return []
+
+    def set_voice(self, voice_id: str) -> bool:
+        """Accept any voice."""
+        return True
+
+    def set_rate(self, rate: int) -> bool:
+        """Accept any rate."""
+        return True
+
+
+class FakeSpeechToText:
+    """Hears a fixed list of phrases in a loop."""
+
+    available = True
+
+    def __init__(self, phrases: Iterable[str], config=None):
+        """Initialize with the phrases to return, in order."""
+        self.config = config
+        self.microphone = object()
+        self._phrases = itertools.cycle(list(phrases))
+
+    async def listen_and_transcribe(self) -> Optional[str]:
+        """Return the next phrase."""
+        return next(self._phrases)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+    def get_microphone_names(self) -> list:
+        """A single fake microphone."""
+        return ["fake"]
+
+
+class FakeSynthesisEngine(FakeTTSEngine):
+    """Fake engine whose clips are a tone rendered in pure Python.
+
+    Rendering costs CPU in proportion to the text length, like a real
+    synthesizer, so pool benchmarks show how synthesis scales with workers.
+    """
+
+    SECONDS_PER_CHAR = 0.05
+
+    def _samples(self, count: int) -> bytes:
+        """A 220 Hz tone."""
+        step = 2 * math.pi * 220 / self.SAMPLE_RATE
+        return struct.pack(f"<{count}h", *(int(8000 * math.sin(step * n)) for n in range(count)))
+
+
+def fake_synthesis_engine() -> FakeSynthesisEngine:
+    """Engine factory for synthesis pool workers."""
+    return FakeSynthesisEngine()
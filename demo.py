@@ -6,87 +6,28 @@ speech recognition, TTS, or AI model dependencies.
 """
 
 import asyncio
-from datetime import datetime
-from typing import Optional
 
+from ai_agent import AIAgent, Config
 
-class DemoAgent:
-    """Demo version of the AI Agent with minimal dependencies."""
+
+class DemoAgent(AIAgent):
+    """Demo version of the AI Agent, running headless with minimal dependencies."""
     
     def __init__(self):
         """Initialize the demo agent."""
-        self.session_history = []
+        super().__init__(Config(headless=True, log_file=None))
         print("🤖 AI Agent for Blind Users - Demo Mode")
         print("=" * 45)
         print("This demo shows the core functionality without requiring")
         print("speech recognition or text-to-speech dependencies.")
         print()
     
-    async def process_text_command(self, text: str) -> str:
-        """Process a text command and return a response."""
-        command = text.lower().strip()
-        
-        # Add to session history
-        self.session_history.append({
-            "timestamp": datetime.now().isoformat(),
-            "type": "user_input",
-            "content": text
-        })
-        
-        # Handle specific commands
-        if any(word in command for word in ["hello", "hi", "hey"]):
-            response = ("Hello! I'm your AI assistant. I can help you with "
-                       "image descriptions, telling time, reading text, and many "
-                       "other tasks. Just ask me what you need!")
-        
-        elif any(word in command for word in ["time", "clock"]):
-            now = datetime.now()
-            time_str = now.strftime("%I:%M %p")
-            date_str = now.strftime("%A, %B %d, %Y")
-            response = f"The current time is {time_str} on {date_str}."
-        
-        elif any(word in command for word in ["help", "commands", "what can you do"]):
-            response = """I can help you with several tasks:
-            
-- Describe images: Say 'describe this image' or 'what's in this picture'
-- Tell time: Ask 'what time is it?' 
-- General conversation: Just talk to me naturally
-- Web interface: Use the web interface for file uploads and more features
-
-I'm designed to be accessible for blind and visually impaired users. 
-All responses are provided through text-to-speech in the full version."""
-        
-        elif any(word in command for word in ["describe", "image", "picture", "photo"]):
-            response = ("To describe an image, please use the web interface to "
-                       "upload a photo, or specify the path to an image file "
-                       "when using the command line interface. In this demo mode, "
-                       "image analysis is not available, but the full version "
-                       "includes AI-powered image description.")
-        
-        elif any(word in command for word in ["quit", "exit", "bye", "goodbye"]):
-            response = ("Goodbye! Thank you for trying the AI Agent for Blind Users. "
-                       "To use the full version with voice commands and TTS, "
-                       "install the dependencies: pip install -r requirements.txt")
-        
-        else:
-            response = (f"I heard you say: '{text}'. This is the demo version "
-                       f"showing basic text processing. In the full implementation, "
-                       f"this would be processed by AI models to provide intelligent, "
-                       f"context-aware responses with speech synthesis.")
-        
-        # Add response to history
-        self.session_history.append({
-            "timestamp": datetime.now().isoformat(),
-            "type": "agent_response", 
-            "content": response
-        })
-        
+    async def process_text_command(self, text: str, session_id=None) -> str:
+        """Process a text command, recording the reply as the full version would speak it."""
+        response = await super().process_text_command(text, session_id)
+        await self.speak(response, session_id)
         return response
     
-    def get_session_history(self):
-        """Get the session history."""
-        return self.session_history.copy()
-    
     def display_features(self):
         """Display the main features of the full version."""
         print("🎯 Full Version Features:")
@@ -0,0 +1,125 @@
+"""Test admission control for the web endpoints."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from ai_agent.core.agent import AIAgent
+from ai_agent.core.config import Config
+from ai_agent.web.admission import AdmissionLimiter, Overloaded
+from ai_agent.web.interface import WebInterface
+
+
+class TestAdmissionLimiter:
+    """Test cases for the AdmissionLimiter class."""
+    
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Test that requests beyond the slots and queue are shed."""
+        limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=1)
+        release = asyncio.Event()
+        
+        async def hold():
+            async with limiter:
+                await release.wait()
+        
+        holder = asyncio.ensure_future(hold())
+        waiter = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        
+        with pytest.raises(Overloaded):
+            async with limiter:
+                pass
+        
+        assert limiter.stats()["active"] == 1
+        assert limiter.stats()["waiting"] == 1
+        release.set()
+        await asyncio.gather(holder, waiter)
+        assert limiter.stats()["admitted"] == 2
+        assert limiter.stats()["rejected"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        """Test that waiting longer than the timeout is rejected."""
+        limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=5, queue_timeout=0.01)
+        
+        async with limiter:
+            with pytest.raises(Overloaded):
+                async with limiter:
+                    pass
+        
+        assert limiter.stats()["waiting"] == 0
+
+
+class TestWebAdmission:
+    """Test cases for load shedding in WebInterface."""
+    
+    @pytest.mark.asyncio
+    async def test_saturated_endpoint_returns_503(self):
+        """Test that a saturated endpoint sheds with Retry-After."""
+        config = Config(log_file=None, voice_max_concurrency=1, voice_max_queue=0, retry_after_seconds=3)
+        with patch('ai_agent.core.agent.setup_logger'):
+            agent = AIAgent(config)
+        
+        async def slow_voice_command(session_id=None):
+            await asyncio.sleep(0.05)
+            return "done"
+        agent.process_voice_command = slow_voice_command
+        
+        web = WebInterface(agent, config)
+        transport = httpx.ASGITransport(app=web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first, second = await asyncio.gather(
+                client.post("/voice_command"), client.post("/voice_command")
+            )
+            text = await client.post("/process_text", data={"text": "hello"})
+        
+        statuses = sorted([first.status_code, second.status_code])
+        rejected = first if first.status_code == 503 else second
+        assert statuses == [200, 503]
+        assert rejected.headers["retry-after"] == "3"
+        assert text.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_stream_holds_slot_until_finished(self):
+        """Test that a streamed response keeps its slot while the body is sent."""
+        config = Config(log_file=None, llm_backend="placeholder", text_max_concurrency=1, text_max_queue=0)
+        with patch('ai_agent.core.agent.setup_logger'):
+            agent = AIAgent(config)
+        
+        started = asyncio.Event()
+        release = asyncio.Event()
+        
+        async def slow_stream(text, session_id=None):
+            yield "First sentence."
+            started.set()
+            await release.wait()
+            yield "Second sentence."
+        agent.stream_text_command = slow_stream
+        
+        web = WebInterface(agent, config)
+        transport = httpx.ASGITransport(app=web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            stream = asyncio.ensure_future(client.post("/process_text_stream", data={"text": "hello"}))
+            await asyncio.wait_for(started.wait(), 5)
+            assert web.limiters["text"].stats()["active"] == 1
+            busy = await client.post("/process_text_stream", data={"text": "hello"})
+            release.set()
+            streamed = await stream
+        
+        assert "Second sentence." in streamed.text
+        assert "event: done" in streamed.text
+        assert 'event: error\ndata: {"retry_after": 2}' in busy.text
+        assert web.limiters["text"].stats()["active"] == 0
+
+
+class TestOverloaded:
+    """Test cases for the Overloaded exception."""
+    
+    def test_retry_after_header_rounds_up(self):
+        """Test that sub-second waits never advertise Retry-After: 0."""
+        assert Overloaded("test", 0.2).retry_after_header() == "1"
+        assert Overloaded("test", 0).retry_after_header() == "1"
+        assert Overloaded("test", 2.1).retry_after_header() == "3"
@@ -2,7 +2,7 @@
 
 import pytest
 import asyncio
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from ai_agent.core.agent import AIAgent
 from ai_agent.core.config import Config
@@ -34,7 +34,7 @@ class TestAIAgent:
         """Test that the agent initializes properly."""
         assert agent is not None
         assert agent.config is not None
-        assert agent.session_history == []
+        assert len(agent.session_history) == 0
         assert agent.is_listening is False
     
     @pytest.mark.asyncio
@@ -73,6 +73,157 @@ class TestAIAgent:
         assert "image" in response.lower()
         assert "web interface" in response.lower()
     
+    @pytest.mark.asyncio
+    async def test_process_text_command_matches_whole_words(self, agent):
+        """Test that keywords inside longer words do not trigger commands."""
+        response = await agent.process_text_command("Is this working sometimes?")
+        
+        assert "Hello!" not in response
+        assert "current time is" not in response
+    
+    @pytest.mark.asyncio
+    async def test_sessions_are_isolated(self, agent):
+        """Test that each session keeps its own history."""
+        await agent.process_text_command("Hello", session_id="alice")
+        await agent.process_text_command("help", session_id="bob")
+        
+        assert [h["content"] for h in agent.get_session_history("alice")] == ["Hello"]
+        assert [h["content"] for h in agent.get_session_history("bob")] == ["help"]
+        assert agent.get_session_history() == []
+    
+    @pytest.mark.asyncio
+    async def test_general_request_uses_llm_backend(self, agent):
+        """Test that unmatched commands are answered by the LLM backend."""
+        agent.llm = Mock(generate=AsyncMock(return_value="Paris."))
+        
+        response = await agent.process_text_command("Capital of France?")
+        
+        assert response == "Paris."
+        agent.llm.generate.assert_awaited_once_with("Capital of France?")
+    
+    @pytest.mark.asyncio
+    async def test_general_request_backend_failure(self, agent):
+        """Test that backend errors produce a spoken apology."""
+        agent.llm = Mock(generate=AsyncMock(side_effect=RuntimeError("down")))
+        
+        response = await agent.process_text_command("Capital of France?")
+        
+        assert "couldn't reach the AI service" in response
+    
+    @pytest.mark.asyncio
+    async def test_general_request_is_cached(self, agent):
+        """Test that rephrased repeats are served from the response cache."""
+        agent.llm = Mock(generate=AsyncMock(return_value="Paris."))
+        
+        await agent.process_text_command("What is the capital of France?")
+        response = await agent.process_text_command("Please, what is the capital of france")
+        
+        assert response == "Paris."
+        agent.llm.generate.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_time_sensitive_requests_bypass_cache(self, agent):
+        """Test that time-sensitive requests always reach the backend."""
+        agent.llm = Mock(generate=AsyncMock(return_value="Sunny."))
+        
+        await agent.process_text_command("How is the weather today?")
+        await agent.process_text_command("How is the weather today?")
+        
+        assert agent.llm.generate.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_commands_are_coalesced(self, agent):
+        """Test that identical in-flight commands share one backend call."""
+        async def slow_reply(text):
+            await asyncio.sleep(0.01)
+            return "Paris."
+        agent.llm = Mock(generate=AsyncMock(side_effect=slow_reply))
+        agent.response_cache.max_entries = 0
+        
+        responses = await asyncio.gather(
+            agent.process_text_command("Capital of France?", session_id="a"),
+            agent.process_text_command("capital of france", session_id="b"),
+        )
+        
+        assert responses == ["Paris.", "Paris."]
+        agent.llm.generate.assert_awaited_once()
+        assert len(agent.get_session_history("a")) == 1
+        assert len(agent.get_session_history("b")) == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_different_commands_are_not_coalesced(self, agent):
+        """Test that commands differing by any word get their own responses."""
+        async def slow_reply(text):
+            await asyncio.sleep(0.01)
+            return "Anything you like."
+        agent.llm = Mock(generate=AsyncMock(side_effect=slow_reply))
+        
+        help_text, general = await asyncio.gather(
+            agent.process_text_command("What can you do?"),
+            agent.process_text_command("What can I do?"),
+        )
+        
+        assert general == "Anything you like."
+        assert help_text != general
+    
+    @pytest.mark.asyncio
+    async def test_new_command_interrupts_speech(self, agent):
+        """Test that a local command cancels speech still queued or playing."""
+        agent.tts = Mock(interrupt=Mock(return_value=1))
+        
+        await agent.process_text_command("hello", barge_in=True)
+        [s async for s in agent.stream_text_command("hello", barge_in=True)]
+        
+        assert agent.tts.interrupt.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_remote_command_does_not_interrupt_speech(self, agent):
+        """Test that commands without barge-in leave local speech playing."""
+        agent.tts = Mock(interrupt=Mock(return_value=1))
+        
+        await agent.process_text_command("hello", "web-client")
+        [s async for s in agent.stream_text_command("hello", "web-client")]
+        
+        agent.tts.interrupt.assert_not_called()
+    
+    def test_microphone_is_muted_while_speaking(self, agent):
+        """Test that listening is paused only while the agent's speech plays."""
+        agent.tts = Mock(is_speaking=False)
+        assert not agent._speaking()
+        
+        agent.tts.is_speaking = True
+        assert agent._speaking()
+    
+    @pytest.mark.asyncio
+    async def test_prewarm_speech_renders_fixed_responses(self, agent):
+        """Test that the fixed responses are rendered ahead of time."""
+        agent.tts = Mock(prewarm=AsyncMock(return_value=8))
+        
+        assert await agent.prewarm_speech() == 8
+        texts = agent.tts.prewarm.await_args.args[0]
+        assert await agent.process_text_command("hello") in texts
+    
+    @pytest.mark.asyncio
+    async def test_stream_text_command_splits_sentences(self, agent):
+        """Test that streamed model output is regrouped into sentences."""
+        async def stream(text):
+            for fragment in ["Paris is", " the capital. It is", " in France."]:
+                yield fragment
+        agent.llm = Mock(stream=stream)
+        
+        sentences = [s async for s in agent.stream_text_command("Capital of France?")]
+        
+        assert sentences == ["Paris is the capital.", "It is in France."]
+        assert agent.session_history[0]["content"] == "Capital of France?"
+    
+    @pytest.mark.asyncio
+    async def test_stream_text_command_intent(self, agent):
+        """Test that fixed responses are streamed sentence by sentence."""
+        sentences = [s async for s in agent.stream_text_command("help")]
+        
+        assert sentences[0] == "I can help you with several tasks:"
+        assert len(sentences) > 3
+    
     def test_session_history_management(self, agent):
         """Test session history functionality."""
         # Initially empty
@@ -0,0 +1,87 @@
+"""Tests for precompressed static assets."""
+
+import gzip
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from ai_agent.core.agent import AIAgent
+from ai_agent.core.config import Config
+from ai_agent.web.assets import Asset, AssetStore, _accepted_encodings
+from ai_agent.web.interface import WebInterface
+
+
+BODY = b"<html>" + b"accessible page " * 200 + b"</html>"
+
+
+class TestAsset:
+    """Test cases for Asset."""
+    
+    def test_gzip_variant_round_trips(self):
+        """Test that the gzip variant is smaller and decodes to the body."""
+        asset = Asset(BODY, "text/html; charset=utf-8", "no-cache")
+        
+        assert len(asset.variants["gzip"]) < len(BODY)
+        assert gzip.decompress(asset.variants["gzip"]) == BODY
+    
+    def test_small_and_binary_files_stay_uncompressed(self):
+        """Test that compression is skipped where it cannot help."""
+        assert set(Asset(b"tiny", "text/css", "no-cache").variants) == {"identity"}
+        assert set(Asset(BODY, "image/png", "no-cache").variants) == {"identity"}
+    
+    def test_etags_differ_per_encoding(self):
+        """Test that every variant has its own strong ETag."""
+        asset = Asset(BODY, "text/html", "no-cache")
+        
+        assert len(set(asset.etags.values())) == len(asset.variants)
+        assert not any(etag.startswith("W/") for etag in asset.etags.values())
+    
+    def test_accept_encoding_respects_zero_quality(self):
+        """Test that codings refused with q=0 are not selected."""
+        assert _accepted_encodings("gzip;q=0, deflate") == {"deflate"}
+        assert Asset(BODY, "text/html", "no-cache").select("gzip;q=0") == "identity"
+
+
+class TestAssetStore:
+    """Test cases for AssetStore."""
+    
+    def test_add_directory(self, tmp_path):
+        """Test that files load with guessed types and long-lived caching."""
+        (tmp_path / "css").mkdir()
+        (tmp_path / "css" / "site.css").write_bytes(b"body { color: black; }")
+        store = AssetStore(max_age=600)
+        
+        assert store.add_directory(str(tmp_path)) == 1
+        asset = store.get("/static/css/site.css")
+        assert asset.media_type == "text/css; charset=utf-8"
+        assert asset.cache_control == "public, max-age=600"
+
+
+class TestWebAssets:
+    """Test cases for serving the home page."""
+    
+    @pytest.mark.asyncio
+    async def test_home_page_is_compressed_and_revalidated(self):
+        """Test gzip delivery, ETags and 304 Not Modified."""
+        config = Config(log_file=None)
+        with patch('ai_agent.core.agent.setup_logger'):
+            agent = AIAgent(config)
+        web = WebInterface(agent, config)
+        
+        transport = httpx.ASGITransport(app=web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            page = await client.get("/", headers={"Accept-Encoding": "gzip"})
+            cached = await client.get("/", headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": page.headers["etag"],
+            })
+            missing = await client.get("/static/missing.js")
+        
+        assert page.status_code == 200
+        assert page.headers["content-encoding"] == "gzip"
+        assert "AI Agent for Blind Users" in page.text
+        assert page.headers["vary"] == "Accept-Encoding"
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert missing.status_code == 404
@@ -0,0 +1,33 @@
+"""Tests for the benchmark suite's baseline comparison."""
+
+import pytest
+
+from benchmarks.fakes import FakeSpeechToText, FakeTextToSpeech
+from benchmarks.suite import compare, make_agent
+
+
+class TestBenchmarkSuite:
+    """Test cases for the benchmark suite."""
+    
+    def test_compare_flags_only_regressions_beyond_threshold(self):
+        """Test that median slowdowns within the threshold and new benchmarks pass."""
+        baseline = {"fast": {"p50_us": 100.0}, "slow": {"p50_us": 100.0}}
+        results = {
+            "fast": {"p50_us": 120.0, "mean_us": 400.0},
+            "slow": {"p50_us": 150.0, "mean_us": 150.0},
+            "new": {"p50_us": 1000.0},
+        }
+        
+        assert compare(results, baseline, threshold=0.25) == [("slow", 1.5)]
+    
+    @pytest.mark.asyncio
+    async def test_voice_round_trip_uses_fakes(self):
+        """Test that the fake speech components drive the voice path."""
+        agent = make_agent(["hello"])
+        
+        response = await agent.process_voice_command()
+        
+        assert isinstance(agent.stt, FakeSpeechToText)
+        assert isinstance(agent.tts, FakeTextToSpeech)
+        assert agent.tts.spoken == [response]
+        await agent.aclose()
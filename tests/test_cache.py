@@ -0,0 +1,67 @@
+"""Test the response cache."""
+
+from unittest.mock import patch
+
+from ai_agent.core.cache import ResponseCache
+from ai_agent.utils.text import normalize_text
+
+
+class TestNormalizeText:
+    """Test cases for normalize_text."""
+    
+    def test_folds_rephrasings(self):
+        """Test that case, punctuation, spacing and filler words fold away."""
+        assert normalize_text("Um, please, the capital of France?") == "capital of france"
+        assert normalize_text("  CAPITAL of   france!! ") == "capital of france"
+    
+    def test_keeps_pronouns_and_modals(self):
+        """Test that questions differing only in who does what get distinct keys."""
+        assert normalize_text("Do you love me?") != normalize_text("Do I love you?")
+        assert normalize_text("What can you do?") != normalize_text("What can I do?")
+        assert normalize_text("Will it rain?") != normalize_text("Is it rain?")
+
+
+class TestResponseCache:
+    """Test cases for the ResponseCache class."""
+    
+    def test_hit_and_miss(self):
+        """Test lookups by normalized key."""
+        cache = ResponseCache()
+        key = cache.key("What is the capital of France?")
+        
+        assert cache.get(key) is None
+        cache.set(key, "Paris.")
+        assert cache.get(cache.key("what is capital of france")) == "Paris."
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+    
+    def test_bypass_words(self):
+        """Test that time-sensitive text is not cached."""
+        cache = ResponseCache(bypass_words={"today"})
+        
+        assert cache.key("What is the news today?") is None
+        assert cache.key("?!") is None
+        assert cache.stats()["bypasses"] == 2
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.stats()["evictions"] == 1
+    
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        cache = ResponseCache(ttl=10)
+        with patch("ai_agent.core.cache.time.monotonic", return_value=100.0):
+            cache.set("a", "1")
+        with patch("ai_agent.core.cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+        
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
@@ -0,0 +1,67 @@
+"""Test the command-line interface."""
+
+import asyncio
+import signal
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from ai_agent.cli import cli
+from ai_agent.core.agent import AIAgent
+
+
+@pytest.fixture
+def headless_env(monkeypatch):
+    """Environment for an agent without audio devices, model or log file."""
+    monkeypatch.setenv("HEADLESS", "true")
+    monkeypatch.setenv("LLM_BACKEND", "placeholder")
+    monkeypatch.setenv("LOG_FILE", "")
+    # No pause between voice commands
+    monkeypatch.setenv("CONTINUOUS_LISTENING", "true")
+
+
+def interrupted_after_one_command():
+    """process_voice_command that answers once, then gets Ctrl+C."""
+    calls = []
+    
+    async def process_voice_command(self, session_id=None):
+        calls.append(session_id)
+        if len(calls) > 1:
+            signal.raise_signal(signal.SIGINT)
+            await asyncio.sleep(5)
+        return "hello"
+    
+    return process_voice_command
+
+
+class TestVoiceCommand:
+    """Test cases for the voice command."""
+    
+    def test_ctrl_c_prints_metrics_and_closes_agent(self, headless_env):
+        """Test that the summary is printed and the agent closed after Ctrl+C."""
+        closed = []
+        
+        async def aclose(self):
+            closed.append(True)
+        
+        with patch.object(AIAgent, "process_voice_command", interrupted_after_one_command()), \
+             patch.object(AIAgent, "aclose", aclose):
+            result = CliRunner().invoke(cli, ["--debug", "voice"])
+        
+        assert result.exit_code == 0, result.output
+        assert "Agent response: hello" in result.output
+        assert "Latency summary:" in result.output
+        assert "Voice mode ended." in result.output
+        assert closed == [True]
+    
+    def test_ctrl_c_writes_profile(self, headless_env, tmp_path):
+        """Test that --profile saves the slowest voice round trip after Ctrl+C."""
+        path = tmp_path / "voice.folded"
+        
+        with patch.object(AIAgent, "process_voice_command", interrupted_after_one_command()):
+            result = CliRunner().invoke(cli, ["--profile", str(path), "voice"])
+        
+        assert result.exit_code == 0, result.output
+        assert path.exists()
+        assert f"written to {path}" in result.output
@@ -0,0 +1,110 @@
+"""Tests for the speech clip cache and the /speech endpoint."""
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from ai_agent.core.agent import AIAgent
+from ai_agent.core.config import Config
+from ai_agent.speech.clip_cache import ClipCache, clip_key, clip_media_type
+from ai_agent.web.interface import WebInterface
+
+
+CLIP = b"RIFF" + bytes(range(256)) * 4
+
+
+class TestClipCache:
+    """Test cases for ClipCache."""
+    
+    def test_key_depends_on_voice_and_rate(self):
+        """Test that clips of the same text with other settings do not collide."""
+        assert clip_key("hi", "voice-a", 180) == clip_key("hi", "voice-a", 180)
+        assert clip_key("hi", "voice-a", 180) != clip_key("hi", "voice-b", 180)
+        assert clip_key("hi", "voice-a", 180) != clip_key("hi", "voice-a", 150)
+    
+    def test_memory_tier_is_bounded_in_bytes(self):
+        """Test least recently used eviction from memory."""
+        cache = ClipCache(max_bytes=25)
+        cache.put("a", b"a" * 10)
+        cache.put("b", b"b" * 10)
+        cache.get("a")
+        cache.put("c", b"c" * 10)
+        
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.load("b") is None
+        assert cache.stats()["bytes"] == 20
+    
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Test that clips are reloaded from disk and promoted to memory."""
+        ClipCache(1024, str(tmp_path), 1024).put("key", CLIP[:100])
+        cache = ClipCache(1024, str(tmp_path), 1024)
+        
+        assert cache.get("key") is None
+        assert cache.load("key") == CLIP[:100]
+        assert cache.get("key") == CLIP[:100]
+        assert cache.stats()["disk_hits"] == 1
+    
+    def test_disk_tier_evicts_oldest_files(self, tmp_path):
+        """Test that the disk tier stays within its byte budget."""
+        cache = ClipCache(0, str(tmp_path), 250)
+        for key in ("a", "b", "c"):
+            cache.put(key, b"x" * 100)
+        
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["b.clip", "c.clip"]
+        assert cache.load("a") is None
+        assert cache.stats()["disk_bytes"] == 200
+    
+    def test_media_type_from_header(self):
+        """Test that the audio format is detected from the clip."""
+        assert clip_media_type(CLIP) == "audio/wav"
+        assert clip_media_type(b"FORM....AIFF") == "audio/aiff"
+
+
+class TestSpeechEndpoint:
+    """Test cases for the /speech endpoint."""
+    
+    def make_web(self):
+        """Create a headless web interface."""
+        config = Config(log_file=None, headless=True, speech_max_chars=50)
+        with patch('ai_agent.core.agent.setup_logger'):
+            agent = AIAgent(config)
+        web = WebInterface(agent, config)
+        return web, httpx.ASGITransport(app=web.app)
+    
+    @pytest.mark.asyncio
+    async def test_serves_clip_with_etag_and_ranges(self):
+        """Test full, revalidated and partial responses."""
+        web, transport = self.make_web()
+        web.agent.synthesize_speech = AsyncMock(return_value=CLIP)
+        
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            full = await client.get("/speech", params={"text": "Hello"})
+            cached = await client.get(
+                "/speech", params={"text": "Hello"}, headers={"If-None-Match": full.headers["etag"]}
+            )
+            partial = await client.get("/speech", params={"text": "Hello"}, headers={"Range": "bytes=0-1"})
+            suffix = await client.get("/speech", params={"text": "Hello"}, headers={"Range": "bytes=-4"})
+            too_long = await client.get("/speech", params={"text": "x" * 51})
+        
+        assert full.status_code == 200
+        assert full.headers["content-type"] == "audio/wav"
+        assert full.content == CLIP
+        assert cached.status_code == 304
+        assert partial.status_code == 206
+        assert partial.content == b"RI"
+        assert partial.headers["content-range"] == f"bytes 0-1/{len(CLIP)}"
+        assert suffix.content == CLIP[-4:]
+        assert too_long.status_code == 422
+    
+    @pytest.mark.asyncio
+    async def test_headless_server_has_no_speech(self):
+        """Test that clients are told to fall back to their own voice."""
+        web, transport = self.make_web()
+        
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/speech", params={"text": "Hello"})
+        
+        assert response.status_code == 503
+        assert response.json()["success"] is False
@@ -0,0 +1,114 @@
+"""Test durable history storage and pagination."""
+
+import threading
+
+import pytest
+from unittest.mock import patch
+
+from ai_agent.core.agent import AIAgent
+from ai_agent.core.config import Config
+from ai_agent.core.history_store import HistoryStore
+from ai_agent.core.session import USER_INPUT, HistoryRecord
+
+
+class TestHistoryStore:
+    """Test cases for the HistoryStore class."""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create a store backed by a temporary database."""
+        store = HistoryStore(str(tmp_path / "history.db"))
+        yield store
+        store.close()
+    
+    def test_append_and_page(self, store):
+        """Test that records are readable in pages after flushing."""
+        records = [HistoryRecord(USER_INPUT, f"message {i}") for i in range(5)]
+        for record in records:
+            store.append("alice", record)
+        store.flush()
+        
+        first = store.page("alice", None, 2)
+        second = store.page("alice", first[-1].id, 10)
+        
+        assert [r.content for r in first] == ["message 0", "message 1"]
+        assert [r.content for r in second] == ["message 2", "message 3", "message 4"]
+        assert store.page("bob", None, 10) == []
+    
+    def test_clear(self, store):
+        """Test that clearing removes only that session's records."""
+        store.append("alice", HistoryRecord(USER_INPUT, "a"))
+        store.append("bob", HistoryRecord(USER_INPUT, "b"))
+        store.clear("alice")
+        store.flush()
+        
+        assert store.page("alice", None, 10) == []
+        assert len(store.page("bob", None, 10)) == 1
+    
+    def test_writer_thread_creates_schema(self, store):
+        """Test that the first append leaves all database work to the writer."""
+        connect = store._connect
+        threads = []
+        
+        def record_thread():
+            threads.append(threading.current_thread().name)
+            return connect()
+        
+        with patch.object(store, "_connect", side_effect=record_thread):
+            store.append("alice", HistoryRecord(USER_INPUT, "hello"))
+            pages = store.page("alice", None, 10)
+        
+        # page() waited for the writer's schema before opening its reader
+        assert threads[0] == "history-writer"
+        assert pages == [] or [r.content for r in pages] == ["hello"]
+    
+    def test_survives_reopen(self, tmp_path):
+        """Test that records persist across store instances."""
+        path = str(tmp_path / "history.db")
+        store = HistoryStore(path)
+        store.append("alice", HistoryRecord(USER_INPUT, "remember me"))
+        store.close()
+        
+        reopened = HistoryStore(path)
+        assert [r.content for r in reopened.page("alice", None, 10)] == ["remember me"]
+
+
+class TestHistoryPagination:
+    """Test cases for AIAgent.get_history_page."""
+    
+    def make_agent(self, **kwargs):
+        """Create an agent with patched components."""
+        with patch('ai_agent.core.agent.setup_logger'):
+            return AIAgent(Config(log_file=None, **kwargs))
+    
+    @pytest.mark.asyncio
+    async def test_pages_from_memory(self):
+        """Test cursor pagination without a store."""
+        agent = self.make_agent()
+        for i in range(3):
+            await agent.process_text_command(f"message {i}", session_id="alice")
+        
+        page, cursor = await agent.get_history_page("alice", limit=2)
+        rest, end = await agent.get_history_page("alice", cursor=cursor, limit=2)
+        
+        assert [h["content"] for h in page] == ["message 0", "message 1"]
+        assert [h["content"] for h in rest] == ["message 2"]
+        assert end is None
+    
+    @pytest.mark.asyncio
+    async def test_pages_from_store_after_restart(self, tmp_path):
+        """Test that history survives a restart and merges unflushed entries."""
+        db = str(tmp_path / "history.db")
+        agent = self.make_agent(history_db=db, session_history_size=2)
+        for i in range(4):
+            await agent.process_text_command(f"message {i}", session_id="alice")
+        agent.close()
+        
+        restarted = self.make_agent(history_db=db)
+        await restarted.process_text_command("message 4", session_id="alice")
+        
+        page, cursor = await restarted.get_history_page("alice", limit=10)
+        
+        assert [h["content"] for h in page] == [f"message {i}" for i in range(5)]
+        assert cursor is None
+        restarted.close()
@@ -0,0 +1,65 @@
+"""Test the image analyzer."""
+
+import asyncio
+import io
+
+import pytest
+from PIL import Image
+
+from ai_agent.core.config import Config
+from ai_agent.vision.image_analyzer import ImageAnalyzer
+
+
+def make_png(width, height, color="red"):
+    """Encode a solid-color PNG."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class TestImageAnalyzer:
+    """Test cases for the ImageAnalyzer class."""
+    
+    @pytest.fixture
+    def analyzer(self):
+        """Create an analyzer."""
+        return ImageAnalyzer(Config(log_file=None))
+    
+    @pytest.mark.asyncio
+    async def test_describe_image_file(self, analyzer, tmp_path):
+        """Test describing an image on disk."""
+        path = tmp_path / "wide.png"
+        path.write_bytes(make_png(300, 100))
+        
+        description = await analyzer.describe_image(str(path))
+        
+        assert "300 by 100 pixels" in description
+        assert "landscape" in description
+    
+    @pytest.mark.asyncio
+    async def test_invalid_data(self, analyzer):
+        """Test that undecodable bytes produce a load error."""
+        description = await analyzer.describe_image_data(b"not an image")
+        
+        assert "Could not load the image" in description
+    
+    @pytest.mark.asyncio
+    async def test_identical_images_are_coalesced(self, analyzer):
+        """Test that concurrent analyses of the same image run once."""
+        data = make_png(50, 50)
+        loads = []
+        original = analyzer._load_image
+        
+        async def counting_load(image_data):
+            loads.append(image_data)
+            await asyncio.sleep(0.01)
+            return await original(image_data)
+        
+        analyzer._load_image = counting_load
+        results = await asyncio.gather(
+            *(analyzer.describe_image_data(data) for _ in range(4)),
+            analyzer.describe_image_data(make_png(50, 50, "blue")),
+        )
+        
+        assert len(set(results[:4])) == 1
+        assert len(loads) == 2
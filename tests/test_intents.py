@@ -0,0 +1,51 @@
+"""Test the compiled intent router."""
+
+import pytest
+
+from ai_agent.core.intents import IntentRouter, tokenize
+
+
+class TestIntentRouter:
+    """Test cases for the IntentRouter class."""
+    
+    @pytest.fixture
+    def router(self):
+        """Create a router with a few intents."""
+        router = IntentRouter()
+        router.register("image", ["describe", "image"], handler=lambda text: "image")
+        router.register("time", ["time", "clock"], handler=lambda text: "time")
+        router.register("help", ["help", "what can you do"], handler=lambda text: "help")
+        router.register("greeting", ["hello", "hi"], handler=lambda text: "greeting")
+        return router
+    
+    def test_tokenize(self):
+        """Test that tokens are lowercase whole words."""
+        assert tokenize("What's the TIME, please?") == ["what's", "the", "time", "please"]
+    
+    def test_whole_word_matching(self, router):
+        """Test that keywords do not match inside other words."""
+        assert router.match("this is it") is None
+        assert router.match("sometimes it rains") is None
+        assert router.match("hi there").name == "greeting"
+    
+    def test_phrase_matching(self, router):
+        """Test that multi-word keywords match as consecutive phrases."""
+        assert router.match("So, what can you do?").name == "help"
+        assert router.match("what you can do") is None
+    
+    def test_registration_order_wins(self, router):
+        """Test that the earliest registered intent takes precedence."""
+        assert router.match("hello, what time is it").name == "time"
+        assert router.match("describe the clock").name == "image"
+    
+    def test_register_after_compile(self, router):
+        """Test that new intents are picked up after compiling."""
+        router.compile()
+        router.register("weather", ["weather"], handler=lambda text: "weather")
+        assert router.match("how is the weather").name == "weather"
+        assert len(router) == 5
+    
+    def test_empty_keyword_rejected(self, router):
+        """Test that keywords without words are rejected."""
+        with pytest.raises(ValueError):
+            router.register("broken", ["?!"], handler=lambda text: "")
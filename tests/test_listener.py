@@ -0,0 +1,175 @@
+"""Test continuous listening from recorded audio."""
+
+import asyncio
+import threading
+import time
+import wave
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from ai_agent.core.config import Config
+from ai_agent.speech.listener import ContinuousListener, WavSource
+from ai_agent.speech.stt import SpeechToText
+
+
+RATE = 16000
+
+
+def write_wav(path, seconds_of_speech: float, channels: int = 1) -> str:
+    """Write a WAV file with a tone between short silences."""
+    n = np.arange(int(RATE * seconds_of_speech))
+    speech = (3000 * np.sin(2 * np.pi * 200 * n / RATE)).astype(np.int16)
+    pad = np.zeros(int(RATE * 0.2), dtype=np.int16)
+    samples = np.concatenate([pad, speech, pad])
+    with wave.open(str(path), "wb") as output:
+        output.setnchannels(channels)
+        output.setsampwidth(2)
+        output.setframerate(RATE)
+        output.writeframes(np.repeat(samples, channels).tobytes())
+    return str(path)
+
+
+class TestContinuousListener:
+    """Test cases for the ContinuousListener class."""
+
+    @pytest.mark.asyncio
+    async def test_emits_each_file_as_an_utterance(self, tmp_path):
+        """Test that utterances are queued in order, then the stream ends."""
+        paths = [write_wav(tmp_path / f"{n}.wav", seconds) for n, seconds in enumerate((0.5, 1.5))]
+        listener = ContinuousListener(WavSource(paths))
+        listener.start()
+
+        first = await listener.get(timeout=5)
+        second = await listener.get(timeout=5)
+        end = await listener.get(timeout=5)
+        listener.close()
+
+        # Speech plus at most the pre-roll before and the tail after it
+        assert 0.5 <= first.duration <= 1.1
+        assert 1.5 <= second.duration <= 2.1
+        assert end is None and listener.finished
+        assert await listener.get(timeout=1) is None
+
+    @pytest.mark.asyncio
+    async def test_drops_oldest_when_full(self, tmp_path):
+        """Test that a slow consumer loses the oldest utterances, not the newest."""
+        paths = [write_wav(tmp_path / f"{n}.wav", 0.3 + 0.3 * n) for n in range(4)]
+        listener = ContinuousListener(WavSource(paths), max_queue=2)
+        listener.start()
+        while listener.running:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+
+        segments = [await listener.get(timeout=1) for _ in range(2)]
+
+        assert listener.dropped == 2
+        assert segments[0].duration > 0.8
+        assert segments[1].duration > segments[0].duration
+
+    @pytest.mark.asyncio
+    async def test_ignores_audio_while_muted(self, tmp_path):
+        """Test that speech heard while muted is dropped, even if it began before."""
+        # Silence to calibrate on, the agent speaking, then the user
+        paths = [write_wav(tmp_path / f"{n}.wav", seconds) for n, seconds in enumerate((0, 1.5, 1.0))]
+        reads = []
+
+        def muted():
+            # From mid-way through the agent's tone to the end of its file
+            reads.append(None)
+            return 15 <= len(reads) <= 39
+
+        listener = ContinuousListener(WavSource(paths), muted=muted, echo_tail_seconds=0)
+        listener.start()
+
+        heard = await listener.get(timeout=5)
+        end = await listener.get(timeout=5)
+        listener.close()
+
+        assert 1.0 <= heard.duration <= 1.7
+        assert end is None
+        assert listener.suppressed == 1
+
+    def test_rejects_stereo(self, tmp_path):
+        """Test that unsupported recordings are refused up front."""
+        with pytest.raises(ValueError, match="16-bit mono"):
+            WavSource([write_wav(tmp_path / "stereo.wav", 0.5, channels=2)])
+
+
+class TestSpeechToTextContinuous:
+    """Test cases for continuous listening in SpeechToText."""
+
+    @pytest.mark.asyncio
+    async def test_transcribes_queued_utterances(self, tmp_path):
+        """Test that every utterance is transcribed without reopening the source."""
+        paths = [write_wav(tmp_path / f"{n}.wav", 0.5 + n) for n in range(2)]
+        stt = SpeechToText(
+            Config(continuous_listening=True, log_file=None, audio_timeout=5),
+            source=WavSource(paths),
+        )
+
+        async def transcribe(audio):
+            return f"{len(audio.get_raw_data()) / (2 * RATE):.0f} seconds"
+
+        with patch.object(stt, "_transcribe", side_effect=transcribe):
+            heard = [await stt.listen_and_transcribe() for _ in range(3)]
+        stt.close()
+
+        assert heard == ["1 seconds", "2 seconds", None]
+        assert stt.microphone is None
+
+
+class TestCalibration:
+    """Test cases for ambient-noise calibration."""
+
+    def test_calibration_does_not_block_startup(self):
+        """Test that construction returns while calibration runs, and listening waits for it."""
+        calibrating = threading.Event()
+        release = threading.Event()
+
+        def adjust(recognizer, source, duration=1):
+            calibrating.set()
+            release.wait(5)
+            recognizer.energy_threshold = 1234
+
+        def listen(recognizer, source, timeout=None, phrase_time_limit=None):
+            return recognizer.energy_threshold
+
+        with patch("ai_agent.speech.stt.sr.Microphone", MagicMock()), \
+             patch("ai_agent.speech.stt.sr.Recognizer.adjust_for_ambient_noise", adjust), \
+             patch("ai_agent.speech.stt.sr.Recognizer.listen", listen):
+            start = time.perf_counter()
+            stt = SpeechToText(Config(log_file=None))
+            elapsed = time.perf_counter() - start
+            assert calibrating.wait(5)
+
+            heard = []
+            listening = threading.Thread(target=lambda: heard.append(stt._listen_sync()))
+            listening.start()
+            time.sleep(0.1)
+            assert heard == []
+            release.set()
+            listening.join(5)
+
+        assert elapsed < 0.5
+        assert heard == [1234]
+        assert stt.energy_threshold() == 1234
+
+    @pytest.mark.asyncio
+    async def test_continuous_threshold_follows_the_room(self, tmp_path):
+        """Test that continuous listening reports the detector's adapted threshold."""
+        path = tmp_path / "room.wav"
+        n = np.arange(RATE * 2)
+        hum = (400 * np.sin(2 * np.pi * 100 * n / RATE)).astype(np.int16)
+        with wave.open(str(path), "wb") as output:
+            output.setnchannels(1)
+            output.setsampwidth(2)
+            output.setframerate(RATE)
+            output.writeframes(hum.tobytes())
+        stt = SpeechToText(Config(continuous_listening=True, log_file=None), source=WavSource([str(path)], gap_seconds=0))
+
+        assert await stt.listen_and_transcribe() is None
+        stt.close()
+
+        assert stt.energy_threshold() == pytest.approx(400 / np.sqrt(2) * 1.5, rel=0.05)
@@ -0,0 +1,127 @@
+"""Test the language model backends."""
+
+import httpx
+import pytest
+
+from ai_agent.core.config import Config
+from ai_agent.llm.backends import (
+    AnthropicBackend,
+    OpenAIBackend,
+    PlaceholderBackend,
+    create_backend,
+)
+from ai_agent.llm.stub_server import create_stub_app
+
+
+class TestCreateBackend:
+    """Test cases for backend selection."""
+    
+    def test_placeholder_without_keys(self):
+        """Test that the placeholder is used when nothing is configured."""
+        assert isinstance(create_backend(Config()), PlaceholderBackend)
+    
+    def test_selects_by_api_key(self):
+        """Test that the configured API key picks the backend."""
+        assert isinstance(create_backend(Config(openai_api_key="sk")), OpenAIBackend)
+        assert isinstance(create_backend(Config(anthropic_api_key="sk")), AnthropicBackend)
+    
+    def test_base_url_selects_openai_compatible(self):
+        """Test that a base URL alone selects the OpenAI-compatible backend."""
+        backend = create_backend(Config(llm_base_url="http://127.0.0.1:8081/v1/"))
+        
+        assert isinstance(backend, OpenAIBackend)
+        assert backend.base_url == "http://127.0.0.1:8081/v1"
+    
+    def test_unknown_backend(self):
+        """Test that an unknown backend name is rejected."""
+        with pytest.raises(ValueError):
+            create_backend(Config(llm_backend="nope"))
+
+
+class TestHTTPBackend:
+    """Test cases for the pooled HTTP backends."""
+    
+    @pytest.mark.asyncio
+    async def test_openai_against_stub_server(self):
+        """Test a round trip through the local stub server."""
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=create_stub_app()),
+            base_url="http://stub/v1",
+        )
+        backend = OpenAIBackend(Config(), client=client)
+        
+        assert await backend.generate("hello") == "This is a stub reply to: hello"
+        await backend.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_anthropic_against_stub_server(self):
+        """Test the Anthropic message format against the stub server."""
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=create_stub_app()),
+            base_url="http://stub/v1",
+        )
+        backend = AnthropicBackend(Config(), api_key="key", client=client)
+        
+        assert await backend.generate("hi") == "This is a stub reply to: hi"
+        await backend.aclose()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend_class", [OpenAIBackend, AnthropicBackend])
+    async def test_stream_against_stub_server(self, backend_class):
+        """Test that streamed fragments reassemble into the full reply."""
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=create_stub_app()),
+            base_url="http://stub/v1",
+        )
+        backend = backend_class(Config(), client=client)
+        
+        fragments = [fragment async for fragment in backend.stream("hello there")]
+        
+        assert len(fragments) > 1
+        assert "".join(fragments) == "This is a stub reply to: hello there"
+        await backend.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_placeholder_stream_yields_whole_reply(self):
+        """Test the default stream implementation."""
+        fragments = [fragment async for fragment in PlaceholderBackend().stream("hi")]
+        
+        assert len(fragments) == 1
+    
+    @pytest.mark.asyncio
+    async def test_retries_transient_failures(self):
+        """Test that retryable statuses and transport errors are retried."""
+        calls = []
+        
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(503)
+            if len(calls) == 2:
+                raise httpx.ConnectError("refused")
+            return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://x")
+        backend = OpenAIBackend(Config(llm_max_retries=2), client=client, retry_base_delay=0.001)
+        
+        assert await backend.generate("hi") == "ok"
+        assert len(calls) == 3
+    
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """Test that the last failure is raised once retries run out."""
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(503)),
+            base_url="http://x",
+        )
+        backend = OpenAIBackend(Config(llm_max_retries=1), client=client, retry_base_delay=0.001)
+        
+        with pytest.raises(httpx.HTTPStatusError):
+            await backend.generate("hi")
+    
+    def test_backoff_is_capped_and_honors_retry_after(self):
+        """Test the jittered backoff bounds."""
+        backend = OpenAIBackend(Config(), retry_base_delay=1.0, retry_max_delay=2.0)
+        
+        assert all(0 <= backend._backoff(10) <= 2.0 for _ in range(50))
+        assert backend._backoff(0, retry_after="1.5") == 1.5
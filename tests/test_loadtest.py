@@ -0,0 +1,97 @@
+"""Tests for the HTTP load generator."""
+
+import io
+from unittest.mock import patch
+
+import httpx
+import pytest
+from PIL import Image
+
+from ai_agent.core.agent import AIAgent
+from ai_agent.core.config import Config
+from ai_agent.loadtest import LoadTest, local_server, make_png, parse_mix, percentile
+from ai_agent.web.interface import WebInterface
+
+
+class TestLoadTestHelpers:
+    """Test cases for mix parsing and statistics."""
+    
+    def test_parse_mix(self):
+        """Test weights, defaults and unknown kinds."""
+        assert parse_mix("text=8, history=1,image") == {"text": 8.0, "history": 1.0, "image": 1.0}
+        with pytest.raises(ValueError):
+            parse_mix("text=1,upload=2")
+        with pytest.raises(ValueError):
+            parse_mix("text=0")
+    
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles."""
+        values = [float(n) for n in range(1, 101)]
+        
+        assert percentile(values, 0.5) == 50.0
+        assert percentile(values, 0.99) == 99.0
+        assert percentile(values, 1.0) == 100.0
+        assert percentile([], 0.5) == 0.0
+    
+    def test_generated_png_is_valid(self):
+        """Test that the built-in upload decodes as an image."""
+        image = Image.open(io.BytesIO(make_png(8, 4)))
+        
+        assert image.size == (8, 4)
+
+
+class TestLoadTest:
+    """Test cases for running a load test."""
+    
+    @pytest.mark.asyncio
+    async def test_closed_loop_reports_every_endpoint(self):
+        """Test a short run against the app through the ASGI transport."""
+        config = Config(log_file=None, headless=True, llm_backend="placeholder")
+        with patch('ai_agent.core.agent.setup_logger'):
+            agent = AIAgent(config)
+        web = WebInterface(agent, config)
+        
+        test = LoadTest(
+            "http://test",
+            parse_mix("text=2,history=1,image=1"),
+            duration=0.3,
+            concurrency=4,
+            seed=1,
+            transport=httpx.ASGITransport(app=web.app),
+        )
+        report = await test.run()
+        
+        assert set(report["endpoints"]) == {"text", "history", "image"}
+        total = report["total"]
+        assert total["requests"] > 0
+        assert total["errors"] == 0
+        assert total["p50_ms"] <= total["p99_ms"] <= total["max_ms"]
+    
+    @pytest.mark.asyncio
+    async def test_open_loop_counts_errors(self):
+        """Test the fixed-rate mode and error accounting against a failing server."""
+        def handler(request):
+            return httpx.Response(503 if request.url.path == "/history" else 200)
+        
+        test = LoadTest(
+            "http://test",
+            parse_mix("text=1,history=1"),
+            duration=0.2,
+            rate=100,
+            seed=3,
+            transport=httpx.MockTransport(handler),
+        )
+        report = await test.run()
+        
+        assert 15 <= report["total"]["requests"] <= 20
+        assert report["endpoints"]["history"]["error_rate"] == 1.0
+        assert report["endpoints"]["text"]["errors"] == 0
+        assert report["total"]["statuses"].keys() <= {"200", "503"}
+    
+    def test_local_server_serves_http(self):
+        """Test that the CI helper starts a real server and stops it."""
+        config = Config(log_file=None, headless=True, llm_backend="placeholder")
+        with local_server(config) as base_url:
+            response = httpx.get(f"{base_url}/health")
+        
+        assert response.json()["status"] == "healthy"
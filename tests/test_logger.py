@@ -0,0 +1,79 @@
+"""Tests for logging utilities."""
+
+import json
+import logging
+import logging.handlers
+
+import pytest
+
+from ai_agent.utils.logger import JsonFormatter, RateLimitFilter, setup_logger, shutdown_logging
+
+
+def make_record(msg, *args, level=logging.WARNING):
+    """Build a log record from the test logger."""
+    return logging.LogRecord("ai_agent.test", level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def fresh_logger():
+    """Give setup_logger an unconfigured ai_agent logger and restore it afterwards."""
+    logger = logging.getLogger("ai_agent")
+    saved = logger.handlers[:]
+    logger.handlers.clear()
+    yield logger
+    shutdown_logging()
+    logger.handlers[:] = saved
+
+
+class TestRateLimitFilter:
+    """Test cases for RateLimitFilter."""
+    
+    def test_repeats_are_sampled_per_template(self):
+        """Test that one template is capped while others pass."""
+        limiter = RateLimitFilter(burst=2, interval=60)
+        
+        kept = [limiter.filter(make_record("Retrying %s", n)) for n in range(5)]
+        
+        assert kept == [True, True, False, False, False]
+        assert limiter.filter(make_record("Something else"))
+        assert limiter.filter(make_record("Retrying %s", 6, level=logging.ERROR))
+        assert limiter.suppressed_total == 3
+    
+    def test_next_window_reports_suppressed_count(self):
+        """Test that the first record after a window notes what was dropped."""
+        limiter = RateLimitFilter(burst=1, interval=60)
+        limiter.filter(make_record("Busy"))
+        limiter.filter(make_record("Busy"))
+        limiter.interval = 0
+        
+        record = make_record("Busy")
+        assert limiter.filter(record)
+        assert record.suppressed == 1
+        assert "1 similar messages suppressed" in record.getMessage()
+
+
+class TestSetupLogger:
+    """Test cases for setup_logger."""
+    
+    def test_json_formatter(self):
+        """Test that records serialize with lazily merged arguments."""
+        entry = json.loads(JsonFormatter().format(make_record("Heard: %s", "hello")))
+        
+        assert entry["message"] == "Heard: hello"
+        assert entry["level"] == "WARNING"
+        assert entry["logger"] == "ai_agent.test"
+    
+    def test_records_go_through_queue_to_rotating_file(self, fresh_logger, tmp_path):
+        """Test that the caller only enqueues and the listener writes the file."""
+        log_file = tmp_path / "agent.log"
+        logger = setup_logger(str(log_file), json_format=True, max_bytes=1024)
+        
+        handlers = logger.handlers
+        assert len(handlers) == 1
+        assert isinstance(handlers[0], logging.handlers.QueueHandler)
+        
+        logging.getLogger("ai_agent.test").info("Transcribed text: %s", "hello")
+        shutdown_logging()
+        
+        entry = json.loads(log_file.read_text().splitlines()[-1])
+        assert entry["message"] == "Transcribed text: hello"
@@ -0,0 +1,101 @@
+"""Tests for latency metrics."""
+
+import threading
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from ai_agent.core.agent import AIAgent
+from ai_agent.core.config import Config
+from ai_agent.utils.metrics import STAGE_METRIC, Histogram, InstrumentedExecutor, MetricsRegistry
+from ai_agent.web.interface import WebInterface
+
+
+class TestHistogram:
+    """Test cases for Histogram."""
+    
+    def test_observations_land_in_buckets(self):
+        """Test bucket counts, sum and quantile estimates."""
+        histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+        for value in (0.005, 0.05, 0.05, 0.5, 5.0):
+            histogram.observe(value)
+        
+        assert histogram.counts == [1, 2, 1, 1]
+        assert histogram.count == 5
+        assert histogram.sum == pytest.approx(5.605)
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(1.0) == float("inf")
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry."""
+    
+    def test_time_records_stage_even_on_error(self):
+        """Test that a failing stage is still timed."""
+        registry = MetricsRegistry()
+        
+        with pytest.raises(ValueError):
+            with registry.time("stt_transcribe", engine="google"):
+                raise ValueError("no network")
+        
+        assert registry.histogram(STAGE_METRIC, stage="stt_transcribe", engine="google").count == 1
+    
+    def test_render_prometheus_text(self):
+        """Test cumulative buckets, gauges and label formatting."""
+        registry = MetricsRegistry()
+        registry.observe("request_seconds", 0.02, endpoint="/process_text")
+        registry.gauge("queue_depth", lambda: 3, "Queued items", queue="history")
+        
+        text = registry.render()
+        
+        assert "# TYPE queue_depth gauge" in text
+        assert 'queue_depth{queue="history"} 3' in text
+        assert 'request_seconds_bucket{endpoint="/process_text",le="0.01"} 0' in text
+        assert 'request_seconds_bucket{endpoint="/process_text",le="0.025"} 1' in text
+        assert 'request_seconds_bucket{endpoint="/process_text",le="+Inf"} 1' in text
+        assert 'request_seconds_count{endpoint="/process_text"} 1' in text
+    
+    def test_executor_reports_busy_threads(self):
+        """Test that the instrumented executor exposes utilization."""
+        registry = MetricsRegistry()
+        executor = InstrumentedExecutor(2, "test", registry=registry)
+        started, release = threading.Event(), threading.Event()
+        
+        def work():
+            started.set()
+            release.wait()
+        
+        future = executor.submit(work)
+        started.wait()
+        rendered = registry.render()
+        release.set()
+        future.result()
+        executor.shutdown()
+        
+        assert 'ai_agent_executor_busy_threads{executor="test"} 1' in rendered
+        assert 'ai_agent_executor_utilization{executor="test"} 0.5' in rendered
+        assert executor.busy == 0
+
+
+class TestMetricsEndpoint:
+    """Test cases for the /metrics route."""
+    
+    @pytest.mark.asyncio
+    async def test_metrics_route_reports_stages_and_endpoints(self):
+        """Test that a text request shows up per stage and per endpoint."""
+        config = Config(log_file=None)
+        with patch('ai_agent.core.agent.setup_logger'):
+            agent = AIAgent(config)
+        web = WebInterface(agent, config)
+        
+        transport = httpx.ASGITransport(app=web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.post("/process_text", data={"text": "hello"})
+            response = await client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'ai_agent_stage_seconds_count{stage="route"}' in response.text
+        assert 'endpoint="/process_text",method="POST",status="200"' in response.text
+        assert 'ai_agent_admission_active{endpoint="text"} 0' in response.text
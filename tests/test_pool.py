@@ -0,0 +1,107 @@
+"""Test the multi-process synthesis pool."""
+
+import asyncio
+import io
+import os
+import time
+import wave
+
+import pytest
+
+from ai_agent.core.config import Config
+from ai_agent.speech.pool import MAX_RESTARTS, SynthesisPool
+from ai_agent.speech.tts import TextToSpeech
+from benchmarks.fakes import fake_synthesis_engine
+
+
+def broken_engine():
+    """Engine factory that fails in the worker process."""
+    raise RuntimeError("no audio device")
+
+
+class CrashingEngine:
+    """Engine whose process dies as soon as it renders."""
+    
+    def setProperty(self, name, value):
+        pass
+    
+    def save_to_file(self, text, path):
+        os._exit(1)
+
+
+def crashing_engine():
+    """Engine factory for a worker that crashes on its first job."""
+    return CrashingEngine()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Start a pool of two fake-engine workers."""
+    pool = SynthesisPool(2, fake_synthesis_engine)
+    yield pool
+    pool.close()
+
+
+class TestSynthesisPool:
+    """Test cases for the SynthesisPool class."""
+    
+    def test_renders_audio_buffers(self, pool):
+        """Test that clips come back as WAV bytes."""
+        clips = [future.result(30) for future in [pool.submit(f"Clip {n}.", rate=180) for n in range(4)]]
+        
+        for clip in clips:
+            with wave.open(io.BytesIO(clip)) as audio:
+                assert audio.getnframes() > 0
+        assert pool.pending() == [0, 0]
+    
+    def test_routes_by_voice_and_rate_affinity(self, pool):
+        """Test that one voice stays on one worker until it backs up."""
+        routed, rebalanced = pool.routed, pool.rebalanced
+        for _ in range(3):
+            pool.submit("Same voice.", voice="a", rate=180).result(30)
+        assert (pool.routed - routed, pool.rebalanced - rebalanced) == (3, 0)
+        
+        futures = [pool.submit("Busy voice.", voice="a", rate=180) for _ in range(10)]
+        for future in futures:
+            future.result(30)
+        assert pool.rebalanced > rebalanced
+    
+    def test_failed_engine_returns_none(self):
+        """Test that jobs resolve to None when workers have no engine."""
+        pool = SynthesisPool(1, broken_engine)
+        try:
+            assert pool.submit("Hello.").result(30) is None
+        finally:
+            pool.close()
+        
+        assert pool.submit("After close.").result(1) is None
+    
+    def test_crashed_workers_are_replaced_then_retired(self):
+        """Test that a dead worker's jobs resolve to None and nothing is routed to it."""
+        pool = SynthesisPool(1, crashing_engine)
+        try:
+            deadline = time.monotonic() + 60
+            while pool.pending() and time.monotonic() < deadline:
+                assert pool.submit("Crash.").result(30) is None
+                time.sleep(0.05)
+            
+            assert pool.pending() == []
+            assert pool.restarted == MAX_RESTARTS
+            assert pool.submit("No workers left.").done()
+        finally:
+            pool.close()
+
+
+class TestTextToSpeechPool:
+    """Test cases for synthesizing through the pool."""
+    
+    @pytest.mark.asyncio
+    async def test_synthesize_uses_pool(self):
+        """Test that concurrent clips render in worker processes."""
+        tts = TextToSpeech(Config(tts_engine="fake", log_file=None, speech_cache_dir="", tts_pool_size=2))
+        
+        clips = await asyncio.gather(*(tts.synthesize(f"Sentence {n}.") for n in range(4)))
+        tts.close()
+        
+        assert all(clip.startswith(b"RIFF") for clip in clips)
+        assert tts._pool.routed + tts._pool.rebalanced == 4
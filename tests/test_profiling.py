@@ -0,0 +1,196 @@
+"""Tests for on-demand request profiling."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from ai_agent.core.agent import AIAgent
+from ai_agent.core.config import Config
+from ai_agent.utils.profiling import RequestProfiler
+from ai_agent.web.interface import WebInterface
+
+
+def spin(seconds):
+    """Burn CPU for a while."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def busy_leaf(seconds=0.1):
+    """Burn CPU in an easily recognized frame."""
+    spin(seconds)
+
+
+def executor_leaf(seconds=0.1):
+    """Burn CPU in a recognizable frame on a worker thread."""
+    spin(seconds)
+
+
+def other_request_leaf(seconds=0.1):
+    """Burn CPU on the event loop on behalf of another request."""
+    spin(seconds)
+
+
+def make_web(**overrides):
+    """Build a web interface with profiling enabled."""
+    overrides.setdefault("admin_token", "secret")
+    config = Config(log_file=None, profiling_enabled=True, **overrides)
+    with patch('ai_agent.core.agent.setup_logger'):
+        agent = AIAgent(config)
+    return WebInterface(agent, config)
+
+
+class TestRequestProfiler:
+    """Test cases for RequestProfiler."""
+    
+    def test_capture_records_collapsed_stacks(self):
+        """Test that time is attributed to the frames that spent it."""
+        profiler = RequestProfiler()
+        
+        with profiler.capture("unit") as handle:
+            busy_leaf()
+        
+        profile = handle.profile
+        assert profile.label == "unit"
+        collapsed = profile.collapsed()
+        assert "test_capture_records_collapsed_stacks" in collapsed
+        assert "busy_leaf (test_profiling.py" in collapsed
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.splitlines())
+    
+    def test_capture_includes_thread_pool_work(self):
+        """Test that work handed to a thread pool is sampled under the pool's name."""
+        profiler = RequestProfiler()
+        
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="decoder") as pool:
+            with profiler.capture("unit") as handle:
+                pool.submit(executor_leaf).result()
+        
+        collapsed = handle.profile.collapsed()
+        assert "[decoder];executor_leaf (test_profiling.py" in collapsed
+    
+    @pytest.mark.asyncio
+    async def test_capture_skips_other_tasks_on_the_loop(self):
+        """Test that a concurrent request's loop work stays out of the profile."""
+        profiler = RequestProfiler()
+        loop = asyncio.get_running_loop()
+        
+        async def other_request():
+            await asyncio.sleep(0)
+            other_request_leaf()
+        
+        async def profiled_request():
+            with profiler.capture("request") as handle:
+                child = asyncio.ensure_future(asyncio.sleep(0))
+                await asyncio.gather(child, loop.run_in_executor(None, executor_leaf))
+                busy_leaf()
+            return handle
+        
+        handle, _ = await asyncio.gather(profiled_request(), other_request())
+        
+        collapsed = handle.profile.collapsed()
+        assert "busy_leaf (test_profiling.py" in collapsed
+        assert "executor_leaf (test_profiling.py" in collapsed
+        assert "other_request_leaf" not in collapsed
+    
+    def test_keeps_only_slowest_profiles(self):
+        """Test that the store is bounded and ordered slowest first."""
+        profiler = RequestProfiler(max_profiles=2)
+        for stacks in (1, 3, 2):
+            profiler._store(f"run{stacks}", stacks / 1000, {})
+        
+        assert [profile.label for profile in profiler.profiles()] == ["run3", "run2"]
+        assert profiler.get(1) is None
+    
+    def test_overlapping_capture_is_skipped(self):
+        """Test that only one capture runs at a time."""
+        profiler = RequestProfiler()
+        
+        with profiler.capture("outer") as outer:
+            with profiler.capture("inner") as inner:
+                busy_leaf()
+        
+        assert inner.profile is None
+        assert outer.profile is not None
+
+
+class TestWebProfiling:
+    """Test cases for the profiling header and admin endpoints."""
+    
+    @pytest.mark.asyncio
+    async def test_header_captures_profile_served_by_admin_endpoint(self):
+        """Test capture via X-Profile and retrieval as collapsed stacks."""
+        web = make_web()
+        
+        async def process_text_command(text, session_id=None):
+            busy_leaf()
+            await asyncio.get_running_loop().run_in_executor(None, executor_leaf)
+            return "done"
+        web.agent.process_text_command = process_text_command
+        
+        admin = {"X-Admin-Token": "secret"}
+        transport = httpx.ASGITransport(app=web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            plain = await client.post("/process_text", data={"text": "hello"})
+            profiled = await client.post(
+                "/process_text", data={"text": "hello"}, headers={"X-Profile": "1", **admin}
+            )
+            listing = await client.get("/admin/profiles", headers=admin)
+            profile_id = profiled.headers["x-profile-id"]
+            stacks = await client.get(f"/admin/profiles/{profile_id}", headers=admin)
+        
+        assert "x-profile-id" not in plain.headers
+        assert [p["label"] for p in listing.json()["profiles"]] == ["/process_text"]
+        assert "busy_leaf" in stacks.text
+        assert "executor_leaf" in stacks.text
+    
+    @pytest.mark.asyncio
+    async def test_admin_token_is_required(self):
+        """Test that profiles are hidden and not captured without the token."""
+        web = make_web()
+        
+        transport = httpx.ASGITransport(app=web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/process_text", data={"text": "hello"}, headers={"X-Profile": "1"}
+            )
+            denied = await client.get("/admin/profiles")
+            allowed = await client.get("/admin/profiles", headers={"X-Admin-Token": "secret"})
+        
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert denied.status_code == 403
+        assert allowed.json()["profiles"] == []
+    
+    @pytest.mark.asyncio
+    async def test_admin_disabled_without_token(self):
+        """Test that no request is treated as admin when no token is configured."""
+        web = make_web(admin_token=None)
+        
+        transport = httpx.ASGITransport(app=web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/process_text", data={"text": "hello"}, headers={"X-Profile": "1"}
+            )
+            denied = await client.get("/admin/profiles", headers={"X-Admin-Token": ""})
+        
+        assert "x-profile-id" not in response.headers
+        assert denied.status_code == 403
+    
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        """Test that nothing is registered unless profiling is enabled."""
+        config = Config(log_file=None)
+        with patch('ai_agent.core.agent.setup_logger'):
+            agent = AIAgent(config)
+        web = WebInterface(agent, config)
+        
+        transport = httpx.ASGITransport(app=web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/admin/profiles")
+        
+        assert response.status_code == 404
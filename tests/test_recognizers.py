@@ -0,0 +1,235 @@
+"""Test the hedged race between speech recognizers."""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+import speech_recognition as sr
+
+from ai_agent.speech.recognizers import (
+    GoogleRecognizer, LatencyTracker, Recognition, RecognizerBackend, RecognizerRace, create_recognizers,
+)
+
+
+class StubRecognizer(RecognizerBackend):
+    """Recognizer that answers after a delay."""
+
+    def __init__(self, name, text="hello", delay=0.0, confidence=None, error=None):
+        self.name = name
+        self.text = text
+        self.delay = delay
+        self.confidence = confidence
+        self.error = error
+        self.calls = 0
+
+    def recognize(self, audio):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        if self.text is None:
+            return None
+        return Recognition(self.text, self.confidence)
+
+
+class TestRecognizerRace:
+    """Test cases for the RecognizerRace class."""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_wins_alone(self):
+        """Test that a prompt acceptable answer never starts the fallback."""
+        remote = StubRecognizer("remote", "turn on the lights", delay=0.01, confidence=0.9)
+        local = StubRecognizer("local", "turn on the lice")
+        race = RecognizerRace([remote, local], hedge_delay=0.5)
+
+        result = await race.recognize(b"audio")
+        race.close()
+
+        assert result.text == "turn on the lights"
+        assert result.backend == "remote"
+        assert local.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged(self):
+        """Test that the fallback starts after the hedge delay and its answer is used."""
+        remote = StubRecognizer("remote", "from the network", delay=1.0, confidence=0.9)
+        local = StubRecognizer("local", "from the device", delay=0.05, confidence=0.8)
+        race = RecognizerRace([remote, local], hedge_delay=0.1)
+
+        start = time.perf_counter()
+        result = await race.recognize(b"audio")
+        elapsed = time.perf_counter() - start
+        race.close()
+
+        assert result.backend == "local"
+        assert elapsed < 0.5
+        assert race.hedged == 1
+        assert race.wins == {"remote": 0, "local": 1}
+
+    @pytest.mark.asyncio
+    async def test_failure_starts_fallback_immediately(self):
+        """Test that a network error does not wait for the hedge delay."""
+        remote = StubRecognizer("remote", error=sr.RequestError("offline"))
+        local = StubRecognizer("local", "from the device")
+        race = RecognizerRace([remote, local], hedge_delay=5)
+
+        start = time.perf_counter()
+        result = await race.recognize(b"audio")
+        race.close()
+
+        assert result.text == "from the device"
+        assert time.perf_counter() - start < 1
+        assert race.hedged == 0
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_falls_back_to_best(self):
+        """Test that unsure answers start the next backend and the most confident is kept."""
+        first = StubRecognizer("first", "maybe this", confidence=0.4)
+        second = StubRecognizer("second", "or that", confidence=0.5)
+        race = RecognizerRace([first, second], hedge_delay=5, min_confidence=0.6)
+
+        result = await race.recognize(b"audio")
+        race.close()
+
+        assert result.text == "or that"
+        assert first.calls == second.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_no_speech_moves_on(self):
+        """Test that a backend hearing nothing starts the next one at once."""
+        remote = StubRecognizer("remote", text=None)
+        local = StubRecognizer("local", "from the device")
+        race = RecognizerRace([remote, local], hedge_delay=5)
+
+        start = time.perf_counter()
+        result = await race.recognize(b"audio")
+        race.close()
+
+        assert result.text == "from the device"
+        assert time.perf_counter() - start < 1
+        assert race.wins == {"remote": 0, "local": 1}
+
+    @pytest.mark.asyncio
+    async def test_fast_no_speech_loses_to_slower_answer(self):
+        """Test that an early None does not cancel a backend still working."""
+        fast = StubRecognizer("fast", text=None, delay=0.01)
+        slow = StubRecognizer("slow", "understood", delay=0.2)
+        race = RecognizerRace([slow, fast], hedge_delay=0)
+
+        result = await race.recognize(b"audio")
+        race.close()
+
+        assert result.text == "understood"
+        assert fast.calls == slow.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_none_only_when_nothing_understood(self):
+        """Test that None is returned once every backend has heard nothing."""
+        remote = StubRecognizer("remote", text=None)
+        local = StubRecognizer("local", text=None)
+        race = RecognizerRace([remote, local], hedge_delay=5)
+
+        assert await race.recognize(b"audio") is None
+        race.close()
+        assert remote.calls == local.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_unscored_result_waits_for_higher_ranks(self):
+        """Test that Google without a confidence beats a faster Sphinx answer."""
+        recognizer = Mock()
+
+        def recognize_google(audio, show_all=False):
+            time.sleep(0.2)
+            return {"alternative": [{"transcript": "turn on the lights"}], "final": True}
+        recognizer.recognize_google = recognize_google
+        google = GoogleRecognizer(recognizer)
+        sphinx = StubRecognizer("sphinx", "turn on the lice", delay=0.01)
+        race = RecognizerRace([google, sphinx], hedge_delay=0, min_confidence=0.6)
+
+        result = await race.recognize(b"audio")
+        race.close()
+
+        assert result.text == "turn on the lights"
+        assert result.confidence is None
+        assert race.wins == {"google": 1, "sphinx": 0}
+
+    @pytest.mark.asyncio
+    async def test_unscored_result_beats_low_confidence(self):
+        """Test that an unscored fallback is used once the scored primary was unsure."""
+        google = StubRecognizer("google", "maybe this", confidence=0.3)
+        sphinx = StubRecognizer("sphinx", "or that")
+        race = RecognizerRace([google, sphinx], hedge_delay=5, min_confidence=0.6)
+
+        result = await race.recognize(b"audio")
+        race.close()
+
+        assert result.text == "or that"
+
+    @pytest.mark.asyncio
+    async def test_parallel_mode_starts_everything(self):
+        """Test that a hedge delay of 0 races all backends from the start."""
+        slow = StubRecognizer("slow", "slow answer", delay=0.3)
+        fast = StubRecognizer("fast", "fast answer", delay=0.01, confidence=0.9)
+        race = RecognizerRace([slow, fast], hedge_delay=0)
+
+        result = await race.recognize(b"audio")
+        race.close()
+
+        assert result.text == "fast answer"
+        assert slow.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_delay_adapts_to_latency(self):
+        """Test that measured latency replaces the configured hedge delay."""
+        remote = StubRecognizer("remote", confidence=0.9, delay=0.02)
+        local = StubRecognizer("local")
+        race = RecognizerRace([remote, local], hedge_delay=1.0)
+
+        assert race.delay_after(remote) == 1.0
+        for _ in range(5):
+            await race.recognize(b"audio")
+        race.close()
+
+        assert 0.05 <= race.delay_after(remote) < 0.2
+        assert local.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_failures_do_not_shorten_hedge_delay(self):
+        """Test that fast errors leave the latency estimate alone."""
+        remote = StubRecognizer("remote", error=sr.RequestError("connection refused"))
+        local = StubRecognizer("local")
+        race = RecognizerRace([remote, local], hedge_delay=1.0)
+
+        for _ in range(5):
+            await race.recognize(b"audio")
+        race.close()
+
+        assert race.latency["remote"].samples == 0
+        assert race.delay_after(remote) == 1.0
+        assert race.latency["local"].samples == 5
+
+
+class TestLatencyTracker:
+    """Test cases for the LatencyTracker class."""
+
+    def test_estimate_covers_jitter(self):
+        """Test that the estimate sits above the mean when latency varies."""
+        tracker = LatencyTracker()
+        assert tracker.estimate() is None
+        for seconds in (0.2, 0.4) * 20:
+            tracker.observe(seconds)
+
+        assert 0.28 < tracker.mean < 0.32
+        assert tracker.estimate() > 0.4
+
+
+class TestCreateRecognizers:
+    """Test cases for building backends from the config."""
+
+    def test_order_and_names(self):
+        """Test that backends are built in the configured order."""
+        backends = create_recognizers("sphinx, google", sr.Recognizer())
+
+        assert [backend.name for backend in backends] == ["sphinx", "google"]
+        with pytest.raises(ValueError, match="Unknown speech recognizer"):
+            create_recognizers("google,whisper", sr.Recognizer())
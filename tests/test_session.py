@@ -0,0 +1,132 @@
+"""Test the per-session history store."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app import create_app
+from ai_agent.core.agent import AIAgent
+from ai_agent.core.config import Config
+from ai_agent.core.session import (
+    USER_INPUT,
+    HistoryRecord,
+    SessionHistory,
+    SessionManager,
+    is_valid_session_id,
+)
+
+
+class TestSessionHistory:
+    """Test cases for the SessionHistory ring buffer."""
+    
+    def test_ring_buffer_is_bounded(self):
+        """Test that the oldest records are dropped when full."""
+        history = SessionHistory(max_records=3)
+        for i in range(5):
+            history.add(USER_INPUT, f"message {i}")
+        
+        assert len(history) == 3
+        assert [record.content for record in history] == ["message 2", "message 3", "message 4"]
+    
+    def test_record_serialization(self):
+        """Test that records serialize to the public history format."""
+        record = HistoryRecord("user_input", "hi", timestamp=0.0)
+        data = record.to_dict()
+        
+        assert data["type"] == "user_input"
+        assert data["content"] == "hi"
+        assert HistoryRecord.from_dict(data).timestamp == 0.0
+        assert record["timestamp"] == data["timestamp"]
+    
+    def test_record_types_are_interned(self):
+        """Test that record types share one string object."""
+        history = SessionHistory()
+        history.append({"type": "".join(["user_", "input"]), "content": "a", "timestamp": 1.0})
+        history.add("user_input", "b")
+        
+        assert history[0].kind is history[1].kind
+
+
+class TestSessionManager:
+    """Test cases for the SessionManager class."""
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used session is evicted."""
+        manager = SessionManager(max_sessions=2)
+        manager.get("a")
+        manager.get("b")
+        manager.get("a")
+        manager.get("c")
+        
+        assert "a" in manager
+        assert "b" not in manager
+        assert manager.evictions == 1
+    
+    def test_idle_eviction(self):
+        """Test that idle sessions are dropped."""
+        manager = SessionManager(idle_timeout=10)
+        with patch("ai_agent.core.session.time.monotonic", return_value=100.0):
+            manager.get("old")
+        with patch("ai_agent.core.session.time.monotonic", return_value=200.0):
+            manager.get("new")
+        
+        assert "old" not in manager
+        assert "new" in manager
+    
+    def test_peek_does_not_create(self):
+        """Test that peeking at a missing session returns None."""
+        manager = SessionManager()
+        
+        assert manager.peek("missing") is None
+        assert len(manager) == 0
+    
+    def test_session_id_validation(self):
+        """Test that unsafe session IDs are rejected."""
+        assert is_valid_session_id("abc123_-")
+        assert not is_valid_session_id("")
+        assert not is_valid_session_id(None)
+        assert not is_valid_session_id("a" * 65)
+        assert not is_valid_session_id("../etc")
+        assert not is_valid_session_id("default")
+
+
+class TestWebSessions:
+    """Test cases for assigning sessions to web clients."""
+    
+    @pytest.mark.asyncio
+    async def test_interface_rejects_default_session(self):
+        """Test that a client claiming the local user's session gets its own."""
+        from ai_agent.web.interface import WebInterface
+        
+        config = Config(log_file=None, llm_backend="placeholder", headless=True)
+        with patch('ai_agent.core.agent.setup_logger'):
+            agent = AIAgent(config)
+        web = WebInterface(agent, config)
+        transport = httpx.ASGITransport(app=web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/process_text", data={"text": "hello"}, headers={"X-Session-ID": "default"}
+            )
+        
+        session_id = response.cookies["session_id"]
+        assert session_id != "default"
+        assert agent.sessions.peek("default") is None
+        assert len(agent.sessions.peek(session_id)) == 1
+    
+    @pytest.mark.asyncio
+    async def test_app_issues_session_cookie(self):
+        """Test that the serverless app gives each new client its own session."""
+        app = create_app(Config(log_file=None, llm_backend="placeholder", headless=True))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.post("/process_text", data={"text": "hello"})
+            second = await client.post("/process_text", data={"text": "hello"})
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as other:
+            third = await other.post("/process_text", data={"text": "hello"})
+        
+        session_id = first.cookies["session_id"]
+        assert "session_id" not in second.cookies
+        assert third.cookies["session_id"] != session_id
+        assert app.state.agent.sessions.peek("default") is None
+        assert len(app.state.agent.sessions.peek(session_id)) == 2
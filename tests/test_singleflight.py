@@ -0,0 +1,73 @@
+"""Test in-flight request coalescing."""
+
+import asyncio
+
+import pytest
+
+from ai_agent.utils.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for the SingleFlight class."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_computation(self):
+        """Test that concurrent callers with the same key share a result."""
+        flight = SingleFlight()
+        calls = []
+        
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "done"
+        
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        
+        assert results == ["done"] * 5
+        assert len(calls) == 1
+        assert flight.coalesced == 4
+        assert len(flight) == 0
+    
+    @pytest.mark.asyncio
+    async def test_sequential_calls_run_again(self):
+        """Test that a finished key starts fresh work."""
+        flight = SingleFlight()
+        calls = []
+        
+        async def work():
+            calls.append(1)
+            return len(calls)
+        
+        assert await flight.do("key", work) == 1
+        assert await flight.do("key", work) == 2
+    
+    @pytest.mark.asyncio
+    async def test_exceptions_reach_every_waiter(self):
+        """Test that a failure is shared by all waiters."""
+        flight = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+        
+        results = await asyncio.gather(
+            flight.do("key", work), flight.do("key", work), return_exceptions=True
+        )
+        
+        assert all(isinstance(result, ValueError) for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_work(self):
+        """Test that other waiters still get the result after a cancellation."""
+        flight = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+        
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        
+        assert await second == "done"
@@ -0,0 +1,112 @@
+"""Startup regression tests for the text path."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Budgets are generous multiples of what a laptop measures, so they catch an
+# accidental eager import of the speech or imaging stack rather than noise.
+IMPORT_BUDGET_US = 300_000
+FIRST_RESPONSE_BUDGET_S = 1.0
+
+HEAVY_MODULES = {"pyttsx3", "speech_recognition", "numpy", "PIL", "fastapi", "uvicorn"}
+
+# Logging goes through a listener thread that could interleave with the
+# printed result, so the scripts silence it.
+TEXT_PATH = """
+import asyncio, logging, time
+logging.disable(logging.CRITICAL)
+start = time.perf_counter()
+from ai_agent import AIAgent, Config
+agent = AIAgent(Config(log_file=None))
+response = asyncio.run(agent.process_text_command("what time is it"))
+assert "current time is" in response
+print(time.perf_counter() - start)
+"""
+
+HEADLESS_PATH = """
+import asyncio, logging, sys
+logging.disable(logging.CRITICAL)
+from ai_agent import AIAgent, Config
+agent = AIAgent(Config(headless=True, log_file=None))
+asyncio.run(agent.speak("hello"))
+print(asyncio.run(agent.process_voice_command()))
+"""
+
+SERVERLESS_PATH = """
+import asyncio, json, sys, logging
+logging.disable(logging.CRITICAL)
+import httpx
+import app
+
+async def run():
+    transport = httpx.ASGITransport(app=app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        compressed_at_import = app.landing_page.cache_info().currsize > 0
+        page = await client.get("/")
+        lazy = "ai_agent.core.agent" not in sys.modules and not compressed_at_import
+        await client.post("/process_text", data={"text": "hello"})
+        timing = (await client.get("/cold_start")).json()["cold_start"]
+    return page.status_code, lazy, timing
+
+print(json.dumps(asyncio.run(run())))
+"""
+
+
+def run_text_path(code=TEXT_PATH):
+    """Run the text path in a fresh interpreter with -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imports[name.strip()] = int(cumulative)
+    return imports, result.stdout.strip().splitlines()[-1]
+
+
+class TestStartup:
+    """Test cases for import and first-response latency."""
+    
+    def test_text_path_skips_heavy_imports(self):
+        """Test that the text path never imports speech or imaging libraries."""
+        imports, _ = run_text_path()
+        
+        loaded = {name.split(".")[0] for name in imports}
+        assert not loaded & HEAVY_MODULES
+    
+    def test_text_path_latency_budget(self):
+        """Test import plus first response stays within budget."""
+        imports, elapsed = run_text_path()
+        
+        assert imports["ai_agent.core.agent"] < IMPORT_BUDGET_US
+        assert float(elapsed) < FIRST_RESPONSE_BUDGET_S
+    
+    def test_headless_agent_never_imports_speech(self):
+        """Test that headless speech and voice calls use the stubs."""
+        imports, output = run_text_path(HEADLESS_PATH)
+        
+        assert "not available" in output
+        loaded = {name.split(".")[0] for name in imports}
+        assert "ai_agent.speech.stubs" in imports
+        assert not loaded & {"pyttsx3", "speech_recognition"}
+    
+    def test_serverless_app_builds_agent_on_first_request(self):
+        """Test that app.py serves / without the agent and reports its cold start."""
+        imports, output = run_text_path(SERVERLESS_PATH)
+        status, lazy, timing = json.loads(output)
+        
+        assert status == 200
+        assert lazy
+        assert "ai_agent.core.agent" in imports
+        assert set(timing) == {"imports_ms", "app_ms", "first_request_ms", "total_ms"}
@@ -0,0 +1,61 @@
+"""Test the sentence splitting helpers."""
+
+from ai_agent.utils.text import SentenceChunker, split_sentences, split_speech_chunks
+
+
+class TestSplitSentences:
+    """Test cases for split_sentences."""
+    
+    def test_splits_on_terminal_punctuation(self):
+        """Test splitting on periods, exclamation and question marks."""
+        assert split_sentences("One. Two! Three? Four") == ["One.", "Two!", "Three?", "Four"]
+    
+    def test_keeps_decimals_and_abbreviations(self):
+        """Test that decimals and common abbreviations do not split."""
+        assert split_sentences("Dr. Smith paid 3.50 dollars. Done.") == [
+            "Dr. Smith paid 3.50 dollars.",
+            "Done.",
+        ]
+    
+    def test_splits_lines_and_collapses_whitespace(self):
+        """Test that each line is its own chunk with whitespace collapsed."""
+        text = "Tasks:\n        \n        - Tell   time\n        - Help"
+        
+        assert split_sentences(text) == ["Tasks:", "- Tell time", "- Help"]
+
+
+class TestSplitSpeechChunks:
+    """Test cases for split_speech_chunks."""
+    
+    def test_long_sentences_break_at_clauses_then_words(self):
+        """Test that chunks respect the limit and prefer clause boundaries."""
+        text = "Short. A long sentence, with a clause; and then many more words than fit."
+        
+        assert split_speech_chunks(text, max_chars=30) == [
+            "Short.",
+            "A long sentence,",
+            "with a clause;",
+            "and then many more words than",
+            "fit.",
+        ]
+    
+    def test_first_chunk_limit(self):
+        """Test that the first chunk can be held shorter than the rest."""
+        chunks = split_speech_chunks("one two three four five six seven eight", 100, first_max_chars=10)
+        
+        assert chunks == ["one two", "three four five six seven eight"]
+
+
+class TestSentenceChunker:
+    """Test cases for SentenceChunker."""
+    
+    def test_emits_sentences_as_they_complete(self):
+        """Test incremental sentence detection across fragments."""
+        chunker = SentenceChunker()
+        
+        assert chunker.feed("Hello") == []
+        assert chunker.feed(" there.") == []
+        assert chunker.feed(" How are") == ["Hello there."]
+        assert chunker.feed(" you? Fine") == ["How are you?"]
+        assert chunker.flush() == "Fine"
+        assert chunker.flush() is None
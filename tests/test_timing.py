@@ -0,0 +1,30 @@
+"""Tests for cold-start timing."""
+
+import time
+
+from ai_agent.utils.timing import ColdStartTimer
+
+
+class TestColdStartTimer:
+    """Test cases for ColdStartTimer."""
+    
+    def test_phases_follow_each_other(self):
+        """Test that each phase is timed from the end of the previous one."""
+        timer = ColdStartTimer(time.perf_counter() - 0.05)
+        
+        imports = timer.mark("imports")
+        app = timer.mark("app")
+        
+        assert imports >= 0.05
+        assert app < imports
+        report = timer.report()
+        assert set(report) == {"imports_ms", "app_ms", "total_ms"}
+        assert report["total_ms"] >= report["imports_ms"]
+    
+    def test_phase_is_recorded_once(self):
+        """Test that marking a phase again keeps the first duration."""
+        timer = ColdStartTimer()
+        first = timer.mark("first_request", since=time.perf_counter() - 0.01)
+        
+        assert timer.mark("first_request") == first
+        assert first >= 0.01
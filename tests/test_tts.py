@@ -0,0 +1,308 @@
+"""Test the speech worker and text-to-speech queueing."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import pytest
+
+from ai_agent.core.config import Config
+from ai_agent.speech.backends import TTS_BACKENDS
+from ai_agent.speech.tts import TextToSpeech
+from ai_agent.speech.worker import NORMAL, URGENT, SpeechWorker
+
+
+class FakeEngine:
+    """pyttsx3-like engine that records speech and can be held mid-utterance."""
+    
+    def __init__(self):
+        self.spoken = []
+        self.rendered = []
+        self.properties = {}
+        self.threads = set()
+        self.hold = threading.Event()
+        self.hold.set()
+        self.speaking = threading.Event()
+        self.startup_delay = 0.0
+        self.on_start = None
+        self._callbacks = {}
+        self._queue = []
+        self._stopped = False
+    
+    def connect(self, topic, callback):
+        self._callbacks[topic] = callback
+    
+    def setProperty(self, name, value):
+        self.properties[name] = value
+    
+    def getProperty(self, name):
+        return []
+    
+    def say(self, text, name=None):
+        self._queue.append((text, name, None))
+    
+    def save_to_file(self, text, path):
+        self._queue.append((text, None, path))
+    
+    def runAndWait(self):
+        self.threads.add(threading.current_thread().name)
+        self._stopped = False
+        time.sleep(self.startup_delay)
+        while self._queue and not self._stopped:
+            text, name, path = self._queue.pop(0)
+            if path:
+                with open(path, "wb") as f:
+                    f.write(b"RIFF" + text.encode())
+                self.rendered.append(text)
+                continue
+            self._callbacks["started-utterance"](name)
+            if self.on_start:
+                self.on_start(name)
+            self.speaking.set()
+            self.hold.wait(5)
+            self.speaking.clear()
+            self._callbacks["started-word"](name, 0, 1)
+            if not self._stopped:
+                self.spoken.append(text)
+        self._queue.clear()
+    
+    def stop(self):
+        self._stopped = True
+
+
+class TestSpeechWorker:
+    """Test cases for the SpeechWorker class."""
+    
+    @pytest.fixture
+    def engine(self):
+        """Create a fake engine."""
+        return FakeEngine()
+    
+    @pytest.fixture
+    def worker(self, engine):
+        """Create a worker that owns the fake engine."""
+        worker = SpeechWorker(lambda: engine, name="test-tts")
+        worker.ready.wait(5)
+        yield worker
+        engine.hold.set()
+        worker.close()
+    
+    def hold_first(self, worker, engine):
+        """Start speaking a first utterance and keep the engine busy with it."""
+        engine.hold.clear()
+        future = worker.submit("first")
+        assert engine.speaking.wait(5)
+        return future
+    
+    def test_speaks_on_a_single_thread(self, worker, engine):
+        """Test that every utterance is spoken by the worker thread."""
+        futures = [worker.submit(f"line {index}") for index in range(5)]
+        
+        assert [future.result(5) for future in futures] == [True] * 5
+        assert engine.spoken == [f"line {index}" for index in range(5)]
+        assert engine.threads == {"test-tts"}
+    
+    def test_urgent_goes_ahead_of_queued(self, worker, engine):
+        """Test that urgent text is spoken before queued normal text."""
+        first = self.hold_first(worker, engine)
+        later = worker.submit("later", NORMAL)
+        urgent = worker.submit("urgent", URGENT)
+        engine.hold.set()
+        
+        assert first.result(5) and later.result(5) and urgent.result(5)
+        assert engine.spoken == ["first", "urgent", "later"]
+    
+    def test_key_supersedes_queued_text(self, worker, engine):
+        """Test that stale queued text with the same key is dropped."""
+        first = self.hold_first(worker, engine)
+        stale = worker.submit("Loading 10%", key="progress")
+        other = worker.submit("unrelated")
+        fresh = worker.submit("Loading 90%", key="progress")
+        engine.hold.set()
+        
+        assert stale.result(5) is False
+        assert first.result(5) and other.result(5) and fresh.result(5)
+        assert engine.spoken == ["first", "unrelated", "Loading 90%"]
+        assert worker.coalesced == 1
+    
+    def test_cancel_stops_current_and_drops_queued(self, worker, engine):
+        """Test barge-in cancellation."""
+        first = self.hold_first(worker, engine)
+        queued = worker.submit("queued")
+        
+        assert worker.cancel() == 2
+        engine.hold.set()
+        
+        assert first.result(5) is False
+        assert queued.result(5) is False
+        assert engine.spoken == []
+        assert len(worker) == 0
+        
+        assert worker.submit("after").result(5) is True
+    
+    def test_abandoned_future_is_not_spoken(self, worker, engine):
+        """Test that a caller cancelling its future skips the text."""
+        first = self.hold_first(worker, engine)
+        abandoned = worker.submit("abandoned")
+        assert abandoned.cancel()
+        engine.hold.set()
+        
+        assert first.result(5) is True
+        assert worker.submit("next").result(5) is True
+        assert engine.spoken == ["first", "next"]
+    
+    def test_speaking_is_set_during_playback(self, worker, engine):
+        """Test that the speaking flag covers playback and nothing else."""
+        assert not worker.speaking.is_set()
+        first = self.hold_first(worker, engine)
+        
+        assert worker.speaking.is_set()
+        engine.hold.set()
+        assert first.result(5) is True
+        assert not worker.speaking.is_set()
+    
+    def test_properties_are_set_on_worker_thread(self, worker, engine):
+        """Test that property changes are applied before the next utterance."""
+        worker.set_property("rate", 120)
+        worker.submit("hello").result(5)
+        
+        assert engine.properties["rate"] == 120
+    
+    def test_long_text_is_spoken_in_chunks(self, worker, engine):
+        """Test that sentences are queued on the engine as separate chunks."""
+        assert worker.submit("One. Two, which is longer. Three.").result(5) is True
+        
+        assert engine.spoken == ["One.", "Two, which is longer.", "Three."]
+    
+    def test_skip_forward_and_back(self, worker, engine):
+        """Test skipping playback by whole sentences."""
+        text = "One. Two. Three. Four."
+        engine.hold.clear()
+        future = worker.submit(text)
+        assert engine.speaking.wait(5)
+        assert worker.skip(2)
+        engine.hold.set()
+        assert future.result(5) is True
+        assert engine.spoken == ["Three.", "Four."]
+        
+        engine.spoken.clear()
+        skipped = []
+        
+        def back_once(name):
+            if name == "2" and not skipped:
+                skipped.append(worker.skip(-1))
+        
+        engine.on_start = back_once
+        assert worker.submit(text).result(5) is True
+        assert skipped == [True]
+        assert engine.spoken == ["One.", "Two.", "Two.", "Three.", "Four."]
+        assert worker.skip(1) is False
+    
+    def test_first_chunk_shrinks_to_fit_latency_budget(self, engine):
+        """Test that a slow engine gets a shorter first chunk."""
+        worker = SpeechWorker(lambda: engine, name="slow-tts", first_audio_budget=0.05)
+        text = "This sentence is long enough, with clauses, that it can be split up " * 2
+        engine.startup_delay = 0.1
+        
+        worker.submit(text).result(5)
+        engine.startup_delay = 0.0
+        first_run = list(engine.spoken)
+        engine.spoken.clear()
+        worker.submit(text).result(5)
+        worker.close()
+        
+        assert " ".join(first_run) == " ".join(engine.spoken)
+        assert len(engine.spoken[0]) < len(first_run[0])
+    
+    def test_render_returns_audio_and_survives_cancel(self, worker, engine):
+        """Test that renders produce bytes and are not cancelled by barge-in."""
+        first = self.hold_first(worker, engine)
+        clip = worker.render("hello")
+        worker.cancel()
+        engine.hold.set()
+        
+        assert first.result(5) is False
+        assert clip.result(5) == b"RIFFhello"
+        assert engine.spoken == []
+    
+    def test_failed_engine_resolves_false(self):
+        """Test that text is not spoken when the engine cannot be created."""
+        def broken():
+            raise RuntimeError("no audio device")
+        
+        worker = SpeechWorker(broken, name="broken-tts")
+        worker.ready.wait(5)
+        
+        assert worker.engine is None
+        assert worker.submit("hello").result(5) is False
+        worker.close()
+
+
+class TestTextToSpeech:
+    """Test cases for the TextToSpeech class."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_speak_is_serialized(self):
+        """Test that concurrent callers are queued on the engine thread."""
+        engine = FakeEngine()
+        with patch.dict(TTS_BACKENDS, {"test": lambda: engine}):
+            tts = TextToSpeech(Config(tts_engine="test", tts_rate=150, log_file=None, speech_cache_dir=""))
+        
+        results = await asyncio.gather(*(tts.speak(f"line {index}") for index in range(3)))
+        tts.close()
+        
+        assert results == [True, True, True]
+        assert sorted(engine.spoken) == ["line 0", "line 1", "line 2"]
+        assert engine.properties["rate"] == 150
+        assert len(engine.threads) == 1
+    
+    @pytest.mark.asyncio
+    async def test_synthesize_caches_clips(self, tmp_path):
+        """Test that clips are rendered once, shared and reloaded from disk."""
+        engine = FakeEngine()
+        config = Config(tts_engine="test", log_file=None, speech_cache_dir=str(tmp_path))
+        with patch.dict(TTS_BACKENDS, {"test": lambda: engine}):
+            tts = TextToSpeech(config)
+            clips = await asyncio.gather(tts.synthesize("Hello!"), tts.synthesize("Hello!"))
+            again = await tts.synthesize("Hello!")
+            tts.close()
+            
+            restarted = TextToSpeech(config)
+            reloaded = await restarted.synthesize("Hello!")
+            restarted.close()
+        
+        assert clips == [b"RIFFHello!", b"RIFFHello!"]
+        assert again == reloaded == b"RIFFHello!"
+        assert engine.rendered == ["Hello!"]
+        assert restarted.clip_cache.stats()["disk_hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_clips_are_keyed_by_rate(self, tmp_path):
+        """Test that changing the rate renders a new clip."""
+        engine = FakeEngine()
+        with patch.dict(TTS_BACKENDS, {"test": lambda: engine}):
+            tts = TextToSpeech(Config(tts_engine="test", log_file=None, speech_cache_dir=""))
+        
+        await tts.synthesize("Hello!")
+        tts.set_rate(120)
+        await tts.synthesize("Hello!")
+        tts.close()
+        
+        assert engine.rendered == ["Hello!", "Hello!"]
+        assert engine.properties["rate"] == 120
+    
+    @pytest.mark.asyncio
+    async def test_stuck_render_times_out(self):
+        """Test that a render that never finishes resolves to None."""
+        engine = FakeEngine()
+        with patch.dict(TTS_BACKENDS, {"test": lambda: engine}):
+            tts = TextToSpeech(Config(tts_engine="test", log_file=None, speech_cache_dir=""))
+        
+        with patch.object(tts._worker, "render", return_value=Future()), \
+             patch("ai_agent.speech.tts.RENDER_TIMEOUT", 0.05):
+            clip = await tts.synthesize("Hello!")
+        tts.close()
+        
+        assert clip is None
@@ -0,0 +1,128 @@
+"""Test the text-to-speech engine registry and backends."""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from ai_agent.core.config import Config
+from ai_agent.speech.backends import (
+    EspeakEngine, FakeTTSEngine, audio_seconds, create_engine, profile_backend,
+)
+from ai_agent.speech.tts import TextToSpeech
+
+
+FAKE_ESPEAK = '''
+import sys, wave
+args = sys.argv[1:]
+text = sys.stdin.read()
+with open(sys.argv[0] + ".log", "a") as log:
+    log.write(" ".join(args) + "|" + text + "\\n")
+if "-w" in args:
+    with wave.open(args[args.index("-w") + 1], "wb") as output:
+        output.setnchannels(1)
+        output.setsampwidth(2)
+        output.setframerate(22050)
+        output.writeframes(bytes(2 * 22050 * len(text.split())))
+'''
+
+
+@pytest.fixture
+def espeak_binary(tmp_path):
+    """Executable that records its arguments and writes WAV files like espeak-ng."""
+    path = tmp_path / "espeak-ng"
+    path.write_text(f"#!{sys.executable}\n{FAKE_ESPEAK}")
+    os.chmod(path, 0o755)
+    return str(path)
+
+
+class TestRegistry:
+    """Test cases for selecting engines."""
+
+    def test_unknown_engine(self):
+        """Test that an unknown name lists the registered engines."""
+        with pytest.raises(ValueError, match="espeak, fake, pyttsx3"):
+            create_engine("festival")
+
+    def test_profile_fake_backend(self):
+        """Test that profiling reports init cost and real-time factor."""
+        result = profile_backend("fake", "Hello there.")
+
+        assert result["init_ms"] >= 0
+        assert result["audio_seconds"] == pytest.approx(12 * FakeTTSEngine.SECONDS_PER_CHAR, rel=0.01)
+        assert 0 < result["real_time_factor"] < 1
+
+    @pytest.mark.asyncio
+    async def test_text_to_speech_uses_configured_engine(self):
+        """Test that TextToSpeech creates the engine named in the config."""
+        tts = TextToSpeech(Config(tts_engine="fake", log_file=None, speech_cache_dir=""))
+        spoken = await tts.speak("Hello there.")
+        clip = await tts.synthesize("Hello there.")
+        tts.close()
+
+        assert isinstance(tts.engine, FakeTTSEngine)
+        assert spoken is True
+        assert tts.engine.spoken == ["Hello there."]
+        assert audio_seconds(clip) > 0
+        assert tts.init_seconds is not None
+
+    def test_unknown_engine_leaves_speech_unavailable(self):
+        """Test that a misconfigured engine disables speech instead of failing."""
+        tts = TextToSpeech(Config(tts_engine="festival", log_file=None, speech_cache_dir=""))
+        tts.close()
+
+        assert tts.available is False
+
+
+class TestFakeTTSEngine:
+    """Test cases for the deterministic engine."""
+
+    def test_clip_length_follows_rate(self, tmp_path):
+        """Test that faster speech renders shorter clips."""
+        engine = FakeTTSEngine()
+        durations = []
+        for rate in (180, 360):
+            engine.setProperty("rate", rate)
+            engine.save_to_file("Hello there.", str(tmp_path / "clip.wav"))
+            engine.runAndWait()
+            durations.append(audio_seconds((tmp_path / "clip.wav").read_bytes()))
+
+        assert durations[1] == pytest.approx(durations[0] / 2, rel=0.01)
+
+    def test_stop_from_callback(self):
+        """Test that stopping in a word callback drops the rest of the queue."""
+        engine = FakeTTSEngine()
+        started = []
+        engine.connect("started-utterance", started.append)
+        engine.connect("started-word", lambda name, location, length: name == "1" and engine.stop())
+        for index in range(3):
+            engine.say(f"chunk {index}", str(index))
+        engine.runAndWait()
+
+        assert started == ["0", "1"]
+        assert engine.spoken == ["chunk 0"]
+
+
+class TestEspeakEngine:
+    """Test cases for the espeak-ng subprocess engine."""
+
+    def test_missing_binary(self):
+        """Test that a missing espeak-ng is reported at creation."""
+        with patch("ai_agent.speech.backends.shutil.which", return_value=None):
+            with pytest.raises(RuntimeError, match="not installed"):
+                EspeakEngine()
+
+    def test_render_and_speak(self, espeak_binary, tmp_path):
+        """Test that properties become command-line options."""
+        engine = EspeakEngine(espeak_binary)
+        engine.setProperty("rate", 150)
+        engine.setProperty("voice", "en-us")
+        engine.save_to_file("one two three", str(tmp_path / "clip.wav"))
+        engine.say("hello")
+        engine.runAndWait()
+
+        calls = (tmp_path / "espeak-ng.log").read_text().splitlines()
+        assert audio_seconds((tmp_path / "clip.wav").read_bytes()) == 3
+        assert calls[0].startswith("-v en-us -s 150 -a 100 -w ")
+        assert calls[1] == "-v en-us -s 150 -a 100 --stdin|hello"
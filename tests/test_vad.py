@@ -0,0 +1,144 @@
+"""Test the energy and zero-crossing voice-activity detector."""
+
+import numpy as np
+import pytest
+
+from ai_agent.speech.vad import FRAME_SECONDS, FrameRing, VoiceActivityDetector
+
+
+RATE = 16000
+
+
+def tone(seconds: float, amplitude: int = 3000, frequency: int = 200) -> np.ndarray:
+    """A voiced-like tone."""
+    n = np.arange(int(RATE * seconds))
+    return (amplitude * np.sin(2 * np.pi * frequency * n / RATE)).astype(np.int16)
+
+
+def speech(seconds: float) -> np.ndarray:
+    """A tone broken into syllables by short dips, as in running speech."""
+    samples = tone(seconds)
+    syllable = int(RATE * 0.3)
+    for start in range(syllable - int(RATE * 0.06), len(samples), syllable):
+        samples[start:start + int(RATE * 0.06)] = 0
+    return samples
+
+
+def noise(seconds: float, amplitude: int) -> np.ndarray:
+    """White noise, which crosses zero about half the time."""
+    rng = np.random.default_rng(0)
+    return rng.integers(-amplitude, amplitude, int(RATE * seconds)).astype(np.int16)
+
+
+def silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(RATE * seconds), dtype=np.int16)
+
+
+def utterance_seconds(pcm: bytes) -> float:
+    return len(pcm) / (2 * RATE)
+
+
+class TestVoiceActivityDetector:
+    """Test cases for the VoiceActivityDetector class."""
+
+    def test_classify(self):
+        """Test that voiced and loud frames are speech but quiet hiss is not."""
+        detector = VoiceActivityDetector(RATE)
+        samples = detector.frame_samples
+        frames = np.stack([
+            tone(FRAME_SECONDS)[:samples],
+            noise(FRAME_SECONDS, 500)[:samples],   # hiss near the threshold
+            noise(FRAME_SECONDS, 3000)[:samples],  # loud fricative
+            silence(FRAME_SECONDS)[:samples],
+        ])
+
+        assert detector.classify(frames).tolist() == [True, False, True, False]
+
+    def test_cuts_utterances_at_pauses(self):
+        """Test that two phrases separated by a pause come out separately."""
+        detector = VoiceActivityDetector(RATE, pause_seconds=0.5, pre_roll_seconds=0.3)
+        audio = np.concatenate([silence(1), tone(1), silence(1), tone(0.6), silence(1)])
+
+        # Microphone-sized chunks that do not line up with frames
+        pcm = audio.tobytes()
+        utterances = []
+        for offset in range(0, len(pcm), 1000):
+            utterances.extend(detector.feed(pcm[offset:offset + 1000]))
+
+        assert len(utterances) == 2
+        # Speech plus up to the pre-roll before and the tail after it
+        assert 1.0 <= utterance_seconds(utterances[0]) <= 1.7
+        assert 0.6 <= utterance_seconds(utterances[1]) <= 1.3
+        assert not detector.in_utterance
+
+    def test_pre_roll_keeps_onset(self):
+        """Test that audio before the detected start is included."""
+        detector = VoiceActivityDetector(RATE, pre_roll_seconds=0.3)
+        audio = np.concatenate([silence(1), tone(0.5)])
+        assert detector.feed(audio.tobytes()) == []
+
+        utterance = np.frombuffer(detector.flush(), dtype=np.int16)
+        # The utterance opens with silence from the pre-roll
+        assert not utterance[:int(RATE * 0.2)].any()
+        assert utterance_seconds(utterance.tobytes()) == pytest.approx(0.8, abs=0.05)
+
+    def test_long_speech_is_split(self):
+        """Test that speech longer than the limit is cut into pieces."""
+        detector = VoiceActivityDetector(RATE, pre_roll_seconds=0, max_utterance_seconds=1)
+        utterances = detector.feed(np.concatenate([silence(1), speech(2.5)]).tobytes())
+
+        assert len(utterances) == 2
+        assert all(utterance_seconds(pcm) == pytest.approx(1, abs=0.05) for pcm in utterances)
+
+    def test_calibrates_without_blocking(self):
+        """Test that the threshold settles on the room's noise during the first second."""
+        detector = VoiceActivityDetector(RATE, energy_threshold=300)
+        hum = tone(1.5, amplitude=600, frequency=100)  # voiced-like, above the initial threshold
+        utterances = detector.feed(np.concatenate([hum, speech(1), hum]).tobytes())
+
+        assert detector.calibrated
+        assert detector.energy_threshold == pytest.approx(600 / np.sqrt(2) * 1.5, rel=0.05)
+        assert len(utterances) == 1
+        assert 1.0 <= utterance_seconds(utterances[0]) <= 1.7
+
+    def test_follows_gradual_noise_change(self):
+        """Test that the threshold tracks noise between utterances."""
+        detector = VoiceActivityDetector(RATE, adaptation_seconds=1)
+        detector.feed(noise(2, 100).tobytes())
+        quiet = detector.energy_threshold
+        # The room gets louder in steps too small to count as speech
+        for amplitude in (150, 200, 260, 330):
+            assert detector.feed(noise(2, amplitude).tobytes()) == []
+
+        assert detector.energy_threshold > 2.5 * quiet
+
+    def test_recovers_from_sudden_noise(self):
+        """Test that a sudden steady noise stops triggering after one utterance."""
+        detector = VoiceActivityDetector(RATE, max_utterance_seconds=2)
+        detector.feed(silence(1).tobytes())
+        fan = tone(10, amplitude=1500, frequency=120)
+        utterances = detector.feed(fan.tobytes())
+
+        assert len(utterances) == 1
+        assert not detector.in_utterance
+        assert detector.feed(np.concatenate([fan, speech(1) * 2, fan]).tobytes())
+
+    def test_silence_yields_nothing(self):
+        """Test that background noise alone never starts an utterance."""
+        detector = VoiceActivityDetector(RATE)
+
+        assert detector.feed(noise(3, 200).tobytes()) == []
+        assert detector.flush() is None
+
+
+class TestFrameRing:
+    """Test cases for the FrameRing class."""
+
+    def test_wraps_and_forgets_oldest(self):
+        """Test that reads span the wrap point and skip overwritten frames."""
+        ring = FrameRing(4, 2)
+        ring.extend(np.arange(12, dtype=np.int16).reshape(6, 2))
+
+        assert ring.total == 6
+        assert np.frombuffer(ring.read(3, 6), dtype=np.int16).tolist() == [6, 7, 8, 9, 10, 11]
+        assert np.frombuffer(ring.read(0, 3), dtype=np.int16).tolist() == [4, 5]